@@ -0,0 +1,4 @@
+from api.server import ApiServer, QuestionApi, create_server
+from api.store import Bank, BankStore
+
+__all__ = ["ApiServer", "Bank", "BankStore", "QuestionApi", "create_server"]
@@ -0,0 +1,30 @@
+"""Configuration module for the API package."""
+
+import os
+from pathlib import Path
+from typing import Final
+
+from dotenv import load_dotenv
+
+# Load .env file if present
+load_dotenv()
+
+# Address the server listens on
+HOST: Final[str] = os.getenv("API_HOST", "127.0.0.1")
+PORT: Final[int] = int(os.getenv("API_PORT", "8000"))
+
+# Folder whose question banks are served (every JSON / JSON Lines bank, compressed or not)
+BANKS_DIR: Final[Path] = Path(os.getenv("API_BANKS_DIR", "output"))
+
+# Seconds between two checks of the folder for new, changed or deleted banks
+RELOAD_INTERVAL: Final[float] = float(os.getenv("API_RELOAD_INTERVAL", "1"))
+
+# Questions per page by default, and the largest page a client may ask for
+PAGE_SIZE: Final[int] = int(os.getenv("API_PAGE_SIZE", "50"))
+MAX_PAGE_SIZE: Final[int] = int(os.getenv("API_MAX_PAGE_SIZE", "500"))
+
+# Responses smaller than this many bytes are sent uncompressed
+GZIP_MIN_SIZE: Final[int] = int(os.getenv("API_GZIP_MIN_SIZE", "1024"))
+
+# Number of encoded responses kept in memory
+CACHE_SIZE: Final[int] = int(os.getenv("API_CACHE_SIZE", "512"))
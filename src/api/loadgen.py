@@ -0,0 +1,106 @@
+"""API Load Generator.
+
+Opens keep-alive connections (one worker process each, so the client is not
+limited by a single interpreter) and replays requests for a fixed duration,
+then reports throughput, latency percentiles and status codes.
+
+Usage:
+    uv run -m api.loadgen /exams/<exam>/questions --connections 8 --duration 10
+    uv run -m api.loadgen "/exams/<exam>/questions?q=spanner" --gzip --revalidate
+"""
+
+import argparse
+import http.client
+import multiprocessing
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+
+def run_connection(base_url: str, paths: list[str], duration: float, gzip: bool, revalidate: bool) -> dict:
+    """Sends requests over one keep-alive connection for `duration` seconds.
+
+    Args:
+        base_url: Server URL (e.g. 'http://127.0.0.1:8000').
+        paths: Request paths, sent in turn.
+        duration: Seconds to run.
+        gzip: Ask for gzipped responses.
+        revalidate: Send If-None-Match with the ETag of the previous response of each path.
+
+    Returns:
+        The latencies (seconds), status code counts and bytes received.
+    """
+    url = urlsplit(base_url)
+    connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=10)
+    etags: dict[str, str] = {}
+    latencies: list[float] = []
+    statuses: Counter[int] = Counter()
+    received = 0
+
+    deadline = time.perf_counter() + duration
+    i = 0
+    while (now := time.perf_counter()) < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        headers = {"Accept-Encoding": "gzip"} if gzip else {}
+        if revalidate and path in etags:
+            headers["If-None-Match"] = etags[path]
+        connection.request("GET", path, headers=headers)
+        response = connection.getresponse()
+        body = response.read()
+        latencies.append(time.perf_counter() - now)
+        statuses[response.status] += 1
+        received += len(body)
+        if etag := response.getheader("ETag"):
+            etags[path] = etag
+
+    connection.close()
+    return {"latencies": latencies, "statuses": statuses, "received": received}
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Returns a percentile of sorted values (nearest rank)."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def main() -> None:
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Measure the throughput of the question bank API.")
+    parser.add_argument("paths", nargs="*", default=["/exams"], help="Request paths, sent in turn.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Server URL.")
+    parser.add_argument("--connections", type=int, default=8, help="Concurrent keep-alive connections.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run.")
+    parser.add_argument("--gzip", action="store_true", help="Ask for gzipped responses.")
+    parser.add_argument("--revalidate", action="store_true", help="Send If-None-Match (measures 304 answers).")
+    args = parser.parse_args()
+
+    console = Console()
+    console.print(f"Loading {args.url} with {args.connections} connections for {args.duration:.0f}s...")
+    jobs = [(args.url, args.paths, args.duration, args.gzip, args.revalidate)] * args.connections
+    with multiprocessing.Pool(args.connections) as pool:
+        results = pool.starmap(run_connection, jobs)
+
+    latencies = sorted(latency for result in results for latency in result["latencies"])
+    statuses: Counter[int] = sum((result["statuses"] for result in results), Counter())
+    received = sum(result["received"] for result in results)
+
+    table = Table(title=f"{', '.join(args.paths)}", box=box.ROUNDED)
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right")
+    table.add_row("Requests", f"{len(latencies)}")
+    table.add_row("Requests/s", f"[bold green]{len(latencies) / args.duration:,.0f}[/bold green]")
+    for label, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+        table.add_row(f"Latency {label}", f"{percentile(latencies, fraction) * 1000:.2f} ms")
+    table.add_row("Received", f"{received / 1024 / 1024:.1f} MiB")
+    table.add_row("Status codes", ", ".join(f"{code}: {count}" for code, count in sorted(statuses.items())))
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Main entry point for the question bank API.
+
+Usage:
+    uv run -m api.main                                  # serve output/ on 127.0.0.1:8000
+    uv run -m api.main --banks output --port 9000
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from loguru import logger
+
+from api import config
+from api.server import create_server
+
+
+def configure_logging() -> None:
+    """Configures Loguru for console output."""
+    logger.remove()
+    logger.add(sys.stderr, format="<green>{time:HH:mm:ss}</green> | <level>{message}</level>", level="INFO")
+
+
+def main() -> None:
+    """Main execution function."""
+    configure_logging()
+
+    parser = argparse.ArgumentParser(description="Serve the question banks over a read-only HTTP API.")
+    parser.add_argument("--banks", type=Path, default=config.BANKS_DIR, help="Folder holding the question banks.")
+    parser.add_argument("--host", default=config.HOST, help="Address to listen on.")
+    parser.add_argument("--port", type=int, default=config.PORT, help="Port to listen on.")
+    args = parser.parse_args()
+
+    server = create_server(args.host, args.port, banks_dir=args.banks)
+    exams = server.api.store.banks()
+    logger.info(f"Serving {len(exams)} exams from {args.banks} on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("API stopped.")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""Read-only HTTP API over the question banks.
+
+Endpoints (all GET, JSON):
+
+- `/exams`: the served exams and their question counts.
+- `/exams/<exam>/questions?start=&end=&q=&limit=&cursor=`: one page of
+  questions, by number range and/or search terms (best matches first).
+  Follow `next_cursor` to get the next page.
+- `/exams/<exam>/questions/<id>`: a single question.
+
+Every response carries an ETag derived from the content hash of the bank and
+the request, so a client repeating a request with `If-None-Match` gets an
+empty 304 until the bank changes. Encoded (and gzipped) responses are cached
+by ETag.
+"""
+
+import base64
+import binascii
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from loguru import logger
+
+from api import config
+from api.store import Bank, BankStore
+from codec import json_codec
+
+
+class ApiError(Exception):
+    """A request that cannot be served, with the HTTP status to answer."""
+
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def encode_cursor(key: tuple[float, str]) -> str:
+    """Encodes the sort key of the last question of a page as an opaque cursor."""
+    return base64.urlsafe_b64encode(json_codec.dump_bytes(list(key))).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[float, str]:
+    """Decodes a cursor made by `encode_cursor`.
+
+    Raises:
+        ApiError: If the cursor is malformed.
+    """
+    try:
+        sort_value, q_id = json_codec.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Invalid cursor.") from e
+    if isinstance(sort_value, bool) or not isinstance(sort_value, int | float) or not isinstance(q_id, str):
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Invalid cursor.")
+    return sort_value, q_id
+
+
+class QuestionApi:
+    """Resolves requests against the bank store and caches the encoded responses."""
+
+    def __init__(
+        self,
+        store: BankStore,
+        page_size: int = 50,
+        max_page_size: int = 500,
+        gzip_min_size: int = 1024,
+        cache_size: int = 512,
+    ) -> None:
+        """Initializes the API.
+
+        Args:
+            store: The served banks.
+            page_size: Questions per page when the client gives no limit.
+            max_page_size: The largest accepted limit.
+            gzip_min_size: Responses smaller than this (bytes) are never compressed.
+            cache_size: Number of encoded responses kept in memory.
+        """
+        self.store = store
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+        self.gzip_min_size = gzip_min_size
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, tuple[bytes, bytes | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def resolve(self, path: str, query: dict[str, list[str]]) -> tuple[str, Callable[[], bytes]]:
+        """Validates a request and computes its ETag, without building the response body.
+
+        Args:
+            path: The URL path.
+            query: The parsed query string.
+
+        Returns:
+            The ETag and a function building the JSON body.
+
+        Raises:
+            ApiError: If the request is invalid or names an unknown exam or question.
+        """
+        parts = [unquote(part) for part in path.strip("/").split("/")]
+        if parts == ["exams"]:
+            banks = sorted(self.store.banks().values(), key=lambda b: b.name)
+            return self._etag("".join(b.digest for b in banks), "exams"), lambda: self._exams_body(banks)
+
+        if len(parts) < 3 or parts[0] != "exams" or parts[2] != "questions":  # noqa: PLR2004
+            raise ApiError(HTTPStatus.NOT_FOUND, f"No such endpoint: {path}")
+        bank = self.store.get(parts[1])
+        if bank is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"Unknown exam: {parts[1]}")
+
+        if len(parts) == 4:  # noqa: PLR2004
+            q_id = parts[3]
+            if q_id not in bank.encoded:
+                raise ApiError(HTTPStatus.NOT_FOUND, f"Unknown question: {q_id}")
+            return self._etag(bank.digest, "question", q_id), lambda: bank.encoded[q_id]
+        if len(parts) > 3:  # noqa: PLR2004
+            raise ApiError(HTTPStatus.NOT_FOUND, f"No such endpoint: {path}")
+
+        def param(name: str) -> str | None:
+            values = query.get(name)
+            return values[-1] if values else None
+
+        try:
+            start = int(param("start")) if param("start") else None
+            end = int(param("end")) if param("end") else None
+            limit = min(int(param("limit") or self.page_size), self.max_page_size)
+        except ValueError as e:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "start, end and limit must be integers.") from e
+        if limit < 1:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "limit must be positive.")
+        search = (param("q") or "").strip()
+        cursor = param("cursor")
+        after = decode_cursor(cursor) if cursor else None
+
+        etag = self._etag(bank.digest, "questions", bank.name, start, end, search, limit, cursor)
+        return etag, lambda: self._page_body(bank, start, end, search, limit, after)
+
+    def respond(self, etag: str, build: Callable[[], bytes]) -> tuple[bytes, bytes | None]:
+        """Returns the cached body of a response (and its gzipped version if worth it), building it on a miss.
+
+        Args:
+            etag: The response ETag, which identifies its content.
+            build: Builds the JSON body.
+
+        Returns:
+            The body and its gzipped version (None if too small to be worth compressing).
+        """
+        with self._lock:
+            cached = self._cache.get(etag)
+            if cached is not None:
+                self._cache.move_to_end(etag)
+                return cached
+
+        body = build()
+        gzipped = gzip.compress(body, compresslevel=6, mtime=0) if len(body) >= self.gzip_min_size else None
+        with self._lock:
+            self._cache[etag] = (body, gzipped)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return body, gzipped
+
+    @staticmethod
+    def _etag(digest: str, *request: object) -> str:
+        """Derives a (weak, as it is shared by the gzipped and plain encodings) ETag."""
+        return f'W/"{hashlib.blake2b(f"{digest}|{request!r}".encode(), digest_size=12).hexdigest()}"'
+
+    @staticmethod
+    def _exams_body(banks: list[Bank]) -> bytes:
+        """Encodes the list of exams."""
+        return json_codec.dump_bytes(
+            {"exams": [{"name": b.name, "questions": len(b.questions), "version": b.digest} for b in banks]}
+        )
+
+    @staticmethod
+    def _page_body(
+        bank: Bank, start: int | None, end: int | None, search: str, limit: int, after: tuple[float, str] | None
+    ) -> bytes:
+        """Encodes one page of questions, joining the pre-encoded questions."""
+        if search:
+            by_id = {q.id: q for q in bank.select(start, end)}
+            matches = sorted(
+                ((-hit.score, hit.id) for hit in bank.index.search(search, limit=None) if hit.id in by_id),
+            )
+            keys = [key for key in matches if after is None or key > after]
+        else:
+            after_key = (int(after[0]), after[1]) if after is not None else None
+            keys = [(q.number, q.id) for q in bank.select(start, end, after=after_key)]
+
+        page, more = keys[:limit], len(keys) > limit
+        next_cursor = json_codec.dump_bytes(encode_cursor(page[-1]) if more else None)
+        items = b",".join(bank.encoded[q_id] for _, q_id in page)
+        return b"".join(
+            (
+                b'{"exam":',
+                json_codec.dump_bytes(bank.name),
+                f',"count":{len(page)},"next_cursor":'.encode(),
+                next_cursor,
+                b',"items":[',
+                items,
+                b"]}",
+            )
+        )
+
+
+class ApiRequestHandler(BaseHTTPRequestHandler):
+    """Serves GET requests through the server's `QuestionApi`."""
+
+    server: "ApiServer"
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately: do not let Nagle's algorithm delay the body
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        """Answers a GET request."""
+        url = urlsplit(self.path)
+        try:
+            etag, build = self.server.api.resolve(url.path, parse_qs(url.query))
+        except ApiError as e:
+            self._send(e.status, json_codec.dump_bytes({"error": str(e)}))
+            return
+
+        if etag in (self.headers.get("If-None-Match") or "").split(", "):
+            self._send(HTTPStatus.NOT_MODIFIED, b"", etag=etag)
+            return
+
+        try:
+            body, gzipped = self.server.api.respond(etag, build)
+        except Exception:
+            logger.exception(f"Failed to answer {self.path}")
+            self._send(HTTPStatus.INTERNAL_SERVER_ERROR, json_codec.dump_bytes({"error": "Internal error."}))
+            return
+
+        if gzipped is not None and "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            self._send(HTTPStatus.OK, gzipped, etag=etag, encoding="gzip")
+        else:
+            self._send(HTTPStatus.OK, body, etag=etag)
+
+    def _send(self, status: HTTPStatus, body: bytes, etag: str | None = None, encoding: str | None = None) -> None:
+        """Writes a complete response."""
+        self.send_response(status)
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+            # Clients may keep responses but must revalidate them (a cheap 304 while the bank is unchanged)
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        """Keeps the per-request access log out of the console (it would cost more than the request)."""
+
+
+class ApiServer(ThreadingHTTPServer):
+    """A threaded HTTP server (one thread per connection) bound to a `QuestionApi`."""
+
+    daemon_threads = True
+    # Accept bursts of new connections from load generators and busy clients
+    request_queue_size = 128
+
+    def __init__(self, address: tuple[str, int], api: QuestionApi) -> None:
+        """Binds the server.
+
+        Args:
+            address: (host, port) to listen on.
+            api: The API answering the requests.
+        """
+        super().__init__(address, ApiRequestHandler)
+        self.api = api
+
+
+def create_server(host: str = config.HOST, port: int = config.PORT, banks_dir: Path = config.BANKS_DIR) -> ApiServer:
+    """Creates a server for a banks folder.
+
+    Args:
+        host: The address to listen on.
+        port: The port to listen on (0 = any free port).
+        banks_dir: The folder holding the banks.
+
+    Returns:
+        The bound (not yet serving) server.
+    """
+    store = BankStore(banks_dir, reload_interval=config.RELOAD_INTERVAL)
+    api = QuestionApi(
+        store,
+        page_size=config.PAGE_SIZE,
+        max_page_size=config.MAX_PAGE_SIZE,
+        gzip_min_size=config.GZIP_MIN_SIZE,
+        cache_size=config.CACHE_SIZE,
+    )
+    return ApiServer((host, port), api)
@@ -0,0 +1,156 @@
+"""In-memory question banks, reloaded when their file changes.
+
+Banks are loaded through the scraper savers, so every format and compression
+the scraper writes can be served. Each question is encoded to JSON once per
+load, and a page of results is built by joining the encoded questions.
+"""
+
+import bisect
+import hashlib
+import threading
+import time
+from dataclasses import dataclass, field
+from operator import itemgetter
+from pathlib import Path
+
+from loguru import logger
+
+from codec import json_codec
+from codec.compression import split_suffix
+from dedup.main import find_banks
+from models import Question
+from scraper.storage import SaverFactory
+from search.index import SearchIndex
+
+
+def bank_name(path: Path) -> str:
+    """Returns the exam name of a bank: its file name without format and compression extensions."""
+    data_format, compression = split_suffix(path)
+    name = path.name
+    for suffix in ((f".{compression}" if compression else ""), f".{data_format}"):
+        if suffix and name.lower().endswith(suffix):
+            name = name[: -len(suffix)]
+    return name
+
+
+@dataclass
+class Bank:
+    """One loaded question bank.
+
+    Attributes:
+        name: The exam name (file name without extensions).
+        path: The bank file.
+        signature: (mtime, size) of the file when it was loaded.
+        digest: Hash of the file content, the base of every ETag of the bank.
+        questions: The questions, sorted by number then ID.
+        keys: The (number, ID) sort key of each question.
+        encoded: The JSON encoding of each question, by ID.
+        index: Full-text index of the questions.
+    """
+
+    name: str
+    path: Path
+    signature: tuple[int, int]
+    digest: str
+    questions: list[Question]
+    keys: list[tuple[int, str]] = field(default_factory=list)
+    encoded: dict[str, bytes] = field(default_factory=dict)
+    index: SearchIndex | None = None
+
+    @classmethod
+    def load(cls, path: Path) -> "Bank":
+        """Loads a bank file.
+
+        Args:
+            path: The bank file.
+
+        Returns:
+            The loaded bank.
+        """
+        stat = path.stat()
+        digest = hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+        questions = sorted(
+            SaverFactory.for_file(path).load_existing(str(path)).values(), key=lambda q: (q.number, q.id)
+        )
+        # Start from the search sidecar if there is one, but never write it: the API only reads the banks folder
+        index = SearchIndex.for_bank(path)
+        index.update(questions)
+        return cls(
+            name=bank_name(path),
+            path=path,
+            signature=(stat.st_mtime_ns, stat.st_size),
+            digest=digest,
+            questions=questions,
+            keys=[(q.number, q.id) for q in questions],
+            encoded={q.id: json_codec.dump_bytes(q.to_dict()) for q in questions},
+            index=index,
+        )
+
+    def select(
+        self, start: int | None = None, end: int | None = None, after: tuple[int, str] | None = None
+    ) -> list[Question]:
+        """Lists the questions of a number range, in order.
+
+        Args:
+            start: The minimum question number (inclusive).
+            end: The maximum question number (inclusive).
+            after: Only return questions sorted after this (number, ID) key.
+
+        Returns:
+            The matching questions.
+        """
+        low = bisect.bisect_left(self.keys, start, key=itemgetter(0)) if start is not None else 0
+        if after is not None:
+            low = max(low, bisect.bisect_right(self.keys, after))
+        high = bisect.bisect_right(self.keys, end, key=itemgetter(0)) if end is not None else len(self.keys)
+        return self.questions[low:high]
+
+
+class BankStore:
+    """The question banks of a folder, kept up to date with their files."""
+
+    def __init__(self, directory: Path, reload_interval: float = 1.0) -> None:
+        """Initializes the store (banks are loaded on first access).
+
+        Args:
+            directory: The folder holding the banks.
+            reload_interval: Minimum seconds between two checks of the folder.
+        """
+        self.directory = directory
+        self.reload_interval = reload_interval
+        self._banks: dict[str, Bank] = {}
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def banks(self) -> dict[str, Bank]:
+        """Returns the current banks by exam name, reloading the ones whose file changed."""
+        if time.monotonic() - self._checked_at >= self.reload_interval:
+            with self._lock:
+                # Another thread may have refreshed while we waited for the lock
+                if time.monotonic() - self._checked_at >= self.reload_interval:
+                    self._refresh()
+                    self._checked_at = time.monotonic()
+        return self._banks
+
+    def get(self, name: str) -> Bank | None:
+        """Returns a bank by exam name."""
+        return self.banks().get(name)
+
+    def _refresh(self) -> None:
+        """Rescans the folder; loaded banks are replaced as a whole, so readers never see a half-loaded one."""
+        current = {bank.path: bank for bank in self._banks.values()}
+        banks: dict[str, Bank] = {}
+        for path in find_banks(self.directory) if self.directory.is_dir() else []:
+            bank = current.get(path)
+            try:
+                stat = path.stat()
+                if bank is None or bank.signature != (stat.st_mtime_ns, stat.st_size):
+                    bank = Bank.load(path)
+                    logger.info(f"Loaded {bank.name}: {len(bank.questions)} questions.")
+            except Exception as e:
+                # E.g. the scraper is halfway through writing it: keep serving the previous version
+                logger.warning(f"Could not load {path.name}: {e}")
+                if bank is None:
+                    continue
+            banks[bank.name] = bank
+        self._banks = banks
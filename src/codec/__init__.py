@@ -0,0 +1,3 @@
+from codec import compression, json_codec, yaml_codec
+
+__all__ = ["compression", "json_codec", "yaml_codec"]
@@ -0,0 +1,95 @@
+"""Codec Benchmark.
+
+Compares the stdlib backends with the fast ones on a real question bank:
+JSON load/dump, YAML load/dump and the per-cell JSON used by the CSV saver.
+
+Usage:
+    uv run -m codec.benchmark [output/exam_results.json] [--repeat 5]
+"""
+
+import argparse
+import io
+import json
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import yaml
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from codec import json_codec, yaml_codec
+
+
+def best_of(func: Callable[[], Any], repeat: int) -> float:
+    """Returns the fastest of `repeat` runs of `func`, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Benchmark the stdlib codecs against the fast ones.")
+    parser.add_argument("bank", type=Path, nargs="?", default=Path("output/exam_results.json"), help="JSON bank.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (the best one is kept).")
+    args = parser.parse_args()
+
+    console = Console()
+    if not args.bank.exists():
+        console.print(f"[red]Question bank not found: {args.bank}[/red]")
+        return
+
+    raw = args.bank.read_bytes()
+    data = json.loads(raw)
+    yaml_text = yaml.dump(data, Dumper=yaml.SafeDumper, allow_unicode=True, default_flow_style=False)
+    cells = [value for item in data for value in (item.get("options", {}), item.get("correct_answers", []))]
+    cell_texts = [json.dumps(cell, ensure_ascii=False) for cell in cells]
+
+    cases = [
+        ("JSON load", lambda: json.loads(raw), lambda: json_codec.loads(raw)),
+        (
+            "JSON dump",
+            lambda: json.dumps(data, indent=4, ensure_ascii=False),
+            lambda: json_codec.dump_bytes(data, pretty=True),
+        ),
+        ("YAML load", lambda: yaml.safe_load(yaml_text), lambda: yaml_codec.load(yaml_text)),
+        (
+            "YAML dump",
+            lambda: yaml.dump(data, Dumper=yaml.SafeDumper, allow_unicode=True, default_flow_style=False),
+            lambda: yaml_codec.dump(data, io.StringIO()),
+        ),
+        (
+            "CSV cells load",
+            lambda: [json.loads(c) for c in cell_texts],
+            lambda: [json_codec.loads(c) for c in cell_texts],
+        ),
+        (
+            "CSV cells dump",
+            lambda: [json.dumps(c, ensure_ascii=False) for c in cells],
+            lambda: [json_codec.dumps(c) for c in cells],
+        ),
+    ]
+
+    table = Table(
+        title=f"{args.bank.name}: {len(data)} questions, {len(raw) / 1024:.0f} KiB "
+        f"(json backend: {json_codec.BACKEND}, yaml backend: {yaml_codec.BACKEND})",
+        box=box.ROUNDED,
+    )
+    table.add_column("Operation", style="cyan")
+    table.add_column("Stdlib", justify="right")
+    table.add_column("Codec", justify="right")
+    table.add_column("Speedup", justify="right", style="green")
+    for name, baseline, fast in cases:
+        slow_ms, fast_ms = best_of(baseline, args.repeat), best_of(fast, args.repeat)
+        table.add_row(name, f"{slow_ms:.2f} ms", f"{fast_ms:.2f} ms", f"{slow_ms / max(fast_ms, 1e-9):.1f}x")
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Compression Module.
+
+Picks a compression scheme from the file extension (`exam.json.gz`,
+`exam.jsonl.zst`, ...) and opens files through the matching streaming
+(de)compressor, so callers read and write compressed files exactly like plain
+ones. zstd needs the optional `zstandard` package; gzip, bz2 and xz are stdlib.
+"""
+
+import bz2
+import gzip
+import lzma
+from pathlib import Path
+from typing import IO, Any
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# File extension -> compression name
+COMPRESSIONS: dict[str, str] = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz", ".zst": "zstd"}
+
+
+def split_suffix(path: str | Path) -> tuple[str, str | None]:
+    """Splits a path's extension into the data format and the compression.
+
+    Args:
+        path: The file path (e.g. 'output/exam.jsonl.zst').
+
+    Returns:
+        The format without the dot (e.g. 'jsonl') and the compression name
+        (e.g. 'zstd'), or None if the file is not compressed.
+    """
+    suffixes = [s.lower() for s in Path(path).suffixes]
+    compression = COMPRESSIONS.get(suffixes[-1]) if suffixes else None
+    if compression:
+        suffixes.pop()
+    return (suffixes[-1].lstrip(".") if suffixes else ""), compression
+
+
+def open_file(path: str | Path, mode: str = "rb", newline: str | None = None) -> IO[Any]:
+    """Opens a file, transparently (de)compressing it according to its extension.
+
+    Args:
+        path: The file path.
+        mode: 'rb', 'wb', 'ab', or their text counterparts ('rt'/'r', 'wt'/'w', 'at'/'a').
+        newline: Newline handling for text modes (see `open`).
+
+    Returns:
+        A file object reading or writing the uncompressed content as a stream.
+    """
+    _, compression = split_suffix(path)
+    binary = "b" in mode
+    if not binary and "t" not in mode:
+        mode += "t"
+    encoding = None if binary else "utf-8"
+
+    if compression == "gzip":
+        return gzip.open(path, mode, encoding=encoding, newline=newline)
+    if compression == "bz2":
+        return bz2.open(path, mode, encoding=encoding, newline=newline)
+    if compression == "xz":
+        return lzma.open(path, mode, encoding=encoding, newline=newline)
+    if compression == "zstd":
+        if zstandard is None:
+            raise ImportError("Reading or writing .zst files needs the 'zstandard' package.")
+        return zstandard.open(path, mode, encoding=encoding, newline=newline)
+    return open(path, mode.replace("t", ""), encoding=encoding, newline=newline)
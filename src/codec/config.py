@@ -0,0 +1,15 @@
+"""Configuration module for the Codec package."""
+
+import os
+from typing import Final
+
+from dotenv import load_dotenv
+
+# Load .env file if present
+load_dotenv()
+
+# Write JSON without indentation (smaller and faster; files are less readable)
+COMPACT: Final[bool] = os.getenv("CODEC_COMPACT", "false").lower() == "true"
+
+# Force the stdlib backends even if faster ones are installed (useful for debugging)
+FORCE_STDLIB: Final[bool] = os.getenv("CODEC_FORCE_STDLIB", "false").lower() == "true"
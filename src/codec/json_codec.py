@@ -0,0 +1,250 @@
+"""JSON Codec Module.
+
+Uses `orjson` when it is installed and falls back to the stdlib `json` module
+otherwise. Both backends raise `json.JSONDecodeError` (orjson's error is a
+subclass of it), so callers keep catching the stdlib exception.
+"""
+
+import json
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from codec import config
+from codec.compression import open_file, split_suffix
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if config.FORCE_STDLIB:
+    orjson = None
+
+BACKEND = "orjson" if orjson else "json"
+
+JSONDecodeError = json.JSONDecodeError
+
+# Characters read at a time by the streaming reader (grown while a single item does not fit)
+STREAM_CHUNK_SIZE = 1 << 16
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+# Characters that can continue a number: an item followed by one of them may be cut at a chunk boundary
+_NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+
+def loads(data: str | bytes) -> Any:
+    """Decodes a JSON document.
+
+    Args:
+        data: The JSON text (str or UTF-8 bytes).
+
+    Returns:
+        The decoded Python object.
+    """
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, pretty: bool = False, sort_keys: bool = False) -> str:
+    """Encodes an object as JSON text (non-ASCII characters are kept as is).
+
+    Args:
+        obj: The object to encode.
+        pretty: Indent the output (4 spaces with json, 2 with orjson).
+        sort_keys: Sort object keys, for a canonical output.
+
+    Returns:
+        The JSON text.
+    """
+    return dump_bytes(obj, pretty=pretty, sort_keys=sort_keys).decode("utf-8")
+
+
+def dump_bytes(obj: Any, pretty: bool = False, sort_keys: bool = False) -> bytes:
+    """Encodes an object as UTF-8 JSON bytes (see `dumps`)."""
+    if orjson:
+        option = (orjson.OPT_INDENT_2 if pretty else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, option=option)
+    if pretty:
+        text = json.dumps(obj, indent=4, ensure_ascii=False, sort_keys=sort_keys)
+    else:
+        text = json.dumps(obj, separators=(",", ":"), ensure_ascii=False, sort_keys=sort_keys)
+    return text.encode("utf-8")
+
+
+def load_file(path: str | Path) -> Any:
+    """Reads and decodes a JSON file (compressed if its extension says so).
+
+    Args:
+        path: The file to read.
+
+    Returns:
+        The decoded Python object.
+    """
+    with open_file(path, "rb") as f:
+        return loads(f.read())
+
+
+def iter_lines(path: str | Path) -> Iterator[Any]:
+    """Streams the records of a JSON Lines file, one decoded line at a time.
+
+    Args:
+        path: The file to read (compressed if its extension says so).
+
+    Yields:
+        The decoded record of each non-empty line.
+    """
+    with open_file(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield loads(line)
+
+
+def iter_array(path: str | Path) -> Iterator[Any]:
+    """Streams the items of a JSON file holding a top-level array, decoding one item at a time.
+
+    Only the item being decoded (and one read chunk) is held in memory,
+    whatever the size of the file.
+
+    Args:
+        path: The file to read (compressed if its extension says so).
+
+    Yields:
+        Each decoded item, in file order.
+
+    Raises:
+        JSONDecodeError: If the file is not a well-formed array.
+    """
+    with open_file(path, "r") as f:
+        buffer, pos, eof = "", 0, False
+
+        def skip_whitespace() -> None:
+            """Moves `pos` to the next significant character, reading more of the file as needed."""
+            nonlocal buffer, pos, eof
+            while True:
+                while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                    pos += 1
+                if pos < len(buffer) or eof:
+                    return
+                chunk = f.read(STREAM_CHUNK_SIZE)
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+
+        skip_whitespace()
+        if buffer[pos : pos + 1] != "[":
+            raise JSONDecodeError("Expected a top-level array", buffer, pos)
+        pos += 1
+        skip_whitespace()
+        if buffer[pos : pos + 1] == "]":
+            return
+
+        while True:
+            skip_whitespace()
+            try:
+                item, end = _decoder.raw_decode(buffer, pos)
+                # A number or literal ending the buffer may continue in the next chunk ('12.' then '5]')
+                complete = eof or (end < len(buffer) and buffer[end] not in _NUMBER_CHARS)
+            except JSONDecodeError:
+                if eof:
+                    raise
+                complete = False
+            if not complete:
+                # Read at least as much as is already buffered, so a huge item is not re-decoded too often
+                chunk = f.read(max(STREAM_CHUNK_SIZE, len(buffer) - pos))
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+
+            yield item
+            pos = end
+            skip_whitespace()
+            separator = buffer[pos : pos + 1]
+            pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise JSONDecodeError("Expected ',' or ']' after an array item", buffer, pos - 1)
+
+
+def iter_records(path: str | Path) -> Iterator[Any]:
+    """Streams the records of a JSON array file, or of a JSON Lines file ('.jsonl'), one at a time.
+
+    Args:
+        path: The file to read (compressed if its extension says so).
+
+    Yields:
+        Each decoded record, in file order.
+    """
+    if split_suffix(path)[0] == "jsonl":
+        return iter_lines(path)
+    return iter_array(path)
+
+
+def load_records(path: str | Path) -> Any:
+    """Reads a JSON document, or every record of a JSON Lines file ('.jsonl').
+
+    Args:
+        path: The file to read (compressed if its extension says so).
+
+    Returns:
+        The decoded document, or the list of records.
+    """
+    if split_suffix(path)[0] == "jsonl":
+        return list(iter_lines(path))
+    return load_file(path)
+
+
+def dump_file(obj: Any, path: str | Path, pretty: bool | None = None) -> None:
+    """Encodes an object and writes it to a JSON file.
+
+    Args:
+        obj: The object to encode.
+        path: The file to write.
+        pretty: Indent the output; defaults to the opposite of CODEC_COMPACT.
+    """
+    if pretty is None:
+        pretty = not config.COMPACT
+    with open_file(path, "wb") as f:
+        f.write(dump_bytes(obj, pretty=pretty))
+
+
+def dump_array(records: Iterable[Any], path: str | Path, pretty: bool | None = None) -> None:
+    """Writes records as a JSON array, encoding and streaming one item at a time.
+
+    The output is the same as `dump_file` on the list of records.
+
+    Args:
+        records: The objects to encode.
+        path: The file to write (compressed if its extension says so).
+        pretty: Indent the output; defaults to the opposite of CODEC_COMPACT.
+    """
+    if pretty is None:
+        pretty = not config.COMPACT
+    indent = b"  " if orjson else b"    "
+    opening, separator, closing = (b"[\n", b",\n", b"\n]") if pretty else (b"[", b",", b"]")
+
+    with open_file(path, "wb") as f:
+        empty = True
+        for record in records:
+            item = dump_bytes(record, pretty=pretty)
+            if pretty:
+                # Strings never hold raw newlines in JSON, so every newline starts a line to indent
+                item = indent + item.replace(b"\n", b"\n" + indent)
+            f.write(opening if empty else separator)
+            f.write(item)
+            empty = False
+        f.write(b"[]" if empty else closing)
+
+
+def dump_lines(records: Iterable[Any], path: str | Path) -> None:
+    """Writes records to a JSON Lines file, encoding and streaming one line at a time.
+
+    Args:
+        records: The objects to encode.
+        path: The file to write (compressed if its extension says so).
+    """
+    with open_file(path, "wb") as f:
+        for record in records:
+            f.write(dump_bytes(record) + b"\n")
@@ -0,0 +1,90 @@
+"""YAML Codec Module.
+
+Uses the libyaml-backed `CSafeLoader`/`CSafeDumper` when PyYAML was built with
+libyaml, and the pure-Python safe loader/dumper otherwise.
+"""
+
+from collections.abc import Iterable, Iterator
+from typing import IO, Any
+
+import yaml
+
+from codec import config
+
+if yaml.__with_libyaml__ and not config.FORCE_STDLIB:
+    Loader: type = yaml.CSafeLoader
+    Dumper: type = yaml.CSafeDumper
+    BACKEND = "libyaml"
+else:
+    Loader = yaml.SafeLoader
+    Dumper = yaml.SafeDumper
+    BACKEND = "pyyaml"
+
+
+def load(stream: IO[str] | str) -> Any:
+    """Decodes a YAML document.
+
+    Args:
+        stream: An open text file or a YAML string.
+
+    Returns:
+        The decoded Python object.
+    """
+    return yaml.load(stream, Loader=Loader)  # noqa: S506 - Loader is always a safe loader
+
+
+def iter_items(stream: IO[str]) -> Iterator[Any]:
+    """Streams the items of a YAML document holding a top-level sequence, building one item at a time.
+
+    libyaml only composes whole documents, so this uses the pure-Python safe
+    loader: slower than `load`, but memory stays proportional to one item.
+
+    Args:
+        stream: An open text file.
+
+    Yields:
+        Each decoded item, in document order.
+
+    Raises:
+        yaml.YAMLError: If the document is malformed or not a sequence.
+    """
+    loader = yaml.SafeLoader(stream)
+    try:
+        loader.get_event()  # Stream start
+        if loader.check_event(yaml.StreamEndEvent):
+            return
+        loader.get_event()  # Document start
+        if not loader.check_event(yaml.SequenceStartEvent):
+            if loader.construct_document(loader.compose_node(None, None)) is None:
+                return
+            raise yaml.YAMLError("Expected a top-level sequence.")
+        loader.get_event()
+        while not loader.check_event(yaml.SequenceEndEvent):
+            yield loader.construct_document(loader.compose_node(None, None))
+    finally:
+        loader.dispose()
+
+
+def dump_items(items: Iterable[Any], stream: IO[str]) -> None:
+    """Writes items as a block-style YAML sequence, encoding one item at a time (see `dump`).
+
+    Args:
+        items: The objects to encode.
+        stream: An open text file.
+    """
+    empty = True
+    for item in items:
+        dump([item], stream)
+        empty = False
+    if empty:
+        dump([], stream)
+
+
+def dump(obj: Any, stream: IO[str]) -> None:
+    """Encodes an object as block-style YAML (non-ASCII characters are kept as is).
+
+    Args:
+        obj: The object to encode.
+        stream: An open text file.
+    """
+    yaml.dump(obj, stream, Dumper=Dumper, allow_unicode=True, default_flow_style=False)
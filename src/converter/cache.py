@@ -0,0 +1,92 @@
+"""Rendered Block Cache Module.
+
+Keeps the Markdown rendered for each question, keyed by a hash of the question
+data and the renderer version, so rebuilds only render what changed.
+"""
+
+import hashlib
+from pathlib import Path
+
+from loguru import logger
+
+from codec import json_codec
+from converter.renderer import MarkdownRenderer
+from models import Question
+
+
+class RenderCache:
+    """Persistent cache of rendered Markdown blocks."""
+
+    def __init__(self, path: Path, version: str) -> None:
+        """Initializes the cache and loads previous entries from disk.
+
+        Args:
+            path: JSON file backing the cache.
+            version: Renderer version; entries from other versions are ignored.
+        """
+        self.path = path
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._blocks: dict[str, str] = {}
+        self._used: set[str] = set()
+        self._dirty = False
+        self._load()
+
+    def key(self, question: Question) -> str:
+        """Returns the cache key of a question."""
+        payload = json_codec.dump_bytes(question.to_dict(), sort_keys=True)
+        return hashlib.blake2b(self.version.encode() + b"\0" + payload, digest_size=16).hexdigest()
+
+    def render(self, question: Question, renderer: MarkdownRenderer) -> str:
+        """Returns the cached block of a question, rendering it on a miss.
+
+        Args:
+            question: The question.
+            renderer: Renderer used on a cache miss.
+
+        Returns:
+            The Markdown block of the question.
+        """
+        key = self.key(question)
+        self._used.add(key)
+        block = self._blocks.get(key)
+        if block is not None:
+            self.hits += 1
+            return block
+
+        block = renderer.render_question(question)
+        self._blocks[key] = block
+        self._dirty = True
+        self.misses += 1
+        return block
+
+    def save(self) -> None:
+        """Writes the entries used since the last save back to disk, dropping stale ones."""
+        if len(self._used) != len(self._blocks):
+            self._blocks = {k: v for k, v in self._blocks.items() if k in self._used}
+            self._dirty = True
+
+        logger.debug(f"Render cache: {self.hits} hits, {self.misses} misses.")
+        self._used = set()
+        self.hits = self.misses = 0
+        if not self._dirty:
+            return
+
+        try:
+            json_codec.dump_file({"version": self.version, "blocks": self._blocks}, self.path, pretty=False)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Could not write render cache {self.path}: {e}")
+
+    def _load(self) -> None:
+        """Loads the cache file, ignoring it if missing, corrupt or from another version."""
+        if not self.path.exists():
+            return
+        try:
+            data = json_codec.load_file(self.path)
+        except (json_codec.JSONDecodeError, OSError):
+            logger.warning(f"Ignoring unreadable render cache {self.path}.")
+            return
+        if data.get("version") == self.version:
+            self._blocks = data.get("blocks", {})
@@ -18,5 +18,31 @@ INPUT_FILE: Final[Path] = Path(os.getenv("EXAM_QUESTIONS_FILE"))
 # Output Markdown File
 OUTPUT_MD_FILE: Final[Path] = BASE_DIR / "exam_export.md"
 
-# Grouping settings (e.g., create a new header every 50 questions)
-CHUNK_SIZE: Final[int] = 50
+# Cache of rendered question blocks, reused by incremental rebuilds
+CACHE_FILE: Final[Path] = BASE_DIR / ".exam_export_cache.json"
+
+# Watch mode: rebuild whenever the input file changes, polling every WATCH_INTERVAL seconds
+WATCH: Final[bool] = os.getenv("CONVERTER_WATCH", "false").lower() == "true"
+WATCH_INTERVAL: Final[float] = float(os.getenv("CONVERTER_WATCH_INTERVAL", "1.0"))
+
+# Grouping settings (e.g., create a new file every 50 questions in sharded mode)
+CHUNK_SIZE: Final[int] = int(os.getenv("CONVERTER_CHUNK_SIZE", "50"))
+
+# Export mode: "single" writes OUTPUT_MD_FILE, "sharded" writes one file per chunk plus an index,
+# "site" writes a static HTML study site to OUTPUT_SITE_DIR
+EXPORT_MODE: Final[str] = os.getenv("CONVERTER_MODE", "single").lower()
+
+# Group the single-file export by topic (requires a topic index, see `topics.main`)
+GROUP_BY_TOPIC: Final[bool] = os.getenv("CONVERTER_GROUP_BY_TOPIC", "false").lower() == "true"
+
+# Output folder for the sharded export
+OUTPUT_SHARDS_DIR: Final[Path] = BASE_DIR / "exam_export"
+
+# Output folder for the static site export
+OUTPUT_SITE_DIR: Final[Path] = BASE_DIR / "exam_site"
+
+# Question images saved by the scraper, one folder per exam: <IMAGES_DIR>/<exam>/<question number>[.<position>].<ext>
+IMAGES_DIR: Final[Path] = Path(os.getenv("CONVERTER_IMAGES_DIR", str(BASE_DIR / "output" / "images")))
+
+# Worker processes used by the sharded and site exports (0 = one per CPU core)
+WORKERS: Final[int] = int(os.getenv("CONVERTER_WORKERS", "0"))
@@ -1,13 +1,22 @@
 """Main entry point for the Converter Application."""
 
-import json
+import argparse
+import shutil
 import sys
+import time
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
 from loguru import logger
 
+from codec import json_codec
 from converter import config
+from converter.cache import RenderCache
 from converter.renderer import MarkdownRenderer
+from converter.sharded import export_sharded
+from converter.site import exam_name, export_site
+from models import Question
+from tracing import add_profile_argument, profile_run, traced
 
 
 def configure_logging() -> None:
@@ -16,54 +25,210 @@ def configure_logging() -> None:
     logger.add(sys.stderr, format="<green>{time:HH:mm:ss}</green> | <level>{message}</level>", level="INFO")
 
 
-def load_data(filepath: Path) -> list[dict]:
-    """Loads the source data from JSON.
+def load_data(filepath: Path) -> Iterator[Question]:
+    """Streams the source data from JSON or JSON Lines, optionally compressed, one question at a time.
 
     Args:
-        filepath: Path to the JSON file.
+        filepath: Path to the question bank (e.g. 'exam.json', 'exam.jsonl.gz').
 
     Returns:
-        A list of question dictionaries.
+        The questions, in file order (decoded as they are consumed). Malformed records are skipped.
     """
     if not filepath.exists():
         raise FileNotFoundError(f"Input file not found: {filepath}")
 
-    with open(filepath, encoding="utf-8") as f:
-        return json.load(f)
+    return _decode_questions(filepath)
 
 
-def main() -> None:
-    """Main execution function."""
-    configure_logging()
-    logger.info("Starting Markdown Converter...")
+def _decode_questions(filepath: Path) -> Iterator[Question]:
+    """Decodes the records of a question bank, logging and skipping the malformed ones."""
+    skipped = 0
+    for i, item in enumerate(json_codec.iter_records(filepath), 1):
+        try:
+            question = Question.from_dict(item)
+        except Exception as e:
+            skipped += 1
+            logger.warning(f"Skipping malformed question at index {i}: {e!r}")
+            continue
+        yield question
+    if skipped:
+        logger.warning(f"Skipped {skipped} malformed questions in {filepath.name}.")
 
-    # 1. Load Data
-    try:
-        data = load_data(config.INPUT_FILE)
-        logger.info(f"Loaded {len(data)} questions from {config.INPUT_FILE.name}")
-    except Exception as e:
-        logger.critical(f"Failed to load data: {e}")
-        return
 
-    # 2. Render Markdown
+def group_questions(data: Iterable[Question]) -> list[tuple[str | None, Iterable[Question]]]:
+    """Splits the questions into sections according to GROUP_BY_TOPIC.
+
+    Grouping needs every question first; without it the stream is passed through.
+
+    Args:
+        data: The questions, in file order.
+
+    Returns:
+        (section title, questions) pairs; a single untitled section when not grouping.
+    """
+    if not config.GROUP_BY_TOPIC:
+        return [(None, data)]
+
+    from topics.index import TopicIndex
+
+    topic_index = TopicIndex.load(config.INPUT_FILE)
+    if not topic_index.assignments:
+        logger.warning("No topic index found for the input file (run `topics.main`). Exporting ungrouped.")
+        return [(None, data)]
+
+    groups: dict[str, list[Question]] = {}
+    for question in data:
+        label = topic_index.assignments.get(question.id, "Unclassified")
+        groups.setdefault(label, []).append(question)
+    return [(f"Topic: {label}", questions) for label, questions in sorted(groups.items(), key=lambda g: -len(g[1]))]
+
+
+@traced
+def export_single(data: Iterable[Question], cache: RenderCache) -> int:
+    """Renders the questions into OUTPUT_MD_FILE as they are read, reusing cached blocks.
+
+    The blocks are streamed to a temporary file, then the header (which needs the
+    question count) and the blocks are copied into the output. The output is
+    left untouched if reading the input fails halfway.
+
+    Args:
+        data: The questions.
+        cache: The rendered block cache.
+
+    Returns:
+        The number of questions read.
+    """
     renderer = MarkdownRenderer()
-    md_content = [renderer.render_header("Exam Dump Export", len(data))]
+    body_path = config.OUTPUT_MD_FILE.with_name(f"{config.OUTPUT_MD_FILE.name}.part")
+    count = 0
+
+    try:
+        with open(body_path, "w", encoding="utf-8") as body:
+            for title, questions in group_questions(data):
+                if title:
+                    body.write(renderer.render_section(title, len(questions)))
+                for i, question in enumerate(questions, 1):
+                    count += 1
+                    try:
+                        body.write(cache.render(question, renderer))
+                    except Exception as e:
+                        logger.warning(f"Skipping malformed question at index {i}: {e}")
+
+        rendered = cache.misses
+        cache.save()
 
-    for i, question in enumerate(data, 1):
         try:
-            # Sort loosely by ID if possible, otherwise keep file order
-            md_block = renderer.render_question(question)
-            md_content.append(md_block)
+            with open(config.OUTPUT_MD_FILE, "w", encoding="utf-8") as f, open(body_path, encoding="utf-8") as body:
+                f.write(renderer.render_header("Exam Dump Export", count))
+                shutil.copyfileobj(body, f)
+            logger.success(f"Successfully exported to: {config.OUTPUT_MD_FILE} ({rendered} questions re-rendered)")
         except Exception as e:
-            logger.warning(f"Skipping malformed question at index {i}: {e}")
+            logger.critical(f"Failed to write markdown file: {e}")
+    finally:
+        body_path.unlink(missing_ok=True)
+    return count
+
 
-    # 3. Save File
+def run_export(cache: RenderCache) -> bool:
+    """Loads the input file and exports it with the configured mode.
+
+    Args:
+        cache: The rendered block cache (used by the single-file mode).
+
+    Returns:
+        True if the input could be loaded.
+    """
+    # 1. Open the input (questions are decoded while they are rendered)
     try:
-        with open(config.OUTPUT_MD_FILE, "w", encoding="utf-8") as f:
-            f.write("".join(md_content))
-        logger.success(f"Successfully exported to: {config.OUTPUT_MD_FILE}")
+        data = load_data(config.INPUT_FILE)
     except Exception as e:
-        logger.critical(f"Failed to write markdown file: {e}")
+        logger.critical(f"Failed to load data: {e}")
+        return False
+
+    try:
+        # 2. Sharded mode: render in parallel and write one file per chunk
+        if config.EXPORT_MODE == "sharded":
+            try:
+                index_path = export_sharded(
+                    data, config.OUTPUT_SHARDS_DIR, chunk_size=config.CHUNK_SIZE, workers=config.WORKERS
+                )
+                logger.success(f"Successfully exported to: {index_path}")
+            except (json_codec.JSONDecodeError, EOFError):
+                raise
+            except Exception as e:
+                logger.critical(f"Failed to write sharded export: {e}")
+            return True
+
+        # 3. Site mode: render the changed chunks in parallel and write a static HTML site
+        if config.EXPORT_MODE == "site":
+            exam = exam_name(config.INPUT_FILE)
+            try:
+                index_path = export_site(
+                    data,
+                    config.OUTPUT_SITE_DIR,
+                    config.IMAGES_DIR / exam,
+                    chunk_size=config.CHUNK_SIZE,
+                    workers=config.WORKERS,
+                    title=exam.replace("_", " ").title(),
+                )
+                logger.success(f"Successfully exported to: {index_path}")
+            except (json_codec.JSONDecodeError, EOFError):
+                raise
+            except Exception as e:
+                logger.critical(f"Failed to write site export: {e}")
+            return True
+
+        # 4. Render Markdown (only new or changed questions) and save the file
+        count = export_single(data, cache)
+        logger.info(f"Read {count} questions from {config.INPUT_FILE.name}")
+    except (json_codec.JSONDecodeError, EOFError) as e:
+        # E.g. the scraper is halfway through writing the file
+        logger.critical(f"Failed to load data: {e}")
+        return False
+    return True
+
+
+def watch(cache: RenderCache) -> None:
+    """Polls the input file and rebuilds incrementally whenever it changes.
+
+    A load failure (e.g. the scraper is halfway through writing the file)
+    is retried on the next poll.
+
+    Args:
+        cache: The rendered block cache.
+    """
+    logger.info(f"Watching {config.INPUT_FILE} (every {config.WATCH_INTERVAL}s). Press Ctrl+C to stop.")
+    last_signature = None
+    try:
+        while True:
+            try:
+                stat = config.INPUT_FILE.stat()
+                signature = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                signature = None
+
+            if signature is not None and signature != last_signature and run_export(cache):
+                last_signature = signature
+            time.sleep(config.WATCH_INTERVAL)
+    except KeyboardInterrupt:
+        logger.info("Watch mode stopped.")
+
+
+def main() -> None:
+    """Main execution function."""
+    configure_logging()
+
+    parser = argparse.ArgumentParser(description="Convert a question bank to Markdown or a static HTML site.")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    logger.info("Starting Markdown Converter...")
+    with profile_run("converter", args.profile):
+        cache = RenderCache(config.CACHE_FILE, MarkdownRenderer.VERSION)
+        if config.WATCH:
+            watch(cache)
+        else:
+            run_export(cache)
 
 
 if __name__ == "__main__":
@@ -4,12 +4,17 @@ Handles the logic of formatting Question objects into Markdown syntax.
 """
 
 from datetime import datetime
-from typing import Any
+
+from models import Question
+from tracing import traced
 
 
 class MarkdownRenderer:
     """Converts exam data into formatted Markdown text."""
 
+    # Bump whenever the output of render_question changes, to invalidate cached blocks
+    VERSION = "1"
+
     def render_header(self, title: str, total_count: int) -> str:
         """Generates the document header.
 
@@ -25,29 +30,33 @@ class MarkdownRenderer:
 
         return f"# {title}\n\n**Total Questions:** {total_count}\n**Generated:** {timestamp}\n\n---\n\n"
 
-    def render_question(self, question: dict[str, Any]) -> str:
+    def render_section(self, title: str, count: int) -> str:
+        """Generates a section heading grouping several questions.
+
+        Args:
+            title: The title of the section.
+            count: Number of questions in the section.
+
+        Returns:
+            A formatted markdown string.
+        """
+        return f"## {title}\n\n*{count} questions*\n\n"
+
+    @traced
+    def render_question(self, question: Question) -> str:
         """Formats a single question into Markdown.
 
         Args:
-            question: A dictionary representing a question (from JSON).
+            question: The question to render.
 
         Returns:
             String containing the markdown representation.
         """
-        q_id = question.get("id", "Unknown ID")
-        text = question.get("text", "").replace("\n", "\n\n")
-        options = question.get("options", {})
-
-        # Handle correct answers safely (could be list or None)
-        raw_correct = question.get("correct_answers", [])
-        if isinstance(raw_correct, list):
-            correct_answers = set(raw_correct)
-        elif isinstance(raw_correct, str):
-            correct_answers = {raw_correct}
-        else:
-            correct_answers = set()
+        text = question.text.replace("\n", "\n\n")
+        options = question.options
+        correct_answers = question.answer_set
 
-        md_output = [f"### {q_id}\n", f"{text}\n"]
+        md_output = [f"### {question.id}\n", f"{text}\n"]
 
         # Render Options
         sorted_keys = sorted(options.keys())
@@ -67,7 +76,7 @@ class MarkdownRenderer:
 
         # Add a collapsed "Answer Key" section
         if correct_answers:
-            correct_str = ", ".join(sorted(correct_answers))
+            correct_str = ", ".join(question.answer_key)
             md_output.append(f"\n> **Correct Answer:** {correct_str}")
 
         md_output.append("\n---\n")
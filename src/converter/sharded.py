@@ -0,0 +1,138 @@
+"""Sharded Export Module.
+
+Renders questions across a process pool and streams them to one Markdown file
+per chunk, followed by an index file linking the chunks.
+"""
+
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+
+from loguru import logger
+
+from converter.renderer import MarkdownRenderer
+from models import Question
+
+
+@dataclass
+class ChunkResult:
+    """Outcome of rendering one chunk of questions.
+
+    Attributes:
+        index: Position of the chunk (1-based).
+        markdown: The rendered Markdown of every question in the chunk.
+        first_id: ID of the first question in the chunk.
+        last_id: ID of the last question in the chunk.
+        count: Number of questions rendered successfully.
+    """
+
+    index: int
+    markdown: str
+    first_id: str
+    last_id: str
+    count: int
+
+
+def render_chunk(index: int, questions: list[Question]) -> ChunkResult:
+    """Renders a chunk of questions (runs inside a worker process).
+
+    Args:
+        index: Position of the chunk (1-based).
+        questions: The questions of the chunk.
+
+    Returns:
+        The rendered chunk.
+    """
+    renderer = MarkdownRenderer()
+    blocks = []
+    for question in questions:
+        try:
+            blocks.append(renderer.render_question(question))
+        except Exception as e:
+            logger.warning(f"Skipping malformed question {question.id} in chunk {index}: {e}")
+
+    first_id = questions[0].id if questions else ""
+    last_id = questions[-1].id if questions else ""
+    return ChunkResult(index=index, markdown="".join(blocks), first_id=first_id, last_id=last_id, count=len(blocks))
+
+
+def chunk_filename(output_dir: Path, index: int) -> Path:
+    """Returns the path of the Markdown file for a chunk."""
+    return output_dir / f"part_{index:04d}.md"
+
+
+def iter_chunks(questions: Iterable[Question], chunk_size: int) -> Iterator[list[Question]]:
+    """Splits the questions into lists of at most `chunk_size` items."""
+    iterator = iter(questions)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def export_sharded(
+    questions: Iterable[Question], output_dir: Path, chunk_size: int, workers: int = 0, title: str = "Exam Dump"
+) -> Path:
+    """Renders questions in parallel and writes one Markdown file per chunk.
+
+    At most two chunks per worker are in flight at any time, and each chunk is
+    written as soon as it completes, so memory stays bounded by the window
+    rather than by the size of the bank.
+
+    Args:
+        questions: The questions, in export order.
+        output_dir: Folder receiving the chunk files and the index.
+        chunk_size: Number of questions per chunk file.
+        workers: Number of worker processes (0 = one per CPU core).
+        title: Title used in the chunk headers and the index.
+
+    Returns:
+        Path of the generated index file.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 2
+    header_renderer = MarkdownRenderer()
+
+    results: dict[int, tuple[str, str, int]] = {}
+    chunks = enumerate(iter_chunks(questions, chunk_size), 1)
+
+    def write_chunk(result: ChunkResult) -> None:
+        path = chunk_filename(output_dir, result.index)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(header_renderer.render_header(f"{title} - Part {result.index}", result.count))
+            f.write(result.markdown)
+        results[result.index] = (result.first_id, result.last_id, result.count)
+        logger.debug(f"Wrote {path.name} ({result.count} questions)")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight: set[Future[ChunkResult]] = set()
+        for index, chunk in chunks:
+            in_flight.add(executor.submit(render_chunk, index, chunk))
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    write_chunk(future.result())
+
+        for future in wait(in_flight).done:
+            write_chunk(future.result())
+
+    index_path = output_dir / "index.md"
+    total = sum(count for _, _, count in results.values())
+    with open(index_path, "w", encoding="utf-8") as f:
+        f.write(header_renderer.render_header(f"{title} - Index", total))
+        for index in sorted(results):
+            first_id, last_id, count = results[index]
+            name = chunk_filename(output_dir, index).name
+            f.write(f"- [Part {index}: {first_id} - {last_id}]({name}) ({count} questions)\n")
+
+    # Drop the parts of an earlier, larger export: they are not linked from the new index
+    current = {chunk_filename(output_dir, index) for index in results}
+    for stale in output_dir.glob("part_*.md"):
+        if stale not in current:
+            stale.unlink()
+            logger.debug(f"Removed stale {stale.name}")
+
+    logger.info(f"Exported {total} questions into {len(results)} files using {workers} workers.")
+    return index_path
@@ -0,0 +1,452 @@
+"""Static Study Site Export Module.
+
+Writes a self-contained HTML site for reading a bank in the browser:
+
+- `index.html`: the page shell with the first chunk of questions inlined and
+  an empty placeholder per remaining chunk, filled in as it scrolls into view.
+- `data/chunk_NNNN.<hash>.json`: the pre-rendered questions of each chunk.
+- `data/search.<hash>.json`: a compact inverted index (sorted terms and
+  delta-encoded postings), fetched the first time the search box is focused.
+- `images/`: the question images, copied from the scraper's image folder and
+  referenced by the questions rather than inlined.
+
+Data files are named after a hash of their content, so an unchanged chunk is
+neither re-rendered nor rewritten on the next export, and the files can be
+cached by the browser forever. Changed chunks are rendered across a process
+pool. Answers are revealed with a native `<details>` element; the only script
+is the small loader and search below.
+"""
+
+import hashlib
+import html
+import os
+import re
+import shutil
+import string
+from collections.abc import Iterable, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import pairwise
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from codec import json_codec
+from converter.sharded import iter_chunks
+from models import Question
+from search import STOP_WORDS, tokenize
+from tracing import traced
+
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+# Leading question number of an image name ('32' in '32.1.png')
+_IMAGE_NUMBER_RE = re.compile(r"\d+(?=\.)")
+_RUN_TIMESTAMP_RE = re.compile(r"_\d{8}_\d{6}$")
+
+IMAGE_SUFFIXES = frozenset({".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg"})
+
+# Estimated height (px) of a question, reserved by the placeholders of chunks not loaded yet
+QUESTION_HEIGHT_ESTIMATE = 360
+
+# Characters of question text shown next to a search result
+EXCERPT_LENGTH = 90
+
+_STYLE = """
+body { font: 16px/1.5 system-ui, sans-serif; max-width: 52rem; margin: 0 auto; padding: 0 1rem 4rem; color: #1a202c; }
+header { position: sticky; top: 0; background: #fff; padding: .75rem 0; border-bottom: 1px solid #e2e8f0; z-index: 1; }
+header h1 { font-size: 1.25rem; margin: 0 0 .5rem; }
+#search { width: 100%; box-sizing: border-box; padding: .5rem .75rem; font-size: 1rem; }
+#results { margin: .5rem 0 0; padding-left: 1.25rem; max-height: 50vh; overflow-y: auto; }
+#results:empty { display: none; }
+#results span { color: #718096; }
+.question { content-visibility: auto; contain-intrinsic-size: auto 360px; border-bottom: 1px solid #e2e8f0; }
+.question img { max-width: 100%; }
+.options { list-style: none; padding: 0; }
+.options li { border: 2px solid #e2e8f0; border-radius: .375rem; padding: .5rem .75rem; margin: .375rem 0; }
+.question:has(details[open]) li.correct { border-color: rgb(56, 161, 105); background: #f0fff4; }
+summary { cursor: pointer; color: #3182ce; margin-bottom: 1rem; }
+"""
+
+_SCRIPT = """
+(() => {
+  const manifest = JSON.parse(document.getElementById("manifest").textContent);
+  const sections = document.querySelectorAll("section.chunk");
+  const loading = new Map();
+  const observer = new IntersectionObserver((entries) => {
+    for (const entry of entries) {
+      if (entry.isIntersecting) load(Number(entry.target.dataset.chunk));
+    }
+  }, {rootMargin: "200% 0px"});
+
+  function load(i) {
+    const section = sections[i];
+    if (section.dataset.loaded) return Promise.resolve();
+    if (!loading.has(i)) {
+      observer.unobserve(section);
+      loading.set(i, fetch("data/" + manifest.chunks[i].file)
+        .then((response) => response.json())
+        .then((chunk) => {
+          section.innerHTML = chunk.questions.join("");
+          section.style.minHeight = "";
+          section.dataset.loaded = "1";
+        })
+        .catch(() => { section.textContent = "Could not load this part."; })
+        .finally(() => loading.delete(i)));
+    }
+    return loading.get(i);
+  }
+  sections.forEach((section) => { if (!section.dataset.loaded) observer.observe(section); });
+
+  const slug = (id) => "q-" + id.toLowerCase().replace(/[^a-z0-9]+/g, "-").replace(/^-|-$/g, "");
+  const input = document.getElementById("search");
+  const results = document.getElementById("results");
+  let index = null;
+  let stopWords = null;
+  function loadIndex() {
+    index = index || fetch("data/" + manifest.search).then((response) => response.json()).then((data) => {
+      stopWords = new Set(data.stop);
+      return data;
+    });
+    return index;
+  }
+
+  function find(data, query) {
+    const words = (query.toLowerCase().match(/[a-z0-9]+/g) || []).filter((w) => !stopWords.has(w));
+    let hits = null;
+    for (const word of words) {
+      // Every indexed term starting with the word matches it (binary search for the first one)
+      let lo = 0, hi = data.terms.length;
+      while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if (data.terms[mid] < word) lo = mid + 1; else hi = mid;
+      }
+      const docs = new Set();
+      for (let t = lo; t < data.terms.length && data.terms[t].startsWith(word); t++) {
+        let doc = 0;
+        for (const delta of data.postings[t]) docs.add(doc += delta);
+      }
+      hits = hits === null ? docs : new Set([...hits].filter((doc) => docs.has(doc)));
+      if (!hits.size) break;
+    }
+    return hits === null ? [] : [...hits].sort((a, b) => a - b);
+  }
+
+  function show(data, hits) {
+    results.replaceChildren(...hits.slice(0, manifest.max_results).map((doc) => {
+      const [id, chunk, excerpt] = data.docs[doc];
+      const item = document.createElement("li");
+      const link = document.createElement("a");
+      link.href = "#" + slug(id);
+      link.textContent = id;
+      link.addEventListener("click", (event) => {
+        event.preventDefault();
+        load(chunk).then(() => {
+          document.getElementById(slug(id))?.scrollIntoView();
+          history.replaceState(null, "", link.href);
+        });
+      });
+      const text = document.createElement("span");
+      text.textContent = " " + excerpt;
+      item.append(link, text);
+      return item;
+    }));
+  }
+
+  let timer = 0;
+  input.addEventListener("focus", loadIndex, {once: true});
+  input.addEventListener("input", () => {
+    clearTimeout(timer);
+    timer = setTimeout(() => loadIndex().then((data) => show(data, find(data, input.value))), 80);
+  });
+  input.addEventListener("keydown", (event) => {
+    if (event.key === "Escape") { input.value = ""; results.replaceChildren(); }
+  });
+})();
+"""
+
+_PAGE = string.Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>$title</title>
+<style>$style</style>
+</head>
+<body>
+<header>
+<h1>$title <small>($count questions)</small></h1>
+<input id="search" type="search" placeholder="Search questions..." autocomplete="off">
+<ol id="results"></ol>
+</header>
+<noscript><p>Only the first $first_count questions are shown without JavaScript.</p></noscript>
+<main>
+$sections
+</main>
+<script id="manifest" type="application/json">$manifest</script>
+<script>$script</script>
+</body>
+</html>
+""")
+
+
+def exam_name(bank_path: Path) -> str:
+    """Returns the exam a bank belongs to: its file name without extensions and run timestamp."""
+    return _RUN_TIMESTAMP_RE.sub("", bank_path.name.split(".")[0])
+
+
+def anchor(q_id: str) -> str:
+    """Returns the HTML anchor of a question (e.g. 'Question 12' -> 'q-question-12')."""
+    return "q-" + _SLUG_RE.sub("-", q_id.lower()).strip("-")
+
+
+class HtmlRenderer:
+    """Converts questions into HTML fragments for the study site."""
+
+    # Bump whenever the output of render_question changes, to invalidate the exported chunks
+    VERSION = "1"
+
+    @traced
+    def render_question(self, question: Question, images: Sequence[str] = ()) -> str:
+        """Formats a single question into an HTML article.
+
+        Args:
+            question: The question to render.
+            images: Site-relative paths of the question's images, in display order.
+
+        Returns:
+            The HTML fragment.
+        """
+        correct_answers = question.answer_set
+        parts = [f'<article class="question" id="{anchor(question.id)}">', f"<h3>{html.escape(question.id)}</h3>"]
+        parts.extend(f"<p>{html.escape(line)}</p>" for line in question.text.splitlines() if line.strip())
+        alt = html.escape(question.id, quote=True)
+        parts.extend(
+            f'<figure><img src="{html.escape(image, quote=True)}" alt="{alt}" loading="lazy"></figure>'
+            for image in images
+        )
+
+        parts.append('<ol class="options">')
+        for key in sorted(question.options):
+            css = ' class="correct"' if key in correct_answers else ""
+            parts.append(f"<li{css}><b>{html.escape(key)})</b> {html.escape(question.options[key])}</li>")
+        parts.append("</ol>")
+
+        if correct_answers:
+            correct_str = html.escape(", ".join(question.answer_key))
+            parts.append(
+                f"<details><summary>Show answer</summary><p><b>Correct Answer:</b> {correct_str}</p></details>"
+            )
+        parts.append("</article>")
+        return "".join(parts)
+
+
+def render_site_chunk(path: Path, questions: list[Question], images: dict[int, list[str]]) -> int:
+    """Renders a chunk of questions and writes its data file (runs inside a worker process).
+
+    Args:
+        path: The chunk file to write.
+        questions: The questions of the chunk.
+        images: Site-relative image paths, by question number.
+
+    Returns:
+        The number of questions rendered successfully.
+    """
+    renderer = HtmlRenderer()
+    fragments = []
+    for question in questions:
+        try:
+            fragments.append(renderer.render_question(question, images.get(question.number, ())))
+        except Exception as e:
+            logger.warning(f"Skipping malformed question {question.id} in {path.name}: {e}")
+
+    # Write under a temporary name first: a file with the final name is trusted as complete
+    partial = path.with_name(f"{path.name}.part")
+    json_codec.dump_file({"questions": fragments}, partial, pretty=False)
+    partial.replace(path)
+    return len(fragments)
+
+
+def _image_order(path: Path) -> tuple[tuple[int, ...], str]:
+    """Sorts image files by the numbers in their name ('32.2.png' before '32.10.png'), then by name."""
+    return tuple(int(n) for n in re.findall(r"\d+", path.name)), path.name
+
+
+def sync_images(source_dir: Path, target_dir: Path) -> dict[int, list[str]]:
+    """Copies the question images into the site, skipping the ones already up to date.
+
+    Images are named after the number of their question (e.g. '25.jpg'), followed by
+    their position when a question has several (e.g. '32.1.png', '32.2.png').
+
+    Args:
+        source_dir: The scraper's image folder for the exam.
+        target_dir: The site's image folder.
+
+    Returns:
+        Site-relative image paths, by question number, in display order.
+    """
+    images: dict[int, list[str]] = {}
+    if source_dir.is_dir():
+        target_dir.mkdir(parents=True, exist_ok=True)
+        for source in sorted(source_dir.iterdir(), key=_image_order):
+            number = _IMAGE_NUMBER_RE.match(source.name)
+            if not number or source.suffix.lower() not in IMAGE_SUFFIXES:
+                continue
+            target = target_dir / source.name
+            stat = source.stat()
+            copied = target.stat() if target.exists() else None
+            if copied is None or (copied.st_size, copied.st_mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+                shutil.copy2(source, target)
+            images.setdefault(int(number.group()), []).append(f"{target_dir.name}/{source.name}")
+    else:
+        logger.debug(f"No image folder at {source_dir}.")
+
+    if target_dir.is_dir():
+        kept = {Path(path).name for paths in images.values() for path in paths}
+        for stale in target_dir.iterdir():
+            if stale.name not in kept:
+                stale.unlink()
+    return images
+
+
+def chunk_digest(questions: list[Question], images: dict[int, list[str]]) -> str:
+    """Returns the content hash naming a chunk file: questions, image paths and renderer version."""
+    payload = json_codec.dump_bytes([[q.to_dict(), images.get(q.number, [])] for q in questions])
+    return hashlib.blake2b(HtmlRenderer.VERSION.encode() + b"\0" + payload, digest_size=8).hexdigest()
+
+
+class SearchIndexBuilder:
+    """Builds the compact inverted index searched by the site in the browser."""
+
+    def __init__(self) -> None:
+        """Initializes an empty index."""
+        self.docs: list[tuple[str, int, str]] = []
+        self.postings: dict[str, list[int]] = {}
+
+    def add(self, question: Question, chunk: int) -> None:
+        """Indexes a question (in export order).
+
+        Args:
+            question: The question.
+            chunk: Position of the chunk holding it (0-based).
+        """
+        doc = len(self.docs)
+        excerpt = " ".join(question.text.split())
+        if len(excerpt) > EXCERPT_LENGTH:
+            excerpt = excerpt[: EXCERPT_LENGTH - 1] + "…"
+        self.docs.append((question.id, chunk, excerpt))
+        for term in set(tokenize(" ".join([question.text, *question.options.values()]))):
+            self.postings.setdefault(term, []).append(doc)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Returns the index: sorted terms, their delta-encoded document numbers, and the documents."""
+        terms = sorted(self.postings)
+        postings = []
+        for term in terms:
+            docs = self.postings[term]
+            postings.append([docs[0]] + [current - previous for previous, current in pairwise(docs)])
+        return {"stop": sorted(STOP_WORDS), "terms": terms, "postings": postings, "docs": self.docs}
+
+
+def _write_data_file(data_dir: Path, stem: str, obj: Any) -> str:
+    """Writes a content-named data file unless it already exists, and returns its name."""
+    payload = json_codec.dump_bytes(obj)
+    name = f"{stem}.{hashlib.blake2b(payload, digest_size=8).hexdigest()}.json"
+    path = data_dir / name
+    if not path.exists():
+        partial = path.with_name(f"{name}.part")
+        partial.write_bytes(payload)
+        partial.replace(path)
+    return name
+
+
+def export_site(
+    questions: Iterable[Question],
+    output_dir: Path,
+    images_dir: Path,
+    chunk_size: int,
+    workers: int = 0,
+    title: str = "Exam Dump",
+    max_results: int = 100,
+) -> Path:
+    """Exports the questions as a static study site, re-rendering only the chunks that changed.
+
+    Args:
+        questions: The questions, in export order.
+        output_dir: Folder receiving the site.
+        images_dir: Folder holding the exam's question images ('<question number>[.<position>].<ext>').
+        chunk_size: Number of questions per lazily loaded chunk.
+        workers: Number of worker processes (0 = one per CPU core).
+        title: Title of the page.
+        max_results: Maximum number of search results listed.
+
+    Returns:
+        Path of the generated `index.html`.
+    """
+    data_dir = output_dir / "data"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 2
+
+    images = sync_images(images_dir, output_dir / "images")
+    search_index = SearchIndexBuilder()
+    chunks: list[dict[str, Any]] = []
+    rendered = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight: set[Future[int]] = set()
+        for index, chunk in enumerate(iter_chunks(questions, chunk_size)):
+            chunk_images = {q.number: images[q.number] for q in chunk if q.number in images}
+            name = f"chunk_{index + 1:04d}.{chunk_digest(chunk, chunk_images)}.json"
+            chunks.append({"file": name, "count": len(chunk)})
+            for question in chunk:
+                search_index.add(question, index)
+
+            if (data_dir / name).exists():
+                continue
+            in_flight.add(executor.submit(render_site_chunk, data_dir / name, chunk, chunk_images))
+            rendered += 1
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+
+        for future in wait(in_flight).done:
+            future.result()
+
+    search_file = _write_data_file(data_dir, "search", search_index.to_dict())
+    manifest = {"chunks": chunks, "search": search_file, "max_results": max_results}
+
+    # Remove the data files of previous exports
+    current = {chunk["file"] for chunk in chunks} | {search_file}
+    for stale in data_dir.iterdir():
+        if stale.name not in current:
+            stale.unlink()
+
+    sections = []
+    for index, chunk in enumerate(chunks):
+        if index == 0:
+            # Inline the first chunk so the page shows questions without waiting for a fetch
+            fragments = json_codec.load_file(data_dir / chunk["file"])["questions"]
+            sections.append(f'<section class="chunk" data-chunk="0" data-loaded="1">{"".join(fragments)}</section>')
+        else:
+            height = chunk["count"] * QUESTION_HEIGHT_ESTIMATE
+            sections.append(f'<section class="chunk" data-chunk="{index}" style="min-height: {height}px"></section>')
+
+    page = _PAGE.substitute(
+        title=html.escape(title),
+        count=len(search_index.docs),
+        first_count=chunks[0]["count"] if chunks else 0,
+        style=_STYLE,
+        script=_SCRIPT,
+        # '</' would end the script element early
+        manifest=json_codec.dumps(manifest).replace("</", "<\\/"),
+        sections="\n".join(sections),
+    )
+    index_path = output_dir / "index.html"
+    if not index_path.exists() or index_path.read_text(encoding="utf-8") != page:
+        index_path.write_text(page, encoding="utf-8")
+
+    logger.info(
+        f"Exported {len(search_index.docs)} questions in {len(chunks)} chunks "
+        f"({rendered} re-rendered using {workers} workers, {sum(map(len, images.values()))} images)."
+    )
+    return index_path
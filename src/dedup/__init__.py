@@ -0,0 +1,3 @@
+from dedup.minhash import DuplicateMatch, MinHashIndex, find_duplicate_groups, question_fingerprint_text
+
+__all__ = ["DuplicateMatch", "MinHashIndex", "find_duplicate_groups", "question_fingerprint_text"]
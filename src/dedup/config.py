@@ -0,0 +1,18 @@
+"""Configuration module for the Dedup package."""
+
+import os
+from pathlib import Path
+from typing import Final
+
+from dotenv import load_dotenv
+
+# Load .env file if present
+load_dotenv()
+
+# --- Paths ---
+BASE_DIR: Final[Path] = Path(__file__).resolve().parent.parent.parent
+OUTPUT_DIR: Final[Path] = BASE_DIR / "output"
+REPORTS_DIR: Final[Path] = BASE_DIR / "reports"
+
+# Minimum estimated Jaccard similarity for two questions to count as duplicates
+THRESHOLD: Final[float] = float(os.getenv("DEDUP_THRESHOLD", "0.8"))
@@ -0,0 +1,139 @@
+"""Main entry point for the standalone Dedup pass.
+
+Usage:
+    uv run -m dedup.main                      # every question bank in output/
+    uv run -m dedup.main output/a.json output/b.yaml --merge output/merged.json
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from loguru import logger
+
+from codec.compression import split_suffix
+from dedup import config
+from dedup.minhash import find_duplicate_groups
+from models import Question
+from scraper.storage import SaverFactory
+
+
+def configure_logging() -> None:
+    """Configures Loguru for console output."""
+    logger.remove()
+    logger.add(sys.stderr, format="<green>{time:HH:mm:ss}</green> | <level>{message}</level>", level="INFO")
+
+
+def find_banks(directory: Path) -> list[Path]:
+    """Lists the JSON / JSON Lines question banks of a folder, compressed or not, skipping index sidecars."""
+    return sorted(
+        path
+        for path in directory.iterdir()
+        if path.is_file()
+        and split_suffix(path)[0] in {"json", "jsonl"}
+        and not path.name.endswith((".search.json", ".topics.json", ".manifest.json"))
+    )
+
+
+def load_questions(files: list[Path]) -> dict[str, tuple[Path, Question]]:
+    """Loads every question of every file, keyed by 'file.name::question id'."""
+    questions: dict[str, tuple[Path, Question]] = {}
+    for path in files:
+        data = SaverFactory.for_file(path).load_existing(str(path))
+        logger.info(f"Loaded {len(data)} questions from {path.name}")
+        for q_id, question in data.items():
+            questions[f"{path.name}::{q_id}"] = (path, question)
+    return questions
+
+
+def write_report(groups: list[list[tuple[str, float]]], questions: dict[str, tuple[Path, Question]]) -> Path:
+    """Writes a Markdown report listing every duplicate group.
+
+    Returns:
+        The path of the report.
+    """
+    config.REPORTS_DIR.mkdir(exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filepath = config.REPORTS_DIR / f"dedup_report_{timestamp}.md"
+
+    lines = [
+        "# Near-Duplicate Questions Report\n",
+        f"**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n",
+        f"**Questions scanned:** {len(questions)}\n\n",
+        f"**Duplicate groups:** {len(groups)}\n\n",
+        "---\n\n",
+    ]
+    for idx, group in enumerate(groups, 1):
+        _, first = questions[group[0][0]]
+        lines.append(f"## Group {idx}\n\n")
+        lines.append(f"> {first.text[:300]}\n\n")
+        lines.extend(f"- `{key}` (similarity {similarity:.2f})\n" for key, similarity in group)
+        lines.append("\n")
+    filepath.write_text("".join(lines), encoding="utf-8")
+
+    return filepath
+
+
+def merge(groups: list[list[tuple[str, float]]], questions: dict[str, tuple[Path, Question]]) -> dict[str, Question]:
+    """Keeps one question per duplicate group (the first one with an answer key).
+
+    IDs colliding between different (non-duplicate) questions of different
+    files are prefixed with their file stem.
+
+    Returns:
+        The merged question map, keyed by ID.
+    """
+    dropped = set()
+    for group in groups:
+        keys = [key for key, _ in group]
+        keep = next((k for k in keys if questions[k][1].correct_answers), keys[0])
+        dropped.update(k for k in keys if k != keep)
+
+    merged: dict[str, Question] = {}
+    for key, (path, question) in questions.items():
+        if key in dropped:
+            continue
+        kept = question
+        if question.id in merged:
+            kept = Question(
+                id=f"{path.stem} {question.id}",
+                text=question.text,
+                options=question.options,
+                correct_answers=question.correct_answers,
+            )
+        merged[kept.id] = kept
+    return merged
+
+
+def main() -> None:
+    """Main execution function."""
+    configure_logging()
+
+    parser = argparse.ArgumentParser(description="Find near-duplicate questions across question banks.")
+    parser.add_argument("files", nargs="*", type=Path, help="Question banks (default: every bank in output/).")
+    parser.add_argument("--threshold", type=float, default=config.THRESHOLD, help="Minimum Jaccard similarity.")
+    parser.add_argument("--merge", type=Path, help="Write a deduplicated bank to this file.")
+    args = parser.parse_args()
+
+    files = args.files or (find_banks(config.OUTPUT_DIR) if config.OUTPUT_DIR.exists() else [])
+    if not files:
+        logger.error("No question banks found.")
+        return
+
+    questions = load_questions(files)
+    groups = find_duplicate_groups(((key, q) for key, (_, q) in questions.items()), threshold=args.threshold)
+    duplicates = sum(len(group) - 1 for group in groups)
+    logger.info(f"Found {len(groups)} duplicate groups ({duplicates} redundant questions).")
+
+    report_path = write_report(groups, questions)
+    logger.success(f"Report saved to: {report_path}")
+
+    if args.merge:
+        merged = merge(groups, questions)
+        SaverFactory.for_file(args.merge).save(merged, str(args.merge))
+        logger.success(f"Merged {len(merged)} unique questions into: {args.merge}")
+
+
+if __name__ == "__main__":
+    main()
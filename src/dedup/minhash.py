@@ -0,0 +1,200 @@
+"""MinHash / LSH Near-Duplicate Detection Module.
+
+Each question is reduced to a MinHash signature of its word shingles; the
+signatures are split into bands and hashed into buckets (locality-sensitive
+hashing), so only questions sharing a bucket are ever compared. This keeps
+detection roughly linear in the number of questions.
+"""
+
+import re
+import zlib
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import numpy as np
+
+from models import Question
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+
+
+def question_fingerprint_text(question: Question) -> str:
+    """Returns the text used to compare questions (prompt plus sorted option values)."""
+    return " ".join([question.text, *sorted(question.options.values())])
+
+
+def shingles(text: str, size: int = 3) -> set[str]:
+    """Splits text into overlapping word n-grams.
+
+    Args:
+        text: The text to shingle.
+        size: Number of words per shingle.
+
+    Returns:
+        The set of shingles (the whole text if shorter than `size` words).
+    """
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+@dataclass
+class DuplicateMatch:
+    """A pair of near-duplicate questions.
+
+    Attributes:
+        key: Key of the question being added.
+        duplicate_of: Key of the indexed question it duplicates.
+        similarity: Estimated Jaccard similarity of their shingle sets.
+    """
+
+    key: str
+    duplicate_of: str
+    similarity: float
+
+
+class MinHashIndex:
+    """Incremental LSH index of MinHash signatures."""
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128, bands: int = 16, seed: int = 1) -> None:
+        """Initializes an empty index.
+
+        Args:
+            threshold: Minimum estimated Jaccard similarity to report a duplicate.
+            num_perm: Number of hash permutations per signature.
+            bands: Number of LSH bands (num_perm must be a multiple of it).
+            seed: Seed of the permutation coefficients.
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands.")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        # Shingle hashes are 32-bit, so a < 2**31 and b < 2**32 keep a * x + b within uint64
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+        self._signatures: dict[str, np.ndarray] = {}
+        self._buckets: list[dict[bytes, set[str]]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        """Returns the number of indexed questions."""
+        return len(self._signatures)
+
+    def signature(self, text: str) -> np.ndarray:
+        """Computes the MinHash signature of a text.
+
+        Args:
+            text: The text to sign.
+
+        Returns:
+            An array of `num_perm` unsigned 64-bit minimum hash values.
+        """
+        hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles(text)), dtype=np.uint64)
+        if not hashes.size:
+            return np.full(self._a.shape, _MERSENNE_PRIME, dtype=np.uint64)
+        # (a * x + b) mod p for every (shingle, permutation) pair, then the minimum per permutation
+        permuted = (hashes[:, None] * self._a + self._b) % _MERSENNE_PRIME
+        return permuted.min(axis=0)
+
+    def add(self, key: str, text: str) -> list[DuplicateMatch]:
+        """Indexes a text and returns the already indexed texts it nearly duplicates.
+
+        Re-adding an existing key replaces its previous signature.
+
+        Args:
+            key: Unique key of the text (e.g. the question ID).
+            text: The text to index.
+
+        Returns:
+            The matches above the threshold, most similar first.
+        """
+        if key in self._signatures:
+            self.remove(key)
+
+        sig = self.signature(text)
+        band_keys = [sig[i * self.rows : (i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+        candidates: set[str] = set()
+        for buckets, band_key in zip(self._buckets, band_keys, strict=True):
+            candidates.update(buckets.get(band_key, ()))
+
+        matches = []
+        for other in candidates:
+            similarity = self._similarity(self._signatures[other], sig)
+            if similarity >= self.threshold:
+                matches.append(DuplicateMatch(key=key, duplicate_of=other, similarity=similarity))
+
+        self._signatures[key] = sig
+        for buckets, band_key in zip(self._buckets, band_keys, strict=True):
+            buckets.setdefault(band_key, set()).add(key)
+
+        return sorted(matches, key=lambda m: m.similarity, reverse=True)
+
+    def similarity(self, key: str, other: str) -> float:
+        """Estimates the Jaccard similarity of two indexed texts from their signatures."""
+        return self._similarity(self._signatures[key], self._signatures[other])
+
+    @staticmethod
+    def _similarity(sig: np.ndarray, other: np.ndarray) -> float:
+        """Returns the share of permutations on which two signatures agree."""
+        return float(np.mean(sig == other))
+
+    def remove(self, key: str) -> None:
+        """Removes a key from the index, if present."""
+        sig = self._signatures.pop(key, None)
+        if sig is None:
+            return
+        for i, buckets in enumerate(self._buckets):
+            band_key = sig[i * self.rows : (i + 1) * self.rows].tobytes()
+            bucket = buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del buckets[band_key]
+
+
+def find_duplicate_groups(
+    questions: Iterable[tuple[str, Question]], threshold: float = 0.8
+) -> list[list[tuple[str, float]]]:
+    """Groups near-duplicate questions together.
+
+    Args:
+        questions: (key, question) pairs; keys must be unique.
+        threshold: Minimum estimated Jaccard similarity of duplicates.
+
+    Returns:
+        Groups of two or more keys, each as (key, similarity to the group's first key) pairs,
+        in input order within a group.
+    """
+    index = MinHashIndex(threshold=threshold)
+    parent: dict[str, str] = {}
+    order: list[str] = []
+
+    def find(key: str) -> str:
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    for key, question in questions:
+        order.append(key)
+        parent[key] = key
+        for match in index.add(key, question_fingerprint_text(question)):
+            root_new, root_old = find(key), find(match.duplicate_of)
+            if root_new != root_old:
+                parent[root_new] = root_old
+
+    members: dict[str, list[str]] = {}
+    for key in order:
+        members.setdefault(find(key), []).append(key)
+    # Similarities are measured against the first question of the group, whichever groups were joined
+    return [
+        [(key, 1.0 if key == keys[0] else index.similarity(key, keys[0])) for key in keys]
+        for keys in members.values()
+        if len(keys) > 1
+    ]
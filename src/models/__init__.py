@@ -0,0 +1,4 @@
+from models.question import Question, question_number
+from models.user_answer import UserAnswer
+
+__all__ = ["Question", "UserAnswer", "question_number"]
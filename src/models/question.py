@@ -0,0 +1,90 @@
+"""Defines the question model shared by the scraper, the quiz and the converter."""
+
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Any
+
+_NUMBER_RE = re.compile(r"\d+")
+
+# Answer keys seen so far -> (labels, labels sorted, label set). A bank only holds a
+# few distinct keys ("A", "B", "A, C"...), so every question shares these objects.
+_ANSWER_KEYS: dict[tuple[str, ...], tuple[tuple[str, ...], tuple[str, ...], frozenset[str]]] = {}
+
+
+def question_number(q_id: str) -> int:
+    """Parses the numeric value from a Question ID string (its last number, 0 if there is none)."""
+    numbers = _NUMBER_RE.findall(q_id)
+    return int(numbers[-1]) if numbers else 0
+
+
+@dataclass(slots=True)
+class Question:
+    """A single exam question.
+
+    Option labels ("A", "B", ...) are interned, so the thousands of copies in a
+    large bank share one string each. The correct answers and the attributes
+    derived from them are computed once per distinct answer key and shared by
+    every question with that key, so they cost each instance a pointer apiece.
+
+    Attributes:
+        id: The unique identifier of the question (e.g., "Question 1").
+        text: The full text of the question prompt.
+        options: A dictionary mapping option labels (A, B...) to option text.
+        correct_answers: The labels of the correct options (a list is accepted and stored as a tuple).
+        number: The numeric part of the ID (0 if there is none).
+        answer_key: The correct labels, sorted.
+        answer_set: The correct labels, for order-insensitive comparisons.
+        is_multiple_choice: True if there is more than one correct answer.
+    """
+
+    id: str
+    text: str
+    options: dict[str, str] = field(default_factory=dict)
+    correct_answers: tuple[str, ...] = ()
+    number: int = field(init=False, repr=False, compare=False)
+    answer_key: tuple[str, ...] = field(init=False, repr=False, compare=False)
+    answer_set: frozenset[str] = field(init=False, repr=False, compare=False)
+    is_multiple_choice: bool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Interns the labels, shares the answer key and parses the number."""
+        # Older files may hold a single label (or nothing) instead of a list
+        answers = self.correct_answers
+        key = (answers,) if isinstance(answers, str) else tuple(answers or ())
+        shared = _ANSWER_KEYS.get(key)
+        if shared is None:
+            labels = tuple(sys.intern(label) for label in key)
+            shared = _ANSWER_KEYS[labels] = (labels, tuple(sorted(labels)), frozenset(labels))
+        self.correct_answers, self.answer_key, self.answer_set = shared
+        self.is_multiple_choice = len(self.answer_set) > 1
+        # Decoders usually share the key strings already: the dict is only rebuilt when one is not interned
+        if any(sys.intern(label) is not label for label in self.options):
+            self.options = {sys.intern(label): value for label, value in self.options.items()}
+        self.number = question_number(self.id)
+
+    @classmethod
+    def from_dict(cls, item: dict[str, Any]) -> "Question":
+        """Builds a question from its serialized form (unknown keys are ignored).
+
+        Args:
+            item: A decoded question record, as written by `to_dict`.
+
+        Returns:
+            The question.
+        """
+        return cls(
+            id=item["id"],
+            text=item.get("text", ""),
+            options=item.get("options") or {},
+            correct_answers=item.get("correct_answers") or [],
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Returns the serialized form of the question (without the derived attributes)."""
+        return {
+            "id": self.id,
+            "text": self.text,
+            "options": self.options,
+            "correct_answers": list(self.correct_answers),
+        }
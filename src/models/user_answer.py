@@ -0,0 +1,19 @@
+"""Defines the answer model recorded by the quiz."""
+
+from dataclasses import dataclass, field
+
+from models.question import Question
+
+
+@dataclass(slots=True)
+class UserAnswer:
+    """Tracks the user's response to a question."""
+
+    question: Question
+    selected_options: list[str]
+    time_taken_seconds: float = 0.0
+    is_correct: bool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Grades the answer once: the selection must match the correct labels exactly, in any order."""
+        self.is_correct = frozenset(self.selected_options) == self.question.answer_set
@@ -0,0 +1,235 @@
+"""Adaptive Testing Module.
+
+Models answers with two-parameter item response theory (2PL):
+
+    P(correct | ability) = 1 / (1 + exp(-a * (ability - b)))
+
+where `b` is the difficulty of a question and `a` its discrimination (how
+sharply it separates weaker from stronger candidates).
+
+- Calibration: `a` and `b` are fitted in batch from the history store, each
+  session counting as one candidate, by joint maximum a posteriori estimation.
+  Every Newton step is a handful of `np.bincount` reductions over the whole
+  answer columns.
+- Session: the ability is re-estimated after every answer (posterior mean over
+  a fixed grid), and the next question is the unused one with the most Fisher
+  information at that estimate, drawn at random among the `top_k` best so
+  repeated exams differ. Selection is a few whole-array operations over the
+  bank, with no Python loop over questions.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from quiz_app.history import HistoryStore
+
+# Gaussian priors keeping estimates finite for sessions and questions with few (or uniform) answers
+ABILITY_PRIOR_SD = 1.0
+DIFFICULTY_PRIOR_SD = 2.0
+DISCRIMINATION_PRIOR_MEAN = 1.0
+DISCRIMINATION_PRIOR_SD = 0.5
+DISCRIMINATION_RANGE = (0.2, 4.0)
+
+CALIBRATION_ITERATIONS = 50
+# Largest change of a parameter in one Newton step, and the change below which calibration stops
+MAX_STEP = 1.0
+TOLERANCE = 1e-4
+
+# Abilities at which the session posterior is evaluated
+ABILITY_GRID = np.linspace(-4.0, 4.0, 81)
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    """Logistic function."""
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+@dataclass
+class ItemParameters:
+    """Calibrated 2PL parameters of the questions of a bank.
+
+    Attributes:
+        difficulty: `b` of each question (0 = average; higher is harder).
+        discrimination: `a` of each question.
+        attempts: Number of recorded answers each estimate is based on.
+    """
+
+    difficulty: np.ndarray
+    discrimination: np.ndarray
+    attempts: np.ndarray
+
+    @classmethod
+    def uncalibrated(cls, num_items: int) -> "ItemParameters":
+        """Returns the prior parameters, used for questions that were never answered."""
+        return cls(
+            difficulty=np.zeros(num_items),
+            discrimination=np.full(num_items, DISCRIMINATION_PRIOR_MEAN),
+            attempts=np.zeros(num_items, dtype=np.int64),
+        )
+
+
+def calibrate(
+    persons: np.ndarray,
+    items: np.ndarray,
+    correct: np.ndarray,
+    num_items: int,
+    iterations: int = CALIBRATION_ITERATIONS,
+) -> ItemParameters:
+    """Fits the 2PL parameters of every question to recorded answers.
+
+    Abilities, difficulties and discriminations are updated in turn with one
+    (prior-regularized, step-limited) Newton step each per iteration.
+
+    Args:
+        persons: Candidate (session) of each answer, any integer key.
+        items: Question of each answer, as an index in [0, num_items).
+        correct: 1 if the answer was correct, 0 otherwise.
+        num_items: Number of questions in the bank.
+        iterations: Maximum number of iterations.
+
+    Returns:
+        The parameters of every question (the priors for questions without answers).
+    """
+    params = ItemParameters.uncalibrated(num_items)
+    params.attempts = np.bincount(items, minlength=num_items)
+    if len(items) == 0:
+        return params
+
+    _, persons = np.unique(persons, return_inverse=True)
+    num_persons = int(persons.max()) + 1
+    y = correct.astype(np.float64)
+    ability = np.zeros(num_persons)
+    a, b = params.discrimination, params.difficulty
+
+    def newton(grad: np.ndarray, curvature: np.ndarray) -> np.ndarray:
+        """Returns the Newton step of a parameter vector, limited to MAX_STEP."""
+        return np.clip(grad / curvature, -MAX_STEP, MAX_STEP)
+
+    for _ in range(iterations):
+        a_i = a[items]
+        p = _sigmoid(a_i * (ability[persons] - b[items]))
+        residual, weight = y - p, p * (1 - p)
+        step_ability = newton(
+            np.bincount(persons, a_i * residual, num_persons) - ability / ABILITY_PRIOR_SD**2,
+            np.bincount(persons, a_i * a_i * weight, num_persons) + 1 / ABILITY_PRIOR_SD**2,
+        )
+        ability += step_ability
+
+        p = _sigmoid(a_i * (ability[persons] - b[items]))
+        residual, weight = y - p, p * (1 - p)
+        step_b = newton(
+            -np.bincount(items, a_i * residual, num_items) - b / DIFFICULTY_PRIOR_SD**2,
+            np.bincount(items, a_i * a_i * weight, num_items) + 1 / DIFFICULTY_PRIOR_SD**2,
+        )
+        b += step_b
+
+        distance = ability[persons] - b[items]
+        p = _sigmoid(a_i * distance)
+        residual, weight = y - p, p * (1 - p)
+        step_a = newton(
+            np.bincount(items, distance * residual, num_items)
+            - (a - DISCRIMINATION_PRIOR_MEAN) / DISCRIMINATION_PRIOR_SD**2,
+            np.bincount(items, distance * distance * weight, num_items) + 1 / DISCRIMINATION_PRIOR_SD**2,
+        )
+        np.clip(a + step_a, *DISCRIMINATION_RANGE, out=a)
+
+        largest = max(np.abs(step_ability).max(), np.abs(step_b).max(), np.abs(step_a).max())
+        if largest < TOLERANCE:
+            break
+    return params
+
+
+def calibrate_from_history(history: HistoryStore | None, bank: str, question_ids: list[str]) -> ItemParameters:
+    """Calibrates the questions of a bank on the answers recorded for it.
+
+    Args:
+        history: The history store (None = no history, the priors are used).
+        bank: Name of the bank in the history (its file name).
+        question_ids: The questions to calibrate, in the order of the returned arrays.
+
+    Returns:
+        The parameters of each question.
+    """
+    if history is None:
+        return ItemParameters.uncalibrated(len(question_ids))
+
+    columns, strings = history.load()
+    string_ids = {value: i for i, value in enumerate(strings)}
+    if bank not in string_ids:
+        return ItemParameters.uncalibrated(len(question_ids))
+
+    # Map the dictionary ID of each question to its position in `question_ids` (-1 = not in the bank)
+    positions = np.full(len(strings), -1, dtype=np.int64)
+    known = [(string_ids[q_id], i) for i, q_id in enumerate(question_ids) if q_id in string_ids]
+    if known:
+        keys, values = zip(*known, strict=True)
+        positions[list(keys)] = values
+
+    items = positions[columns["question"]]
+    rows = (columns["bank"] == string_ids[bank]) & (items >= 0)
+    return calibrate(columns["session"][rows], items[rows], columns["correct"][rows], len(question_ids))
+
+
+class AdaptiveTest:
+    """Picks the questions of an adaptive session and tracks the candidate's estimated ability."""
+
+    def __init__(self, params: ItemParameters, top_k: int = 5, rng: np.random.Generator | None = None) -> None:
+        """Initializes a session over a calibrated bank.
+
+        Args:
+            params: The parameters of every question of the bank.
+            top_k: Number of most informative questions the next one is drawn from.
+            rng: Random generator (defaults to a fresh one).
+        """
+        self.difficulty = params.difficulty
+        self.discrimination = params.discrimination
+        self.top_k = max(1, top_k)
+        self.rng = rng or np.random.default_rng()
+        self.ability = 0.0
+        self.standard_error = ABILITY_PRIOR_SD
+        self._squared_discrimination = self.discrimination**2
+        self._used = np.zeros(len(self.difficulty), dtype=bool)
+        self._log_posterior = -0.5 * (ABILITY_GRID / ABILITY_PRIOR_SD) ** 2
+
+    @property
+    def remaining(self) -> int:
+        """Number of questions not asked yet."""
+        return len(self._used) - int(np.count_nonzero(self._used))
+
+    def select(self) -> int:
+        """Picks the next question: one of the `top_k` most informative at the current ability estimate.
+
+        Returns:
+            The index of the question (marked as used).
+
+        Raises:
+            IndexError: If every question was used.
+        """
+        k = min(self.top_k, self.remaining)
+        if k == 0:
+            raise IndexError("Every question of the bank has been asked.")
+
+        p = _sigmoid(self.discrimination * (self.ability - self.difficulty))
+        information = self._squared_discrimination * p * (1 - p)
+        information[self._used] = -1.0
+        best = np.argpartition(information, -k)[-k:]
+        index = int(self.rng.choice(best))
+        self._used[index] = True
+        return index
+
+    def record(self, index: int, correct: bool) -> None:
+        """Updates the ability estimate with an answer.
+
+        Args:
+            index: The question answered.
+            correct: Whether the answer was correct.
+        """
+        self._used[index] = True
+        p = _sigmoid(self.discrimination[index] * (ABILITY_GRID - self.difficulty[index]))
+        self._log_posterior += np.log(p) if correct else np.log1p(-p)
+
+        weights = np.exp(self._log_posterior - self._log_posterior.max())
+        weights /= weights.sum()
+        self.ability = float(weights @ ABILITY_GRID)
+        self.standard_error = float(np.sqrt(weights @ (ABILITY_GRID - self.ability) ** 2))
@@ -0,0 +1,163 @@
+"""Performance Analytics Module.
+
+Computes per-question difficulty, per-topic accuracy, answer-time
+distributions and weakest areas from the history store. Every statistic is a
+grouped NumPy reduction over whole columns.
+
+Usage:
+    uv run -m quiz_app.analytics [--min-attempts 3] [--top 10]
+"""
+
+import argparse
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from quiz_app import config
+from quiz_app.history import HistoryStore
+
+
+@dataclass
+class GroupStats:
+    """Aggregated outcomes per group (question, topic, ...).
+
+    Attributes:
+        keys: The group keys.
+        attempts: Number of answers per group.
+        accuracy: Share of correct answers per group (0-1).
+        mean_time: Mean seconds taken per group.
+    """
+
+    keys: np.ndarray
+    attempts: np.ndarray
+    accuracy: np.ndarray
+    mean_time: np.ndarray
+
+
+def group_stats(keys: np.ndarray, correct: np.ndarray, time_taken: np.ndarray) -> GroupStats:
+    """Aggregates answers by key.
+
+    Args:
+        keys: Group key of each answer.
+        correct: 1 if the answer was correct, 0 otherwise.
+        time_taken: Seconds taken by each answer.
+
+    Returns:
+        The per-group statistics.
+    """
+    unique, inverse = np.unique(keys, return_inverse=True)
+    attempts = np.bincount(inverse)
+    accuracy = np.bincount(inverse, weights=correct) / attempts
+    mean_time = np.bincount(inverse, weights=time_taken) / attempts
+    return GroupStats(keys=unique, attempts=attempts, accuracy=accuracy, mean_time=mean_time)
+
+
+def question_difficulty(columns: dict[str, np.ndarray]) -> GroupStats:
+    """Aggregates answers per (bank, question) pair; difficulty is 1 - accuracy."""
+    keys = (columns["bank"].astype(np.int64) << 32) | columns["question"].astype(np.int64)
+    return group_stats(keys, columns["correct"], columns["time_taken"])
+
+
+def topic_accuracy(columns: dict[str, np.ndarray]) -> GroupStats:
+    """Aggregates answers per topic."""
+    return group_stats(columns["topic"], columns["correct"], columns["time_taken"])
+
+
+def time_distribution(time_taken: np.ndarray, bins: int = 10) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Summarizes answer times.
+
+    Args:
+        time_taken: Seconds taken by each answer.
+        bins: Number of histogram bins.
+
+    Returns:
+        The 10th/50th/90th/99th percentiles, the histogram counts and the bin edges.
+    """
+    percentiles = np.percentile(time_taken, [10, 50, 90, 99])
+    counts, edges = np.histogram(time_taken, bins=bins, range=(0, max(float(percentiles[-1]), 1.0)))
+    return percentiles, counts, edges
+
+
+def weakest(stats: GroupStats, min_attempts: int, top: int) -> np.ndarray:
+    """Returns the indices of the lowest-accuracy groups with enough attempts.
+
+    Ties are broken by the slowest mean answer time.
+    """
+    eligible = np.flatnonzero(stats.attempts >= min_attempts)
+    order = np.lexsort((-stats.mean_time[eligible], stats.accuracy[eligible]))
+    return eligible[order][:top]
+
+
+def main() -> None:
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Analyze quiz session history.")
+    parser.add_argument("--min-attempts", type=int, default=3, help="Minimum answers for a question or topic to rank.")
+    parser.add_argument("--top", type=int, default=10, help="Number of weakest questions/topics to show.")
+    args = parser.parse_args()
+
+    console = Console()
+    start = time.perf_counter()
+    columns, strings = HistoryStore(config.HISTORY_DIR).load()
+    total = len(columns["correct"])
+    if total == 0:
+        console.print("[yellow]No quiz history recorded yet.[/yellow]")
+        return
+
+    questions = question_difficulty(columns)
+    topics = topic_accuracy(columns)
+    percentiles, counts, edges = time_distribution(columns["time_taken"])
+    weak_questions = weakest(questions, args.min_attempts, args.top)
+    weak_topics = weakest(topics, args.min_attempts, args.top)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    sessions = len(np.unique(columns["session"]))
+    overall = columns["correct"].mean() * 100
+    console.print(
+        f"[bold]{total}[/bold] answers over [bold]{sessions}[/bold] sessions, "
+        f"overall accuracy [bold]{overall:.1f}%[/bold] (computed in {elapsed_ms:.1f} ms)\n"
+    )
+
+    # 1. Answer times
+    p10, p50, p90, p99 = percentiles
+    console.print(f"Answer time: p10 {p10:.1f}s | median {p50:.1f}s | p90 {p90:.1f}s | p99 {p99:.1f}s")
+    peak = max(int(counts.max()), 1)
+    for count, low, high in zip(counts, edges[:-1], edges[1:], strict=True):
+        console.print(f"  {low:6.1f}-{high:6.1f}s {'█' * int(40 * count / peak)} {count}")
+    console.print("")
+
+    # 2. Weakest topics
+    table = Table(title="Weakest Topics", box=box.ROUNDED, expand=True)
+    table.add_column("Topic", style="cyan")
+    table.add_column("Attempts", justify="right")
+    table.add_column("Accuracy", justify="right")
+    table.add_column("Mean Time", justify="right")
+    for i in weak_topics:
+        label = strings[topics.keys[i]] or "(no topic index)"
+        table.add_row(label, str(topics.attempts[i]), f"{topics.accuracy[i]:.0%}", f"{topics.mean_time[i]:.1f}s")
+    console.print(table)
+
+    # 3. Hardest questions
+    table = Table(title="Hardest Questions", box=box.ROUNDED, expand=True)
+    table.add_column("Bank", style="magenta")
+    table.add_column("Q.ID", style="cyan", no_wrap=True)
+    table.add_column("Attempts", justify="right")
+    table.add_column("Difficulty", justify="right")
+    table.add_column("Mean Time", justify="right")
+    for i in weak_questions:
+        bank, question = strings[questions.keys[i] >> 32], strings[questions.keys[i] & 0xFFFFFFFF]
+        table.add_row(
+            bank,
+            question,
+            str(questions.attempts[i]),
+            f"{1 - questions.accuracy[i]:.0%}",
+            f"{questions.mean_time[i]:.1f}s",
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -22,6 +22,12 @@ LOGS_DIR.mkdir(exist_ok=True)
 REPORTS_DIR: Final[Path] = BASE_DIR / "reports"
 REPORTS_DIR.mkdir(exist_ok=True)
 
+# Directory for the write-ahead logs of in-progress sessions
+SESSIONS_DIR: Final[Path] = LOGS_DIR / "sessions"
+
+# Directory of the columnar answer history used by `quiz_app.analytics`
+HISTORY_DIR: Final[Path] = LOGS_DIR / "history"
+
 # File path to the scraped JSON
 QUESTIONS_FILE: Final[Path] = Path(os.getenv("EXAM_QUESTIONS_FILE", "output/exam_results.json"))
 QUIZ_LOG_FILE: Final[Path] = LOGS_DIR / "quiz_session.log"
@@ -31,3 +37,21 @@ QUIZ_LOG_FILE: Final[Path] = LOGS_DIR / "quiz_session.log"
 MAX_QUESTIONS: Final[int] = int(os.getenv("EXAM_MAX_QUESTIONS", "10"))
 # Default to 15 minutes if not set
 TIMER_MINUTES: Final[int] = int(os.getenv("EXAM_TIMER_MINUTES", "15"))
+# Optional comma-separated topic filter (see `topics.main`), e.g. "network,iam"
+TOPICS: Final[list[str]] = [t for t in os.getenv("EXAM_TOPICS", "").split(",") if t.strip()]
+# Adaptive mock exam: pick each question from its estimated difficulty and the answers so far
+ADAPTIVE: Final[bool] = os.getenv("EXAM_ADAPTIVE", "false").lower() == "true"
+# Number of most informative questions the next adaptive question is drawn from (varies repeated exams)
+ADAPTIVE_TOP_K: Final[int] = int(os.getenv("EXAM_ADAPTIVE_TOP_K", "5"))
+
+# --- Session Persistence ---
+# Number of answers buffered between two fsync calls of the session log
+SESSION_FSYNC_EVERY: Final[int] = int(os.getenv("EXAM_SESSION_FSYNC_EVERY", "5"))
+
+# --- Rendering ---
+# Number of upcoming questions rendered in the background while answering
+PREFETCH_AHEAD: Final[int] = int(os.getenv("EXAM_PREFETCH_AHEAD", "3"))
+
+# --- History ---
+# Record every answer in the structured history store
+HISTORY_ENABLED: Final[bool] = os.getenv("EXAM_HISTORY", "true").lower() == "true"
@@ -3,42 +3,114 @@
 Handles the business logic: loading data, randomization, scoring, and logging.
 """
 
-import json
 import random
 import time
+from collections.abc import Collection, Iterable
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING, TypeVar
 
 from loguru import logger
 
+from codec import json_codec
+from models import Question, UserAnswer
 from quiz_app import config  # Import config to access REPORTS_DIR
-from quiz_app.models.question import Question
-from quiz_app.models.user_answer import UserAnswer
+from quiz_app.history import AnswerEvent, HistoryStore
+from quiz_app.session_log import RECORD_ANSWER, RECORD_PAUSE, RECORD_START, SessionLog
+from topics.index import TopicIndex
+from tracing import traced
+
+if TYPE_CHECKING:
+    from quiz_app.adaptive import AdaptiveTest
+
+T = TypeVar("T")
+
+
+def reservoir_sample(items: Iterable[T], k: int, rng: random.Random | None = None) -> tuple[list[T], int]:
+    """Picks k items uniformly at random from a stream of unknown length (Algorithm R).
+
+    Only the sample is held in memory; its order is random too.
+
+    Args:
+        items: The stream.
+        k: The sample size.
+        rng: Random generator (defaults to the `random` module).
+
+    Returns:
+        The sample (all items if there are at most k) and the number of items seen.
+    """
+    randrange = rng.randrange if rng else random.randrange
+    sample: list[T] = []
+    seen = 0
+    for seen, item in enumerate(items, 1):
+        if len(sample) < k:
+            sample.append(item)
+        else:
+            slot = randrange(seen)
+            if slot < k:
+                sample[slot] = item
+    (rng.shuffle if rng else random.shuffle)(sample)
+    return sample, seen
 
 
 class QuizEngine:
     """Manages the state and logic of the quiz session."""
 
-    def __init__(self, filepath: Path, max_questions: int, time_limit_minutes: int) -> None:
+    def __init__(
+        self,
+        filepath: Path,
+        max_questions: int,
+        time_limit_minutes: int,
+        question_ids: Collection[str] | None = None,
+        topics: Collection[str] | None = None,
+        history: HistoryStore | None = None,
+        adaptive: bool = False,
+    ) -> None:
         """Initializes the quiz engine.
 
         Args:
             filepath: Path to the JSON file containing questions.
             max_questions: Maximum number of questions to ask.
             time_limit_minutes: Time limit for the exam.
+            question_ids: If given, only these question IDs are eligible for the session.
+            topics: If given, only questions of these topics (from the bank's topic index) are eligible.
+            history: Store receiving a typed event for every recorded answer.
+            adaptive: Pick each question from the whole bank according to the answers so far
+                (see `quiz_app.adaptive`) instead of drawing a random set upfront.
         """
         self.filepath = filepath
         self.max_questions = max_questions
+        self.question_ids = set(question_ids) if question_ids is not None else None
+        self.topics = list(topics) if topics else []
         self.time_limit_seconds = time_limit_minutes * 60
+        self.adaptive = adaptive
 
         self.questions: list[Question] = []
         self.user_answers: list[UserAnswer] = []
         self.start_time: float = 0.0
-
-        logger.info(f"QuizEngine initialized. Max Questions: {max_questions}, Time Limit: {time_limit_minutes}m")
-
+        self.session_log: SessionLog | None = None
+        self.history = history
+        self.session_id = int(time.time() * 1000)
+        self._question_started_at: float = 0.0
+        self._topic_assignments: dict[str, str] | None = None
+        self._answerless = 0
+        self._malformed = 0
+        # Adaptive mode: the eligible questions of the bank, and the session state over them
+        self._pool: list[dict] = []
+        self._pool_index: dict[str, int] = {}
+        self._adaptive_test: AdaptiveTest | None = None
+
+        mode = " (adaptive)" if adaptive else ""
+        logger.info(f"QuizEngine initialized{mode}. Max Questions: {max_questions}, Time Limit: {time_limit_minutes}m")
+
+    @traced
     def load_and_shuffle(self) -> None:
-        """Loads questions from JSON, shuffles them, and selects the subset.
+        """Streams the questions from the file and picks a random subset of them.
+
+        The file is read one question at a time and the subset is drawn with
+        reservoir sampling, so memory stays proportional to `max_questions`
+        whatever the size of the bank. In adaptive mode the eligible questions
+        are kept instead, and picked one at a time by `next_question`.
 
         Raises:
             FileNotFoundError: If the source JSON does not exist.
@@ -47,68 +119,287 @@ class QuizEngine:
             logger.critical(f"Questions file not found at: {self.filepath}")
             raise FileNotFoundError(f"Questions file not found: {self.filepath}")
 
+        if self.topics:
+            topic_ids = TopicIndex.load(self.filepath).question_ids(self.topics)
+            logger.info(f"Topic filter {self.topics} matches {len(topic_ids)} questions.")
+            self.question_ids = topic_ids if self.question_ids is None else self.question_ids & topic_ids
+
         try:
-            with open(self.filepath, encoding="utf-8") as f:
-                raw_data = json.load(f)
-        except json.JSONDecodeError as e:
+            if self.adaptive:
+                self._load_pool()
+                return
+            sample, total_available = reservoir_sample(self._eligible_items(), max(self.max_questions, 0))
+        except json_codec.JSONDecodeError as e:
             logger.critical(f"Failed to parse JSON file: {e}")
             raise
 
-        # Convert JSON dicts to Question objects
-        all_questions = []
-        for item in raw_data:
+        logger.debug(f"Found {total_available} valid questions in file.")
+        self._warn_skipped()
+
+        # Only the sampled items are turned into Question objects
+        self.questions = [Question.from_dict(item) for item in sample]
+        logger.info(f"Selected {len(self.questions)} questions for this session.")
+
+    def _eligible_items(self) -> Iterable[dict]:
+        """Streams the raw items of the file, filtered down to answered questions of the session's scope."""
+        self._answerless = self._malformed = 0
+        for item in json_codec.iter_records(self.filepath):
+            # Skip records that cannot be turned into a question (an item is only decoded once sampled)
+            if not isinstance(item, dict) or not isinstance(item.get("id"), str):
+                self._malformed += 1
+                continue
             # Skip invalid questions without answers (data cleaning)
             if not item.get("correct_answers"):
+                self._answerless += 1
                 continue
-
-            q = Question(
-                id=item["id"], text=item["text"], options=item["options"], correct_answers=item["correct_answers"]
+            if self.question_ids is not None and item["id"] not in self.question_ids:
+                continue
+            yield item
+
+    def _warn_skipped(self) -> None:
+        """Logs how many records were skipped as malformed or for lack of correct answers."""
+        if self._malformed:
+            logger.warning(f"Skipped {self._malformed} malformed records (not a question with an ID).")
+        if self._answerless:
+            logger.warning(
+                f"Skipped {self._answerless} questions without correct answers "
+                f"(fix them with: uv run -m scraper.main --repair {self.filepath})."
             )
-            all_questions.append(q)
 
-        total_available = len(all_questions)
-        logger.debug(f"Loaded {total_available} valid questions from file.")
+    def _load_pool(self) -> None:
+        """Loads the eligible questions of an adaptive session and calibrates them on the answer history."""
+        from quiz_app.adaptive import AdaptiveTest, calibrate_from_history
 
-        # Randomize
-        random.shuffle(all_questions)
+        self._pool = list(self._eligible_items())
+        self._warn_skipped()
+        # Questions that were never answered all look the same to the model: shuffle to vary their order
+        random.shuffle(self._pool)
+        self._pool_index = {item["id"]: i for i, item in enumerate(self._pool)}
 
-        # Slice to the requested number
-        self.questions = all_questions[: self.max_questions]
-        logger.info(f"Selected {len(self.questions)} questions for this session.")
+        start = time.perf_counter()
+        params = calibrate_from_history(self.history, self.filepath.name, list(self._pool_index))
+        calibrated = int((params.attempts > 0).sum())
+        logger.info(
+            f"Adaptive pool of {len(self._pool)} questions, {calibrated} calibrated from history "
+            f"in {(time.perf_counter() - start) * 1000:.0f} ms."
+        )
+        self._adaptive_test = AdaptiveTest(params, top_k=config.ADAPTIVE_TOP_K)
+
+    @property
+    def session_length(self) -> int:
+        """Number of questions of the session."""
+        if self.adaptive:
+            return min(self.max_questions, len(self._pool))
+        return len(self.questions)
+
+    @property
+    def ability(self) -> tuple[float, float] | None:
+        """The estimated ability of the candidate and its standard error (adaptive mode only)."""
+        if self._adaptive_test is None:
+            return None
+        return self._adaptive_test.ability, self._adaptive_test.standard_error
+
+    def next_question(self) -> Question | None:
+        """Returns the question to ask now, picking it in adaptive mode.
+
+        Returns:
+            The first unanswered question, or None once the session is complete.
+        """
+        answered = len(self.user_answers)
+        if answered < len(self.questions):
+            return self.questions[answered]
+        if self._adaptive_test is None or answered >= self.session_length:
+            return None
+
+        start = time.perf_counter()
+        question = Question.from_dict(self._pool[self._adaptive_test.select()])
+        logger.debug(
+            f"Picked {question.id} for ability {self._adaptive_test.ability:+.2f} "
+            f"in {(time.perf_counter() - start) * 1000:.2f} ms."
+        )
+        self.questions.append(question)
+        return question
 
     def start_timer(self) -> None:
         """Starts the internal exam timer."""
         self.start_time = time.time()
+        self._question_started_at = self.start_time
         logger.info("Timer started.")
 
+    def begin_question(self) -> None:
+        """Marks the moment the current question is shown, to measure the time taken on it."""
+        self._question_started_at = time.time()
+
+    def get_elapsed_time(self) -> float:
+        """Returns seconds elapsed since the exam started."""
+        return time.time() - self.start_time
+
     def get_remaining_time(self) -> float:
         """Returns seconds remaining in the exam."""
-        elapsed = time.time() - self.start_time
-        remaining = self.time_limit_seconds - elapsed
+        remaining = self.time_limit_seconds - self.get_elapsed_time()
         return max(0.0, remaining)
 
     def is_time_up(self) -> bool:
         """Checks if the exam timer has expired."""
         return self.get_remaining_time() <= 0
 
-    def record_answer(self, question: Question, selected_labels: list[str]) -> None:
+    def record_answer(self, question: Question, selected_labels: list[str]) -> bool:
         """Records the user's answer and logs the interaction.
 
+        Answers submitted after the time limit are rejected, so the deadline
+        holds regardless of how the UI collected them.
+
         Args:
             question: The question object.
             selected_labels: List of option keys selected by user (e.g., ['A', 'C']).
+
+        Returns:
+            True if the answer was recorded, False if the time was already up.
         """
-        answer = UserAnswer(question=question, selected_options=selected_labels)
+        if self.is_time_up():
+            logger.warning(f"Question ID: {question.id} | Answer rejected: time limit exceeded.")
+            return False
+
+        now = time.time()
+        answer = UserAnswer(
+            question=question, selected_options=selected_labels, time_taken_seconds=now - self._question_started_at
+        )
         self.user_answers.append(answer)
+        self._question_started_at = now
+        if self._adaptive_test is not None and question.id in self._pool_index:
+            self._adaptive_test.record(self._pool_index[question.id], answer.is_correct)
+
+        if self.session_log:
+            record = {
+                "type": RECORD_ANSWER,
+                "question_id": question.id,
+                "selected": selected_labels,
+                "time_taken": answer.time_taken_seconds,
+                "elapsed": self.get_elapsed_time(),
+            }
+            if self.adaptive:
+                # Adaptive questions are not known upfront: the log keeps each one with its answer
+                record["question"] = question.to_dict()
+            self.session_log.append(record)
+
+        if self.history:
+            self._append_history(answer)
 
         # LOGGING USER INTERACTION
         status = "CORRECT" if answer.is_correct else "WRONG"
         logger.info(
             f"Question ID: {question.id} | "
             f"User Selected: {selected_labels} | "
-            f"Correct Answer: {question.correct_answers} | "
+            f"Correct Answer: {list(question.correct_answers)} | "
             f"Result: {status}"
         )
+        return True
+
+    def _append_history(self, answer: UserAnswer) -> None:
+        """Stores a typed event for the answer in the history store."""
+        if self._topic_assignments is None:
+            self._topic_assignments = TopicIndex.load(self.filepath).assignments
+        try:
+            self.history.append(
+                AnswerEvent(
+                    session=self.session_id,
+                    bank=self.filepath.name,
+                    question_id=answer.question.id,
+                    topic=self._topic_assignments.get(answer.question.id, ""),
+                    correct=answer.is_correct,
+                    selected=len(answer.selected_options),
+                    time_taken=answer.time_taken_seconds,
+                )
+            )
+        except OSError as e:
+            logger.error(f"Failed to append to history store: {e}")
+
+    def open_session_log(self, directory: Path, fsync_every: int = 5) -> None:
+        """Starts persisting the session to a write-ahead log.
+
+        Args:
+            directory: Folder where session logs are kept.
+            fsync_every: Number of answers buffered between two fsync calls.
+        """
+        self.session_log = SessionLog.create(
+            directory,
+            questions=[q.to_dict() for q in self.questions],
+            time_limit_seconds=self.time_limit_seconds,
+            fsync_every=fsync_every,
+            adaptive_length=self.session_length if self.adaptive else None,
+            bank=str(self.filepath.resolve()),
+        )
+
+    def suspend_session(self) -> None:
+        """Records the elapsed time and closes the log so the session can be resumed."""
+        if not self.session_log:
+            return
+        self.session_log.append({"type": RECORD_PAUSE, "elapsed": self.get_elapsed_time()}, sync=True)
+        self.session_log.close()
+        logger.info(f"Session suspended. Resumable from {self.session_log.path}")
+
+    def finish_session(self) -> None:
+        """Closes and removes the log of a completed session."""
+        if self.session_log:
+            self.session_log.close(delete=True)
+
+    def resume_session(self, path: Path, fsync_every: int = 5) -> None:
+        """Restores questions, answers and timer from an existing session log.
+
+        The log is reopened in append mode, so the resumed session keeps
+        persisting to the same file. An adaptive session reloads the bank and
+        replays the answers to restore the ability estimate.
+
+        Args:
+            path: The session log to resume.
+            fsync_every: Number of answers buffered between two fsync calls.
+
+        Raises:
+            ValueError: If the log does not start with a header record.
+        """
+        records = SessionLog.read(path)
+        if not records or records[0].get("type") != RECORD_START:
+            raise ValueError(f"Invalid session log: {path}")
+
+        header = records[0]
+        if "bank" in header:
+            # History, topics and calibration must refer to the bank that was quizzed, not the configured one
+            self.filepath = Path(header["bank"])
+            self._topic_assignments = None
+        self.time_limit_seconds = header["time_limit_seconds"]
+        self.questions = [Question.from_dict(item) for item in header["questions"]]
+        questions_by_id = {q.id: q for q in self.questions}
+        self.adaptive = header.get("adaptive_length") is not None
+        if self.adaptive:
+            self.max_questions = header["adaptive_length"]
+            self._load_pool()
+
+        self.user_answers = []
+        elapsed = 0.0
+        for record in records[1:]:
+            elapsed = record.get("elapsed", elapsed)
+            if record["type"] == RECORD_ANSWER:
+                question = questions_by_id.get(record["question_id"])
+                if question is None:
+                    question = Question.from_dict(record["question"])
+                    self.questions.append(question)
+                answer = UserAnswer(
+                    question=question,
+                    selected_options=record["selected"],
+                    time_taken_seconds=record.get("time_taken", 0.0),
+                )
+                self.user_answers.append(answer)
+                if self._adaptive_test is not None and question.id in self._pool_index:
+                    self._adaptive_test.record(self._pool_index[question.id], answer.is_correct)
+
+        # Shift the start so the timer continues from the last persisted instant
+        self.start_time = time.time() - elapsed
+        self._question_started_at = time.time()
+        self.session_log = SessionLog(path, fsync_every=fsync_every)
+        logger.info(
+            f"Resumed session from {path}: {len(self.user_answers)}/{self.session_length} answered, "
+            f"{self.get_remaining_time():.0f}s remaining."
+        )
 
     def calculate_score(self) -> tuple[int, int, float]:
         """Calculates final stats.
@@ -126,23 +417,33 @@ class QuizEngine:
         logger.info(f"Quiz finished. Score: {correct}/{total} ({percentage:.2f}%)")
         return correct, total, percentage
 
-    def save_report(self) -> Path:
+    @traced
+    def save_report(self, partial: bool = False) -> Path:
         """Generates a Markdown study guide of the session.
 
+        Args:
+            partial: Mark the report as covering an interrupted session.
+
         Returns:
             Path: The file path of the saved report.
         """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"quiz_report_{timestamp}.md"
+        suffix = "_partial" if partial else ""
+        filename = f"quiz_report_{timestamp}{suffix}.md"
         filepath = config.REPORTS_DIR / filename
 
         correct, total, percent = self.calculate_score()
 
         with open(filepath, "w", encoding="utf-8") as f:
             # Header
-            f.write("# Quiz Session Report\n")
+            f.write("# Quiz Session Report (Partial)\n" if partial else "# Quiz Session Report\n")
             f.write(f"**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
             f.write(f"**Final Score:** {correct}/{total} ({percent:.2f}%)\n\n")
+            if self.ability is not None:
+                ability, error = self.ability
+                f.write(f"**Estimated Ability:** {ability:+.2f} ± {error:.2f} (adaptive exam, 0 = average)\n\n")
+            if partial:
+                f.write(f"**Answered:** {total}/{self.session_length} questions before the interruption\n\n")
             f.write("---\n\n")
 
             # Questions
@@ -0,0 +1,150 @@
+"""Session History Store Module.
+
+Appends one typed event per recorded answer to a columnar store: every column
+lives in its own little-endian binary file, so the analytics can load a column
+straight into a NumPy array without parsing anything. Strings (banks, question
+IDs, topics) are dictionary-encoded in a side file.
+"""
+
+import struct
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from codec import json_codec
+
+# Column name -> NumPy dtype string (also the struct format used to append values)
+COLUMNS: dict[str, str] = {
+    "session": "<i8",
+    "timestamp": "<f8",
+    "bank": "<i4",
+    "question": "<i4",
+    "topic": "<i4",
+    "correct": "<u1",
+    "selected": "<u1",
+    "time_taken": "<f4",
+}
+_STRUCT_CODES = {"<i8": "<q", "<f8": "<d", "<i4": "<i", "<u1": "<B", "<f4": "<f"}
+
+STRINGS_FILE = "strings.jsonl"
+
+
+@dataclass
+class AnswerEvent:
+    """A single recorded answer.
+
+    Attributes:
+        session: ID of the quiz session (its start time in milliseconds).
+        bank: Name of the question bank.
+        question_id: ID of the question inside the bank.
+        topic: Topic label of the question ("" if unknown).
+        correct: Whether the answer was correct.
+        selected: Number of options selected.
+        time_taken: Seconds spent on the question.
+    """
+
+    session: int
+    bank: str
+    question_id: str
+    topic: str
+    correct: bool
+    selected: int
+    time_taken: float
+
+
+class HistoryStore:
+    """Append-only columnar store of answer events."""
+
+    def __init__(self, directory: Path) -> None:
+        """Opens (or creates) the store.
+
+        Args:
+            directory: Folder holding one file per column plus the string dictionary.
+        """
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._strings: list[str] = self._load_strings(directory)
+        self._string_ids = {value: i for i, value in enumerate(self._strings)}
+        self._repair()
+
+    def append(self, event: AnswerEvent) -> None:
+        """Appends an event to every column.
+
+        Args:
+            event: The event to store.
+        """
+        values = {
+            "session": event.session,
+            "timestamp": time.time(),
+            "bank": self._encode(event.bank),
+            "question": self._encode(event.question_id),
+            "topic": self._encode(event.topic),
+            "correct": int(event.correct),
+            "selected": min(event.selected, 255),
+            "time_taken": event.time_taken,
+        }
+        for name, dtype in COLUMNS.items():
+            with open(self.directory / f"{name}.bin", "ab") as f:
+                f.write(struct.pack(_STRUCT_CODES[dtype], values[name]))
+
+    def load(self) -> tuple[dict[str, Any], list[str]]:
+        """Loads every column as a NumPy array.
+
+        Returns:
+            The columns (name -> array, all of the same length) and the string dictionary.
+        """
+        import numpy as np
+
+        columns = {}
+        for name, dtype in COLUMNS.items():
+            path = self.directory / f"{name}.bin"
+            columns[name] = np.fromfile(path, dtype=dtype) if path.exists() else np.empty(0, dtype=dtype)
+
+        # A crash between two column writes leaves the last row incomplete: drop it
+        rows = min(len(col) for col in columns.values())
+        return {name: col[:rows] for name, col in columns.items()}, list(self._strings)
+
+    def _encode(self, value: str) -> int:
+        """Returns the dictionary ID of a string, registering it if new."""
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            with open(self.directory / STRINGS_FILE, "a", encoding="utf-8") as f:
+                f.write(json_codec.dumps(value) + "\n")
+            self._strings.append(value)
+            self._string_ids[value] = string_id
+        return string_id
+
+    def _repair(self) -> None:
+        """Truncates every column to the number of complete rows.
+
+        A crash in the middle of `append` can leave some columns one row (or
+        a few bytes) longer than others; appending after that would misalign them.
+        """
+        sizes = {}
+        for name, dtype in COLUMNS.items():
+            path = self.directory / f"{name}.bin"
+            sizes[name] = (path.stat().st_size if path.exists() else 0, struct.calcsize(_STRUCT_CODES[dtype]))
+
+        rows = min(size // width for size, width in sizes.values())
+        for name, (size, width) in sizes.items():
+            if size != rows * width:
+                logger.warning(f"Truncating history column '{name}' to {rows} rows.")
+                with open(self.directory / f"{name}.bin", "r+b") as f:
+                    f.truncate(rows * width)
+
+    @staticmethod
+    def _load_strings(directory: Path) -> list[str]:
+        """Reads the string dictionary, dropping a trailing entry truncated by a crash."""
+        path = directory / STRINGS_FILE
+        if not path.exists():
+            return []
+        raw = path.read_bytes()
+        complete = raw[: raw.rfind(b"\n") + 1]
+        if len(complete) != len(raw):
+            with open(path, "r+b") as f:
+                f.truncate(len(complete))
+        return [json_codec.loads(line) for line in complete.splitlines()]
@@ -1,10 +1,18 @@
 """Main entry point for the Quiz Application."""
 
+import argparse
+from collections.abc import Collection
+from pathlib import Path
+
 from loguru import logger
 
 from quiz_app import config
 from quiz_app.engine import QuizEngine
+from quiz_app.history import HistoryStore
+from quiz_app.prefetch import QuestionPrefetcher
+from quiz_app.session_log import SessionLog
 from quiz_app.ui import QuizUI
+from tracing import add_profile_argument, profile_run
 
 
 def configure_logging() -> None:
@@ -22,63 +30,163 @@ def configure_logging() -> None:
     )
 
 
-def main() -> None:
-    """Main execution function."""
+def save_study_guide(ui: QuizUI, engine: QuizEngine, partial: bool = False) -> None:
+    """Writes the Markdown report of the session and tells the user where it is.
+
+    Args:
+        ui: The quiz UI.
+        engine: The engine holding the recorded answers.
+        partial: Whether the session was interrupted before the end.
+    """
+    try:
+        report_path = engine.save_report(partial=partial)
+        ui.console.print(f"\n[bold green]📝 Study guide saved to:[/bold green] [underline]{report_path}[/underline]")
+    except Exception as e:
+        logger.error(f"Failed to save report: {e}")
+        ui.console.print(f"\n[bold red]Failed to save study guide:[/bold red] {e}")
+
+
+def resume_interrupted_session(ui: QuizUI, engine: QuizEngine) -> bool:
+    """Offers to resume the session left behind by an interrupted quiz.
+
+    If the user declines, a partial report is generated from the log and the
+    log is discarded.
+
+    Args:
+        ui: The quiz UI.
+        engine: The engine to restore the session into.
+
+    Returns:
+        True if the engine now holds the resumed session.
+
+    Raises:
+        KeyboardInterrupt: If the prompt is cancelled (the log is kept for the next run).
+    """
+    log_path = SessionLog.find_incomplete(config.SESSIONS_DIR)
+    if not log_path:
+        return False
+
+    try:
+        engine.resume_session(log_path, fsync_every=config.SESSION_FSYNC_EVERY)
+    except Exception:
+        logger.exception(f"Could not resume session log {log_path}. Discarding it.")
+        log_path.unlink(missing_ok=True)
+        return False
+
+    try:
+        if ui.ask_resume(len(engine.user_answers), engine.session_length, engine.get_remaining_time()):
+            return True
+    except KeyboardInterrupt:
+        # Leave the log untouched: the session can still be resumed next time
+        engine.session_log.close()
+        raise
+
+    if engine.user_answers:
+        save_study_guide(ui, engine, partial=True)
+    engine.finish_session()
+    engine.user_answers = []
+    return False
+
+
+def main(filepath: Path | None = None, question_ids: Collection[str] | None = None) -> None:
+    """Main execution function.
+
+    Args:
+        filepath: Question bank to use instead of the configured one.
+        question_ids: If given, restricts the session to these question IDs
+            (an interrupted session is then not offered for resume).
+    """
     configure_logging()
 
     # 1. Initialize UI and Engine
     ui = QuizUI()
     engine = QuizEngine(
-        filepath=config.QUESTIONS_FILE, max_questions=config.MAX_QUESTIONS, time_limit_minutes=config.TIMER_MINUTES
+        filepath=filepath or config.QUESTIONS_FILE,
+        max_questions=config.MAX_QUESTIONS,
+        time_limit_minutes=config.TIMER_MINUTES,
+        question_ids=question_ids,
+        topics=config.TOPICS,
+        history=HistoryStore(config.HISTORY_DIR) if config.HISTORY_ENABLED else None,
+        adaptive=config.ADAPTIVE,
     )
 
-    # 2. Load Data
+    # 2. Resume an interrupted session, or load and start a new one
     try:
-        engine.load_and_shuffle()
-    except Exception as e:
-        logger.exception("Fatal error loading exam data.")
-        ui.console.print(f"[bold red]Error loading exam:[/bold red] {e}")
+        resumed = question_ids is None and resume_interrupted_session(ui, engine)
+    except KeyboardInterrupt:
+        ui.console.print("\n[yellow]The interrupted session was kept. Run the quiz again to resume it.[/yellow]")
         return
-
-    # 3. Welcome Screen
-    ui.show_welcome(len(engine.questions), config.TIMER_MINUTES)
-    engine.start_timer()
-
-    # 4. Game Loop
-    for i, question in enumerate(engine.questions, 1):
-        # A. Check Timer
-        remaining = engine.get_remaining_time()
-        if engine.is_time_up():
-            logger.warning("Time limit reached during exam.")
-            ui.console.print("\n[bold red on white] ⏰ TIME IS UP! [/bold red on white]")
-            break
-
-        # B. Update Display
-        ui.show_header(i, len(engine.questions), remaining)
-
-        # C. Get User Input
+    if not resumed:
         try:
-            selected = ui.ask_question(question)
-        except KeyboardInterrupt:
-            logger.warning("User interrupted quiz (Ctrl+C).")
-            ui.console.print("\n[yellow]Quiz cancelled by user.[/yellow]")
+            engine.load_and_shuffle()
+        except Exception as e:
+            logger.exception("Fatal error loading exam data.")
+            ui.console.print(f"[bold red]Error loading exam:[/bold red] {e}")
             return
 
-        # D. Record Answer (Logging happens inside here)
-        engine.record_answer(question, selected)
+        # 3. Welcome Screen
+        ui.show_welcome(engine.session_length, config.TIMER_MINUTES)
+        engine.start_timer()
+        engine.open_session_log(config.SESSIONS_DIR, fsync_every=config.SESSION_FSYNC_EVERY)
+
+    # 4. Game Loop (upcoming questions are rendered in the background; adaptive ones are only known when asked)
+    prefetcher = QuestionPrefetcher(ui.render_question, engine.questions, lookahead=config.PREFETCH_AHEAD)
+    try:
+        while (question := engine.next_question()) is not None:
+            index = len(engine.user_answers)
+            rendered = prefetcher.get(index)
+
+            # A. Check Timer
+            remaining = engine.get_remaining_time()
+            if engine.is_time_up():
+                logger.warning("Time limit reached during exam.")
+                ui.console.print("\n[bold red on white] ⏰ TIME IS UP! [/bold red on white]")
+                break
+
+            # B. Update Display
+            ui.show_header(index + 1, engine.session_length, remaining)
+            engine.begin_question()
+
+            # C. Get User Input (the prompt is closed when the timer expires)
+            try:
+                selected = ui.ask_question(question, remaining, rendered)
+            except TimeoutError:
+                logger.warning("Time limit reached while answering.")
+                ui.console.print("\n[bold red on white] ⏰ TIME IS UP! [/bold red on white]")
+                break
+            except KeyboardInterrupt:
+                logger.warning("User interrupted quiz (Ctrl+C).")
+                engine.suspend_session()
+                ui.console.print("\n[yellow]Quiz paused. Run the quiz again to resume it.[/yellow]")
+                save_study_guide(ui, engine, partial=True)
+                return
+
+            # D. Record Answer (Logging and persistence happen inside here)
+            if not engine.record_answer(question, selected):
+                ui.console.print("\n[bold red on white] ⏰ TIME IS UP! [/bold red on white]")
+                break
+    finally:
+        prefetcher.shutdown()
+
+    engine.finish_session()
 
     # 5. Final Results
     stats = engine.calculate_score()
-    ui.show_results(stats, engine.user_answers)
+    ui.show_results(stats, engine.user_answers, ability=engine.ability)
 
     # 6. Save Study Guide
-    try:
-        report_path = engine.save_report()
-        ui.console.print(f"\n[bold green]📝 Study guide saved to:[/bold green] [underline]{report_path}[/underline]")
-    except Exception as e:
-        logger.error(f"Failed to save report: {e}")
-        ui.console.print(f"\n[bold red]Failed to save study guide:[/bold red] {e}")
+    save_study_guide(ui, engine)
+
+
+def cli() -> None:
+    """Command line entry point (`uv run -m quiz_app.main [--profile]`)."""
+    parser = argparse.ArgumentParser(description="Take a timed practice exam.")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    with profile_run("quiz", args.profile):
+        main()
 
 
 if __name__ == "__main__":
-    main()
+    cli()
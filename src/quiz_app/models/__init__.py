@@ -1,4 +0,0 @@
-from quiz_app.models.question import Question
-from quiz_app.models.user_answer import UserAnswer
-
-__all__ = ["Question", "UserAnswer"]
@@ -0,0 +1,80 @@
+"""Question Prefetch Module.
+
+Renders upcoming questions on a worker thread while the user is answering the
+current one, so moving to the next question does not wait on Rich rendering.
+"""
+
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Generic, TypeVar
+
+from loguru import logger
+
+from models import Question
+
+T = TypeVar("T")
+
+
+class QuestionPrefetcher(Generic[T]):
+    """Keeps the next few questions of a session rendered ahead of time.
+
+    Renders are stored as futures in a bounded LRU cache keyed by question ID;
+    requesting a question that is not cached renders it synchronously.
+    """
+
+    def __init__(
+        self, render: Callable[[Question], T], questions: list[Question], lookahead: int = 3, cache_size: int = 8
+    ) -> None:
+        """Initializes the prefetcher.
+
+        Args:
+            render: Function turning a question into its rendered form.
+            questions: The questions in the order they will be asked.
+            lookahead: How many upcoming questions to render in the background.
+            cache_size: Maximum number of rendered questions kept in memory.
+        """
+        self.render = render
+        self.questions = questions
+        self.lookahead = lookahead
+        self.cache_size = max(cache_size, lookahead + 1)
+        self._cache: OrderedDict[str, Future[T]] = OrderedDict()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="quiz-prefetch")
+
+    def get(self, index: int) -> T:
+        """Returns the rendered question at `index` and schedules the following ones.
+
+        Args:
+            index: Position of the question in the session (0-based).
+
+        Returns:
+            The rendered question.
+        """
+        question = self.questions[index]
+        future = self._cache.get(question.id)
+        self._schedule(self.questions[index + 1 : index + 1 + self.lookahead])
+
+        if future is None:
+            return self.render(question)
+        try:
+            return future.result()
+        except Exception:
+            logger.exception(f"Background rendering failed for {question.id}. Rendering inline.")
+            return self.render(question)
+
+    def shutdown(self) -> None:
+        """Stops the worker thread, dropping pending renders."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._cache.clear()
+
+    def _schedule(self, questions: list[Question]) -> None:
+        """Submits the renders that are not cached yet, evicting the oldest entries."""
+        for question in questions:
+            if question.id in self._cache:
+                self._cache.move_to_end(question.id)
+                continue
+            self._cache[question.id] = self._executor.submit(self.render, question)
+
+        while len(self._cache) > self.cache_size:
+            _, evicted = self._cache.popitem(last=False)
+            evicted.cancel()
@@ -0,0 +1,159 @@
+"""Session Write-Ahead Log Module.
+
+Persists every recorded answer to a small append-only JSON Lines file so an
+interrupted quiz session can be resumed (or at least reported on) later.
+"""
+
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from codec import json_codec
+
+RECORD_START = "start"
+RECORD_ANSWER = "answer"
+RECORD_PAUSE = "pause"
+
+
+class SessionLog:
+    """Append-only log of a single quiz session.
+
+    Every record is flushed to the OS immediately (surviving a killed process),
+    while the more expensive `fsync` is batched every `fsync_every` records
+    and forced on pause/close (surviving a power loss).
+    """
+
+    def __init__(self, path: Path, fsync_every: int = 5) -> None:
+        """Opens (or creates) the log file in append mode.
+
+        Args:
+            path: Location of the log file.
+            fsync_every: Number of appended records between two fsync calls.
+        """
+        self.path = path
+        self.fsync_every = max(1, fsync_every)
+        self._pending = 0
+        self._drop_truncated_tail(path)
+        self._file = path.open("a", encoding="utf-8")
+
+    @staticmethod
+    def _drop_truncated_tail(path: Path) -> None:
+        """Cuts off a record left half-written by a crash, so the next one starts on its own line."""
+        if not path.exists():
+            return
+        raw = path.read_bytes()
+        complete = len(raw[: raw.rfind(b"\n") + 1])
+        if complete != len(raw):
+            logger.warning(f"Dropping a truncated record at the end of {path}")
+            with path.open("r+b") as f:
+                f.truncate(complete)
+
+    @classmethod
+    def create(
+        cls,
+        directory: Path,
+        questions: list[dict[str, Any]],
+        time_limit_seconds: int,
+        *,
+        fsync_every: int = 5,
+        adaptive_length: int | None = None,
+        bank: str | None = None,
+    ) -> "SessionLog":
+        """Starts a new session log and writes its header record.
+
+        Args:
+            directory: Folder where session logs are kept.
+            questions: The selected questions (as dicts) in the order they will be asked.
+            time_limit_seconds: The total time allowed for the session.
+            fsync_every: Number of appended records between two fsync calls.
+            adaptive_length: Length of an adaptive session, whose questions are logged
+                with their answers instead (None for a fixed session).
+            bank: Path of the question bank the session draws from.
+
+        Returns:
+            The opened SessionLog.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        log = cls(directory / f"session_{timestamp}.jsonl", fsync_every=fsync_every)
+        header = {"type": RECORD_START, "time_limit_seconds": time_limit_seconds, "questions": questions}
+        if bank is not None:
+            header["bank"] = bank
+        if adaptive_length is not None:
+            header["adaptive_length"] = adaptive_length
+        log.append(header, sync=True)
+        logger.debug(f"Session log created at {log.path}")
+        return log
+
+    def append(self, record: dict[str, Any], sync: bool = False) -> None:
+        """Appends a record to the log.
+
+        Args:
+            record: The JSON-serializable record.
+            sync: Force an fsync right after this record.
+        """
+        self._file.write(json_codec.dumps(record) + "\n")
+        self._file.flush()
+        self._pending += 1
+        if sync or self._pending >= self.fsync_every:
+            self.sync()
+
+    def sync(self) -> None:
+        """Forces buffered records to stable storage."""
+        if self._pending:
+            os.fsync(self._file.fileno())
+            self._pending = 0
+
+    def close(self, delete: bool = False) -> None:
+        """Syncs and closes the log.
+
+        Args:
+            delete: Remove the log file afterwards (used once a session is completed).
+        """
+        if self._file.closed:
+            return
+        self.sync()
+        self._file.close()
+        if delete:
+            self.path.unlink(missing_ok=True)
+            logger.debug(f"Session log {self.path} removed.")
+
+    @staticmethod
+    def read(path: Path) -> list[dict[str, Any]]:
+        """Reads all intact records from a log file.
+
+        A trailing record truncated by a crash mid-write is ignored.
+
+        Args:
+            path: Location of the log file.
+
+        Returns:
+            The list of decoded records, starting with the header.
+        """
+        records = []
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json_codec.loads(line))
+                except json_codec.JSONDecodeError:
+                    logger.warning(f"Ignoring truncated record in {path}")
+                    break
+        return records
+
+    @staticmethod
+    def find_incomplete(directory: Path) -> Path | None:
+        """Returns the most recent session log left behind by an interrupted quiz.
+
+        Args:
+            directory: Folder where session logs are kept.
+
+        Returns:
+            The path of the newest log, or None if there is nothing to resume.
+        """
+        if not directory.exists():
+            return None
+        logs = sorted(directory.glob("session_*.jsonl"))
+        return logs[-1] if logs else None
@@ -3,17 +3,49 @@
 Handles visual rendering using Rich and input using Questionary.
 """
 
+import asyncio
+import io
+import time
+from dataclasses import dataclass
 from datetime import timedelta
 
 import questionary
+from prompt_toolkit.filters import IsDone
+from prompt_toolkit.layout import ConditionalContainer, Window
+from prompt_toolkit.layout.controls import FormattedTextControl
 from rich import box
 from rich.console import Console
 from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.table import Table
 
-from quiz_app.models.question import Question
-from quiz_app.models.user_answer import UserAnswer
+from models import Question, UserAnswer
+
+# Seconds between two redraws of the countdown while a prompt is waiting for input
+TIMER_REFRESH_INTERVAL = 1.0
+
+
+def _format_remaining(remaining_seconds: float) -> tuple[str, str]:
+    """Formats the remaining time as H:MM:SS and picks its color (red if < 2 mins)."""
+    color = "red" if remaining_seconds < 120 else "green"
+    return str(timedelta(seconds=int(remaining_seconds))), color
+
+
+@dataclass
+class RenderedQuestion:
+    """A question rendered ahead of time, ready to be written to the terminal.
+
+    Attributes:
+        question_id: ID of the rendered question.
+        width: Terminal width the body was rendered for.
+        body: The question panel and options grid, including ANSI styles.
+        choices: The prompt choices for the question's options.
+    """
+
+    question_id: str
+    width: int
+    body: str
+    choices: list[questionary.Choice]
 
 
 class QuizUI:
@@ -37,6 +69,26 @@ class QuizUI:
         self.console.print(Panel(info, title=title, border_style="blue", padding=(1, 2)))
         self.console.input("\nPress [bold green]ENTER[/bold green] to start...")
 
+    def ask_resume(self, answered: int, total: int, remaining_seconds: float) -> bool:
+        """Asks whether an interrupted session should be resumed.
+
+        Args:
+            answered: Questions already answered in the interrupted session.
+            total: Total questions in that session.
+            remaining_seconds: Seconds left on its timer.
+
+        Returns:
+            True if the user wants to resume it.
+
+        Raises:
+            KeyboardInterrupt: If the prompt is cancelled (Ctrl+C or Esc), so the session is not discarded.
+        """
+        self.console.clear()
+        time_str = str(timedelta(seconds=int(remaining_seconds)))
+        info = f"\nAnswered: [yellow]{answered}/{total}[/yellow]\nTime Remaining: [yellow]{time_str}[/yellow]"
+        self.console.print(Panel(info, title="[bold cyan]Interrupted Session Found[/bold cyan]", border_style="blue"))
+        return bool(questionary.confirm("Resume this session?", default=True, qmark="👉").unsafe_ask())
+
     def show_header(self, current_idx: int, total: int, remaining_seconds: float) -> None:
         """Displays the top status bar with progress and timer.
 
@@ -47,11 +99,7 @@ class QuizUI:
         """
         self.console.clear()
 
-        # Format time as MM:SS
-        time_str = str(timedelta(seconds=int(remaining_seconds)))
-
-        # Color code time (Red if < 2 mins)
-        color = "red" if remaining_seconds < 120 else "green"
+        time_str, color = _format_remaining(remaining_seconds)
 
         grid = Table.grid(expand=True)
         grid.add_column(justify="left", ratio=1)
@@ -62,18 +110,30 @@ class QuizUI:
         )
         self.console.print(Panel(grid, style="white on black"))
 
-    def ask_question(self, question: Question) -> list[str]:
-        """Displays the question and prompts for an answer.
+    def render_question(self, question: Question) -> RenderedQuestion:
+        """Pre-renders the question panel, the options grid and the prompt choices.
+
+        Rendering happens on a private off-screen console with the same width
+        and color settings as the real one, so it is safe to call from a worker
+        thread while the user is answering another question.
 
         Args:
-            question: The question object to display.
+            question: The question object to render.
 
         Returns:
-            A list of selected option keys (e.g. ['A', 'C']).
+            The rendered question, ready to be written to the terminal.
         """
-        # Display Question Text
-        self.console.print(Panel(Markdown(question.text), title=f"ID: {question.id}", border_style="cyan"))
-        self.console.print("")
+        console = Console(
+            file=io.StringIO(),
+            width=self.console.width,
+            color_system=self.console.color_system,
+            force_terminal=self.console.is_terminal,
+            legacy_windows=False,
+        )
+
+        # Question Text
+        console.print(Panel(Markdown(question.text), title=f"ID: {question.id}", border_style="cyan"))
+        console.print("")
 
         # Display Options via Rich Table (Handles wrapping for long text)
         # We use a grid table to align "A)" with the text, allowing the text to wrap nicely.
@@ -85,44 +145,110 @@ class QuizUI:
             grid.add_row(f"{k})", v)
             grid.add_row("", "")  # Empty row for spacing between options
 
-        self.console.print(grid)
-        self.console.print("")
-        # -------------------------------------------------------------------------
+        console.print(grid)
+        console.print("")
 
         # Prepare simple choices for Questionary (just the keys)
         choices = [questionary.Choice(title=f"Option {k}", value=k) for k in question.options.keys()]
 
+        return RenderedQuestion(
+            question_id=question.id, width=console.width, body=console.file.getvalue(), choices=choices
+        )
+
+    def ask_question(
+        self, question: Question, remaining_seconds: float | None = None, rendered: RenderedQuestion | None = None
+    ) -> list[str]:
+        """Displays the question and prompts for an answer.
+
+        Args:
+            question: The question object to display.
+            remaining_seconds: Seconds left on the timer. When given, a live
+                countdown is shown under the prompt and the prompt is closed
+                as soon as it reaches zero.
+            rendered: The pre-rendered question. It is rendered on the spot if
+                missing or rendered for another terminal width.
+
+        Returns:
+            A list of selected option keys (e.g. ['A', 'C']).
+
+        Raises:
+            TimeoutError: If the time expires before the user answers.
+        """
+        if rendered is None or rendered.question_id != question.id or rendered.width != self.console.width:
+            rendered = self.render_question(question)
+
+        # Write the pre-rendered panel and options in one go
+        self.console.file.write(rendered.body)
+        self.console.file.flush()
+        choices = rendered.choices
+
         # Use Checkbox for multiple choice, Select list for single choice
         if question.is_multiple_choice:
             self.console.print(
                 "[italic yellow]ℹ️  Multiple correct answers allowed "
                 "(Select with Space, Confirm with Enter)[/italic yellow]"
             )
-            answer = questionary.checkbox(
+            prompt = questionary.checkbox(
                 "Select your answer(s):",
                 choices=choices,
                 style=questionary.Style([("answer", "fg:cyan bold")]),
                 qmark="👉",
-            ).ask()
+            )
         else:
-            answer = questionary.select(
+            prompt = questionary.select(
                 "Select your answer:",
                 choices=choices,
                 style=questionary.Style([("answer", "fg:cyan bold")]),
                 qmark="👉",
-            ).ask()
-            # Wrap single result in list for consistency
-            if answer:
-                answer = [answer]
+            )
+
+        if remaining_seconds is not None:
+            self._attach_countdown(prompt, remaining_seconds)
+        answer = prompt.unsafe_ask()
+
+        # Wrap single result in list for consistency
+        if answer and not question.is_multiple_choice:
+            answer = [answer]
 
         return answer if answer else []
 
-    def show_results(self, score: tuple[int, int, float], answers: list[UserAnswer]) -> None:
+    def _attach_countdown(self, prompt: questionary.Question, remaining_seconds: float) -> None:
+        """Adds a self-refreshing countdown line to a prompt and closes it at the deadline.
+
+        The countdown is a single line inside the prompt_toolkit layout, so each
+        tick only redraws the changed characters instead of the whole screen,
+        and the refresh runs on the prompt's own event loop between keystrokes.
+
+        Args:
+            prompt: The questionary prompt about to be asked.
+            remaining_seconds: Seconds left on the timer.
+        """
+        app = prompt.application
+        deadline = time.monotonic() + remaining_seconds
+
+        def get_timer_tokens() -> list[tuple[str, str]]:
+            time_str, color = _format_remaining(max(0.0, deadline - time.monotonic()))
+            return [("", "⏱  Time Remaining: "), (f"fg:{color} bold", time_str)]
+
+        timer_line = ConditionalContainer(Window(FormattedTextControl(get_timer_tokens), height=1), filter=~IsDone())
+        app.layout.container.children.append(timer_line)
+        app.refresh_interval = TIMER_REFRESH_INTERVAL
+
+        async def expire() -> None:
+            await asyncio.sleep(max(0.0, deadline - time.monotonic()))
+            app.exit(exception=TimeoutError("Time limit reached."))
+
+        app.pre_run_callables.append(lambda: app.create_background_task(expire()))
+
+    def show_results(
+        self, score: tuple[int, int, float], answers: list[UserAnswer], ability: tuple[float, float] | None = None
+    ) -> None:
         """Displays the final report card.
 
         Args:
             score: Tuple of (correct_count, total_count, percentage).
             answers: List of UserAnswer objects containing history.
+            ability: Estimated ability and its standard error, for an adaptive exam.
         """
         self.console.clear()
         correct, total, percent = score
@@ -133,6 +259,9 @@ class QuizUI:
             f"\nScore: [bold {color}]{correct}/{total}[/bold {color}]\n"
             f"Percentage: [bold {color}]{percent:.1f}%[/bold {color}]"
         )
+        if ability is not None:
+            # Adaptive questions get harder as answers improve: the ability says more than the score
+            summary += f"\nEstimated ability: [bold]{ability[0]:+.2f}[/bold] ± {ability[1]:.2f} (0 = average)"
         self.console.print(Panel(summary, title="Exam Completed", border_style=color))
 
         # 2. Review Table
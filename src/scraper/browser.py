@@ -1,32 +1,92 @@
 """Contains Selenium logic and Page Object definitions."""
 
-import re
 import time
+from collections.abc import Callable, Iterator
+from typing import Any
 
+import websocket
 from loguru import logger
 from selenium import webdriver
-from selenium.common.exceptions import (
-    NoSuchElementException,
-    TimeoutException,
-)
-from selenium.webdriver.common.by import By
-from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
 
-from scraper.models.question import QuestionDTO
+from models import Question
+from scraper.capture import CAPTURE_SCRIPT, NEXT_SCRIPT, READY_SCRIPT, REVEAL_SCRIPT, PageCapture, parse_capture
+from scraper.cdp import CdpError, CdpTransport
+from scraper.selector_engine import SelectorEngine
+from tracing import traced_methods
 
 
+@traced_methods
 class ExamPage:
     """Page Object Model for the exam website."""
 
-    def __init__(self, driver: webdriver.Chrome) -> None:
+    # Seconds for CSS transitions (green borders) to apply once answers are revealed
+    REVEAL_WAIT = 1.5
+    # Seconds for a page's questions to appear
+    LOAD_TIMEOUT = 30
+
+    # Seconds for the URL to change after clicking 'Next'
+    NAVIGATION_TIMEOUT = 15
+
+    def __init__(
+        self, driver: webdriver.Chrome, cdp: CdpTransport | None = None, selectors: SelectorEngine | None = None
+    ) -> None:
         """Initializes the page object.
 
         Args:
             driver: The Selenium Chrome driver instance.
+            cdp: Optional direct DevTools transport for scripts; Selenium is used without it.
+            selectors: Selector strategies cached per page layout (resolved in memory if omitted).
         """
         self.driver = driver
-        self.wait = WebDriverWait(self.driver, 20)
+        self.cdp = cdp
+        self.selectors = selectors or SelectorEngine()
+        self.handle = driver.current_window_handle
+        self._driver_handle = self.handle
+
+    @property
+    def webdriver(self) -> webdriver.Chrome:
+        """The Selenium driver, focused on the current tab."""
+        if self._driver_handle != self.handle:
+            self.driver.switch_to.window(self.handle)
+            self._driver_handle = self.handle
+        return self.driver
+
+    def switch_to(self, handle: str, focus: bool = False) -> None:
+        """Makes another tab of the browser the current one.
+
+        The DevTools transport addresses tabs directly, so with it the Selenium driver is only
+        refocused when a Selenium call needs it.
+
+        Args:
+            handle: The window handle of the tab.
+            focus: Refocus the Selenium driver right away.
+        """
+        self.handle = handle
+        if focus or self.cdp is None:
+            _ = self.webdriver
+
+    def run_script(self, script: str, *args: Any) -> Any:
+        """Runs a script in the current tab, over the DevTools transport when available.
+
+        Args:
+            script: A function body returning a JSON-serializable value (see `execute_script`).
+            *args: JSON-serializable arguments, available to the script as `arguments`.
+
+        Returns:
+            The value returned by the script.
+        """
+        if self.cdp is not None:
+            try:
+                return self.cdp.evaluate(script, *args, handle=self.handle)
+            except CdpError as e:
+                # E.g. the page is navigating: let Selenium wait for it
+                logger.debug(f"DevTools call failed ({e}). Falling back to Selenium.")
+            except (OSError, websocket.WebSocketException) as e:
+                logger.warning(f"DevTools connection lost ({e}). Using Selenium from now on.")
+                self.cdp.close()
+                self.cdp = None
+        return self.webdriver.execute_script(script, *args)
 
     def load(self, url: str) -> None:
         """Navigates to the URL and handles potential WAF blocks.
@@ -38,94 +98,133 @@ class ExamPage:
             TimeoutException: If the page content does not load in time.
         """
         logger.info(f"Navigating to {url}")
-        self.driver.get(url)
+        self.webdriver.get(url)
 
-        end_time = time.time() + 30
+        end_time = time.time() + self.LOAD_TIMEOUT
         while time.time() < end_time:
-            try:
-                self.driver.find_element(By.CLASS_NAME, "chakra-accordion")
+            ready, title = self.run_script(READY_SCRIPT)
+            if ready:
                 logger.debug("Page loaded successfully.")
                 time.sleep(2)
                 return
-            except NoSuchElementException:
-                pass
 
-            if "Security Checkpoint" in self.driver.title:
+            if "Security Checkpoint" in title:
                 logger.warning("Detected Security Checkpoint. Waiting...")
                 time.sleep(5)
                 continue
             time.sleep(1)
 
         logger.error("Timeout waiting for page load.")
-        raise TimeoutException("Page did not load within 30s.")
+        raise TimeoutException(f"Page did not load within {self.LOAD_TIMEOUT}s.")
 
     def reveal_all_answers(self) -> None:
-        """Clicks all 'Show Answer' buttons on the current page."""
-        try:
-            buttons = self.driver.find_elements(By.XPATH, "//button[contains(text(), 'Show Answer')]")
-            if not buttons:
-                return
+        """Clicks all 'Show Answer' buttons on the current page and waits for the answers to show."""
+        if self.click_reveal_buttons():
+            # Wait for CSS transitions (green borders) to apply
+            time.sleep(self.REVEAL_WAIT)
 
-            logger.debug(f"Revealing answers for {len(buttons)} questions...")
-            for btn in buttons:
-                self.driver.execute_script("arguments[0].click();", btn)
+    def click_reveal_buttons(self) -> int:
+        """Clicks all 'Show Answer' buttons on the current page without waiting.
 
-            # Wait for CSS transitions (green borders) to apply
-            time.sleep(1.5)
+        Returns:
+            The number of buttons clicked.
+        """
+        try:
+            count = self.run_script(REVEAL_SCRIPT) or 0
         except Exception as e:
             logger.warning(f"Could not reveal answers: {e}")
+            return 0
+        if count:
+            logger.debug(f"Revealing answers for {count} questions...")
+        return count
 
-    def extract_questions(
-        self, start_id: int | None = None, end_id: int | None = None
-    ) -> tuple[list[QuestionDTO], bool, int]:
-        """Extracts questions, respecting optional start/end limits.
+    def capture(self, page_num: int = 0) -> PageCapture:
+        """Collects the raw content of every question container on the current page in one script call.
 
         Args:
-            start_id: The minimum question number (inclusive). If None, starts from 0.
-            end_id: The maximum question number (inclusive). If None, goes indefinitely.
+            page_num: Position of the page in the scrape, recorded in the capture.
 
         Returns:
-            A tuple containing:
-            - list[QuestionDTO]: The extracted questions.
-            - bool: limit_reached (True if we found a question > end_id).
-            - int: max_id_found (The highest Question ID found on this page).
-        """
-        questions_data: list[QuestionDTO] = []
-        limit_reached = False
-        max_id_found = 0
-
-        containers = self.driver.find_elements(By.CLASS_NAME, "chakra-accordion__item")
+            The page capture, ready to be parsed off the browser thread.
 
+        Raises:
+            SelectorError: If no selector strategy can locate the questions on the page.
+        """
+        result = self.run_script(CAPTURE_SCRIPT, self.selectors.script_args()) or {}
+        containers = result.get("containers") or []
+        if containers and not result.get("probe") and self.selectors.is_broken(containers):
+            # The site changed without changing the layout fingerprint: probe the page again
+            self.selectors.forget(result.get("layout", ""))
+            result = self.run_script(CAPTURE_SCRIPT, self.selectors.script_args()) or {}
+            containers = result.get("containers") or []
+        if containers and result.get("probe"):
+            containers = self.selectors.learn(result.get("layout", ""), containers)
         if not containers:
             logger.debug("No question containers found in DOM.")
+        return PageCapture(
+            page_num=page_num,
+            url=result.get("url") or self.webdriver.current_url,
+            containers=containers,
+            has_next=bool(result.get("has_next")),
+        )
+
+    def iter_captures(
+        self,
+        end_id: int | None = None,
+        page_delay: float = 2.0,
+        on_empty_page: Callable[[int], None] | None = None,
+    ) -> Iterator[PageCapture]:
+        """Reveals and captures pages one after another, starting from the current page.
 
-        for i, container in enumerate(containers):
-            try:
-                q_dto = self._parse_single_container(container, i + 1)
-                if not q_dto:
-                    continue
+        Args:
+            end_id: The maximum question number (inclusive); stops after the page that goes past it.
+            page_delay: Seconds to wait after each navigation (politeness delay).
+            on_empty_page: Called with the page number when a page shows no questions (e.g. login wall).
 
-                q_num = self._extract_question_number(q_dto.id)
-                max_id_found = max(max_id_found, q_num)
+        Yields:
+            The capture of each page, in order.
+        """
+        page_num = 1
+        while True:
+            logger.info(f"--- Processing Page {page_num} ---")
+            self.reveal_all_answers()
+            capture = self.capture(page_num)
+
+            if capture.is_empty and on_empty_page is not None:
+                on_empty_page(page_num)
+                self.reveal_all_answers()
+                capture = self.capture(page_num)
+
+            yield capture
+
+            # The raw IDs are enough to know whether the range ends on this page
+            if end_id is not None and capture.max_number() > end_id:
+                logger.success(f"Reached end limit (Question {end_id}). Stopping.")
+                return
 
-                # Check End Limit
-                if end_id is not None and q_num > end_id:
-                    logger.info(f"Reached Question {q_num}. Exceeds limit {end_id}.")
-                    limit_reached = True
-                    break
+            if not self.go_to_next_page():
+                logger.info("No more pages found. Scrape complete.")
+                return
 
-                # Check Start Limit
-                if start_id is not None and q_num < start_id:
-                    # Skip this question, but continue the loop
-                    continue
+            page_num += 1
+            time.sleep(page_delay)
 
-                questions_data.append(q_dto)
+    def extract_questions(
+        self, start_id: int | None = None, end_id: int | None = None
+    ) -> tuple[list[Question], bool, int]:
+        """Extracts questions, respecting optional start/end limits.
 
-            except Exception:
-                logger.exception(f"Error parsing container #{i + 1}")
-                continue
+        Args:
+            start_id: The minimum question number (inclusive). If None, starts from 0.
+            end_id: The maximum question number (inclusive). If None, goes indefinitely.
 
-        return questions_data, limit_reached, max_id_found
+        Returns:
+            A tuple containing:
+            - list[Question]: The extracted questions.
+            - bool: limit_reached (True if we found a question > end_id).
+            - int: max_id_found (The highest Question ID found on this page).
+        """
+        return parse_capture(self.capture(), start_id=start_id, end_id=end_id)
 
     def go_to_next_page(self) -> bool:
         """Navigates to the next page.
@@ -134,79 +233,23 @@ class ExamPage:
             True if navigation was successful, False if no next page exists.
         """
         try:
-            next_btns = self.driver.find_elements(By.XPATH, "//button[text()='Next']")
-            if not next_btns:
+            current_url = self.run_script("return location.href;")
+            state = self.run_script(NEXT_SCRIPT)
+            if state == "missing":
                 logger.info("Next button not found. End of exam.")
                 return False
-
-            next_btn = next_btns[0]
-            if not next_btn.is_enabled():
+            if state == "disabled":
                 logger.info("Next button is disabled.")
                 return False
 
-            current_url = self.driver.current_url
-            self.driver.execute_script("arguments[0].click();", next_btn)
-
-            WebDriverWait(self.driver, 15).until(lambda d: d.current_url != current_url)
+            end_time = time.time() + self.NAVIGATION_TIMEOUT
+            while self.run_script("return location.href;") == current_url:
+                if time.time() > end_time:
+                    raise TimeoutException(f"URL did not change within {self.NAVIGATION_TIMEOUT}s.")
+                time.sleep(0.2)
             time.sleep(2)
             return True
 
         except Exception as e:
             logger.error(f"Pagination error: {e}")
             return False
-
-    def _extract_question_number(self, q_id_str: str) -> int:
-        """Parses the numeric value from a Question ID string."""
-        match = re.search(r"(\d+)", q_id_str)
-        if match:
-            return int(match.group(1))
-        return 0
-
-    def _parse_single_container(self, container: WebElement, index: int) -> QuestionDTO | None:
-        """Extracts data from a single question DOM element."""
-        try:
-            btn_el = container.find_element(By.CLASS_NAME, "chakra-accordion__button")
-            raw_id = btn_el.text.split("\n")[0].strip()
-        except NoSuchElementException:
-            raw_id = f"Unknown_Q_{index}"
-
-        try:
-            panel = container.find_element(By.CLASS_NAME, "chakra-accordion__panel")
-            text_div = panel.find_element(By.XPATH, ".//div[contains(@class, 'css-naa3lg')]")
-            q_text = text_div.text.strip()
-        except NoSuchElementException:
-            logger.warning(f"[{raw_id}] Could not find question text div.")
-            return None
-
-        options_map = {}
-        correct_answers_list = []
-
-        try:
-            options_container = panel.find_element(By.XPATH, ".//div[contains(@class, 'css-j7qwjs')]")
-            option_rows = options_container.find_elements(By.XPATH, "./div")
-        except NoSuchElementException:
-            logger.warning(f"[{raw_id}] No options container found.")
-            return None
-
-        for row in option_rows:
-            try:
-                label_el = row.find_element(By.XPATH, ".//p[contains(@class, 'css-xakj1w')]")
-                label_text = label_el.text.replace(".", "").strip()
-
-                val_el = row.find_element(By.XPATH, ".//div[contains(@class, 'css-cba290')]")
-                val_text = val_el.text.strip()
-
-                options_map[label_text] = val_text
-
-                border_color = row.value_of_css_property("border-color")
-                class_attr = row.get_attribute("class")
-
-                is_green_border = "rgb(56, 161, 105)" in border_color or "rgb(72, 187, 120)" in border_color
-
-                if is_green_border or "css-jjzrip" in class_attr:
-                    correct_answers_list.append(label_text)
-
-            except NoSuchElementException:
-                continue
-
-        return QuestionDTO(id=raw_id, text=q_text, options=options_map, correct_answers=correct_answers_list)
@@ -0,0 +1,223 @@
+"""Page capture and parsing.
+
+A capture is a plain JSON payload holding the raw text, options and correct
+flags of every question container of a page, collected by a single script
+call. Parsing it into `Question`s needs no browser, so it can run off
+the browser thread.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from loguru import logger
+
+from models import Question, question_number
+from tracing import traced
+
+# Collects every question container (and whether a next page exists) in one round trip.
+# Takes `SelectorEngine.script_args()`: each field is located with the strategy cached for the page layout,
+# or, on an unknown layout, with every strategy (a probe the engine resolves, see `scraper.selector_engine`).
+CAPTURE_SCRIPT = """
+const settings = arguments[0];
+const LABEL = /^([A-Z])\\.?(?:\\s|$)/;
+const pick = (root, selector) => root ? root.querySelector(selector) : null;
+const text = (el) => el ? el.innerText.trim() : null;
+const STRATEGIES = {
+    text: {
+        class: (panel) => text(pick(panel, `div[class*='${settings.classes.text}']`)),
+        structure: (panel) => text(panel ? panel.firstElementChild : null),
+    },
+    options: {
+        class: (panel) => pick(panel, `div[class*='${settings.classes.options}']`),
+        structure: (panel) => panel && panel.children.length > 1 ? panel.children[1] : null,
+        pattern: (panel) => panel ? Array.from(panel.querySelectorAll("*")).find((el) => el.children.length > 1
+            && Array.from(el.children).every((row) => LABEL.test(row.innerText.trim()))) || null : null,
+    },
+    label: {
+        class: (row) => text(pick(row, `p[class*='${settings.classes.label}']`)),
+        structure: (row) => text(row.firstElementChild),
+        pattern: (row) => (LABEL.exec(row.innerText.trim()) || [null, null])[1],
+    },
+    value: {
+        class: (row) => text(pick(row, `div[class*='${settings.classes.value}']`)),
+        structure: (row) => row.children.length > 1 ? text(row.lastElementChild) : null,
+        pattern: (row) => {
+            const match = LABEL.exec(row.innerText.trim());
+            return match ? row.innerText.trim().slice(match[0].length).trim() || null : null;
+        },
+    },
+    correct: {
+        class: (row) => (row.getAttribute("class") || "").includes(settings.correct_class),
+        border: (row) => settings.borders.some((color) => getComputedStyle(row).borderColor.includes(color)),
+    },
+};
+// Every strategy of a field, for a probe
+const every = (field, el) => Object.fromEntries(Object.entries(STRATEGIES[field]).map(([name, f]) => [name, f(el)]));
+
+const next = Array.from(document.querySelectorAll("button")).find((b) => b.textContent.trim() === "Next");
+const items = Array.from(document.getElementsByClassName("chakra-accordion__item"));
+const panels = items.map((item) => pick(item, ".chakra-accordion__panel"));
+const first = panels.find((panel) => panel !== null);
+const layout = first ? [...new Set(Array.from(first.children, (block) =>
+    [block.tagName.toLowerCase(), ...Array.from(block.classList).sort()].join(".")))].join(" ") : "";
+const chosen = settings.layouts[layout];
+
+const containers = items.map((item, i) => {
+    const button = pick(item, ".chakra-accordion__button");
+    const panel = panels[i];
+    const id = button ? button.innerText.split("\\n")[0].trim() : null;
+    if (chosen) {
+        const options = STRATEGIES.options[chosen.options](panel);
+        return {
+            id: id,
+            text: STRATEGIES.text[chosen.text](panel),
+            options: options === null ? null : Array.from(options.children).map((row) => ({
+                label: STRATEGIES.label[chosen.label](row),
+                value: STRATEGIES.value[chosen.value](row),
+                correct: STRATEGIES.correct[chosen.correct](row),
+            })),
+        };
+    }
+    const options = every("options", panel);
+    return {
+        id: id,
+        text: every("text", panel),
+        options: Object.fromEntries(Object.entries(options).map(([name, el]) => [name, el === null ? null :
+            Array.from(el.children).map((row) => ({
+                label: every("label", row), value: every("value", row), correct: every("correct", row),
+            }))])),
+    };
+});
+return {
+    containers: containers,
+    layout: layout,
+    probe: chosen === undefined,
+    has_next: next !== undefined && !next.disabled,
+    url: location.href,
+};
+"""
+
+# Whether the questions have rendered, and the page title (to spot a security checkpoint)
+READY_SCRIPT = """
+return [document.getElementsByClassName("chakra-accordion").length > 0, document.title];
+"""
+
+# Clicks the 'Next' button if there is an enabled one; returns "clicked", "disabled" or "missing"
+NEXT_SCRIPT = """
+const next = Array.from(document.querySelectorAll("button")).find((b) => b.textContent.trim() === "Next");
+if (next === undefined) return "missing";
+if (next.disabled) return "disabled";
+next.click();
+return "clicked";
+"""
+
+# Clicks every 'Show Answer' button in one round trip and returns how many there were
+REVEAL_SCRIPT = """
+const buttons = Array.from(document.querySelectorAll("button")).filter((b) => b.textContent.includes("Show Answer"));
+buttons.forEach((b) => b.click());
+return buttons.length;
+"""
+
+
+@dataclass
+class PageCapture:
+    """The raw content of one revealed page.
+
+    Attributes:
+        page_num: Position of the page in the scrape (1-based).
+        url: The URL of the page.
+        containers: One raw record per question container, located with the resolved selector strategies.
+        has_next: Whether the page has an enabled 'Next' button.
+    """
+
+    page_num: int
+    url: str
+    containers: list[dict[str, Any]] = field(default_factory=list)
+    has_next: bool = False
+
+    @property
+    def is_empty(self) -> bool:
+        """True if no question is visible (e.g. behind a login wall)."""
+        return not any(c.get("id") for c in self.containers)
+
+    def max_number(self) -> int:
+        """Returns the highest question number on the page, without parsing the questions."""
+        return max((question_number(c["id"]) for c in self.containers if c.get("id")), default=0)
+
+
+def parse_container(raw: dict[str, Any], index: int) -> Question | None:
+    """Builds a question from one captured container.
+
+    Args:
+        raw: The captured container.
+        index: Position of the container on the page (1-based), used for unnamed questions.
+
+    Returns:
+        The question, or None if its text or options are missing.
+    """
+    q_id = raw.get("id") or f"Unknown_Q_{index}"
+    if raw.get("text") is None:
+        logger.warning(f"[{q_id}] Could not find question text div.")
+        return None
+    if raw.get("options") is None:
+        logger.warning(f"[{q_id}] No options container found.")
+        return None
+
+    options_map = {}
+    correct_answers = []
+    for row in raw["options"]:
+        if row["label"] is None or row["value"] is None:
+            continue
+        label = row["label"].replace(".", "").strip()
+        options_map[label] = row["value"]
+        if row.get("correct"):
+            correct_answers.append(label)
+
+    return Question(id=q_id, text=raw["text"], options=options_map, correct_answers=correct_answers)
+
+
+@traced
+def parse_capture(
+    capture: PageCapture, start_id: int | None = None, end_id: int | None = None
+) -> tuple[list[Question], bool, int]:
+    """Extracts the questions of a captured page, respecting optional start/end limits.
+
+    Args:
+        capture: The captured page.
+        start_id: The minimum question number (inclusive). If None, starts from 0.
+        end_id: The maximum question number (inclusive). If None, goes indefinitely.
+
+    Returns:
+        A tuple containing:
+        - list[Question]: The extracted questions.
+        - bool: limit_reached (True if we found a question > end_id).
+        - int: max_id_found (The highest Question ID found on this page).
+    """
+    questions: list[Question] = []
+    limit_reached = False
+    max_id_found = 0
+
+    for i, raw in enumerate(capture.containers):
+        try:
+            question = parse_container(raw, i + 1)
+        except Exception:
+            logger.exception(f"Error parsing container #{i + 1} of page {capture.page_num}")
+            continue
+        if not question:
+            continue
+
+        max_id_found = max(max_id_found, question.number)
+
+        # Check End Limit
+        if end_id is not None and question.number > end_id:
+            logger.info(f"Reached Question {question.number}. Exceeds limit {end_id}.")
+            limit_reached = True
+            break
+
+        # Check Start Limit
+        if start_id is not None and question.number < start_id:
+            continue
+
+        questions.append(question)
+
+    return questions, limit_reached, max_id_found
@@ -0,0 +1,159 @@
+"""Direct Chrome DevTools Protocol transport.
+
+Selenium sends every command to chromedriver over HTTP, and chromedriver
+forwards it to the browser over the DevTools protocol. This transport opens
+one persistent websocket straight to the browser's DevTools endpoint and talks
+to each tab through a flat session, skipping the chromedriver hop.
+
+The websocket client ships with Selenium (`websocket-client`).
+"""
+
+import itertools
+import urllib.request
+from typing import Any
+
+import websocket
+from loguru import logger
+from selenium import webdriver
+from selenium.common.exceptions import JavascriptException
+
+from codec import json_codec
+
+# Chromedriver prefixed window handles with this in older versions; the rest is the DevTools target ID
+_HANDLE_PREFIX = "CDwindow-"
+
+
+class CdpError(Exception):
+    """Raised when the browser answers a DevTools command with an error."""
+
+
+class CdpTransport:
+    """A persistent DevTools websocket to the browser that runs scripts per tab."""
+
+    # Seconds to wait for a reply before considering the connection lost
+    TIMEOUT = 30
+
+    def __init__(self, ws_url: str) -> None:
+        """Opens the websocket.
+
+        Args:
+            ws_url: The browser-level DevTools websocket URL.
+        """
+        # Chrome rejects websocket clients that send an Origin header it does not allow
+        self._ws = websocket.create_connection(ws_url, timeout=self.TIMEOUT, suppress_origin=True)
+        self._ids = itertools.count(1)
+        self._sessions: dict[str, str] = {}
+
+    @classmethod
+    def connect(cls, driver: webdriver.Chrome) -> "CdpTransport | None":
+        """Connects to the DevTools endpoint of the browser a driver controls.
+
+        Args:
+            driver: The Selenium Chrome driver instance.
+
+        Returns:
+            The transport, or None if the browser exposes no DevTools endpoint (Selenium is used instead).
+        """
+        address = (driver.capabilities.get("goog:chromeOptions") or {}).get("debuggerAddress")
+        if not address:
+            logger.warning("The browser exposes no DevTools address. Using Selenium for DOM operations.")
+            return None
+        try:
+            with urllib.request.urlopen(f"http://{address}/json/version", timeout=5) as response:
+                ws_url = json_codec.loads(response.read())["webSocketDebuggerUrl"]
+            transport = cls(ws_url)
+        except (OSError, KeyError, websocket.WebSocketException, json_codec.JSONDecodeError) as e:
+            logger.warning(f"Could not open a DevTools connection ({e}). Using Selenium for DOM operations.")
+            return None
+        logger.debug(f"DevTools transport connected to {address}.")
+        return transport
+
+    def close(self) -> None:
+        """Closes the websocket."""
+        try:
+            self._ws.close()
+        except (OSError, websocket.WebSocketException):
+            pass
+
+    def call_many(self, commands: list[tuple[str, dict[str, Any]]], handle: str | None = None) -> list[Any]:
+        """Sends several commands at once and waits for all replies.
+
+        Args:
+            commands: (method, params) pairs.
+            handle: Window handle of the tab to run them in (None for browser-level commands).
+
+        Returns:
+            The result of each command, in order.
+
+        Raises:
+            CdpError: If a command failed.
+            OSError, websocket.WebSocketException: If the connection is lost.
+        """
+        session_id = self._session(handle) if handle else None
+        pending: dict[int, int] = {}
+        for position, (method, params) in enumerate(commands):
+            message_id = next(self._ids)
+            message: dict[str, Any] = {"id": message_id, "method": method, "params": params}
+            if session_id:
+                message["sessionId"] = session_id
+            self._ws.send(json_codec.dumps(message))
+            pending[message_id] = position
+
+        results: list[Any] = [None] * len(commands)
+        errors = []
+        while pending:
+            reply = json_codec.loads(self._ws.recv())
+            # Events (no ID) and replies to abandoned calls are ignored
+            position = pending.pop(reply.get("id"), None)
+            if position is None:
+                continue
+            if "error" in reply:
+                errors.append(f"{commands[position][0]}: {reply['error'].get('message')}")
+            else:
+                results[position] = reply.get("result", {})
+        if errors:
+            raise CdpError("; ".join(errors))
+        return results
+
+    def call(self, method: str, params: dict[str, Any] | None = None, handle: str | None = None) -> Any:
+        """Sends one command and returns its result (see `call_many`)."""
+        return self.call_many([(method, params or {})], handle)[0]
+
+    def evaluate(self, script: str, *args: Any, handle: str) -> Any:
+        """Runs a script in a tab and returns its value.
+
+        Args:
+            script: Like Selenium's `execute_script`, a function body that reads its JSON-serializable
+                arguments from `arguments` and `return`s a value.
+            *args: The arguments of the script.
+            handle: Window handle of the tab to run it in.
+
+        Returns:
+            The JSON value returned by the script.
+
+        Raises:
+            JavascriptException: If the script threw, as with Selenium.
+        """
+        result = self.call(
+            "Runtime.evaluate",
+            {
+                "expression": f"(function(){{{script}\n}}).apply(null, {json_codec.dumps(list(args))})",
+                "returnByValue": True,
+                "awaitPromise": True,
+            },
+            handle,
+        )
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            description = (details.get("exception") or {}).get("description") or details.get("text")
+            raise JavascriptException(description)
+        return result["result"].get("value")
+
+    def _session(self, handle: str) -> str:
+        """Returns the DevTools session of a tab, attaching to it on first use."""
+        session_id = self._sessions.get(handle)
+        if session_id is None:
+            target_id = handle.removeprefix(_HANDLE_PREFIX)
+            session_id = self.call("Target.attachToTarget", {"targetId": target_id, "flatten": True})["sessionId"]
+            self._sessions[handle] = session_id
+        return session_id
@@ -4,7 +4,8 @@ This module loads environment variables and provides typed configuration constan
 """
 
 import os
-from datetime import datetime
+import socket
+from datetime import UTC, datetime
 from pathlib import Path
 from typing import Final
 
@@ -36,9 +37,48 @@ if EXAM_NAME is None:
 else:
     EXAM_NAME = EXAM_NAME.replace(" ", "_").lower()
 OUTPUT_FORMAT: Final[str] = os.getenv("OUTPUT_FORMAT", "json").lower()
-date: Final[str] = datetime.now().strftime("%Y%m%d_%H%M%S")
+date: Final[str] = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
 OUTPUT_FILE = f"output/{EXAM_NAME}_{date}.{OUTPUT_FORMAT}"
 
+# Selector strategies resolved per page layout, cached per exam across runs (see scraper.selector_engine)
+SELECTOR_CACHE_FILE: Final[str] = f"output/{EXAM_NAME}.selectors.json"
+
+# Keep a full-text search index next to the output file, updated on every save
+SEARCH_INDEX: Final[bool] = os.getenv("SEARCH_INDEX", "true").lower() == "true"
+
+# Near-duplicate detection while merging: "off", "flag" (log a warning) or "skip" (do not save new duplicates)
+DEDUP_MODE: Final[str] = os.getenv("DEDUP_MODE", "flag").lower()
+DEDUP_THRESHOLD: Final[float] = float(os.getenv("DEDUP_THRESHOLD", "0.8"))
+
+# Backup retention: the N newest backups, plus the newest one of each of the last D days and W weeks
+BACKUP_KEEP_LAST: Final[int] = int(os.getenv("BACKUP_KEEP_LAST", "5"))
+BACKUP_KEEP_DAILY: Final[int] = int(os.getenv("BACKUP_KEEP_DAILY", "7"))
+BACKUP_KEEP_WEEKLY: Final[int] = int(os.getenv("BACKUP_KEEP_WEEKLY", "4"))
+
+# Scrape pipeline: parse threads, capacity of the queues between stages, and seconds to wait after each navigation
+PARSE_WORKERS: Final[int] = int(os.getenv("SCRAPER_PARSE_WORKERS", "2"))
+PIPELINE_QUEUE_SIZE: Final[int] = int(os.getenv("SCRAPER_QUEUE_SIZE", "4"))
+PAGE_DELAY: Final[float] = float(os.getenv("SCRAPER_PAGE_DELAY", "2"))
+
+# Number of browser tabs loading pages concurrently (1 = follow the 'Next' button in a single tab).
+# With more tabs, page URLs are derived from START_URL, whose last path segment must be the page number.
+TABS: Final[int] = int(os.getenv("SCRAPER_TABS", "1"))
+
+# Run page scripts over a direct DevTools websocket instead of through chromedriver (falls back to Selenium)
+CDP: Final[bool] = os.getenv("SCRAPER_CDP", "false").lower() == "true"
+
+# Distributed scrape (see scraper.work_queue): ID of this worker in the shared queue (unique per process),
+# and seconds a claimed page stays leased to it without renewal (after which a crashed worker's page is reclaimed)
+WORKER_ID: Final[str] = os.getenv("SCRAPER_WORKER_ID") or f"{socket.gethostname()}-{os.getpid()}"
+LEASE_SECONDS: Final[float] = float(os.getenv("SCRAPER_LEASE_SECONDS", "120"))
+
+# Repair mode: extraction attempts per page, and seconds to wait for answers to render between two attempts
+REPAIR_RETRIES: Final[int] = int(os.getenv("REPAIR_RETRIES", "3"))
+REPAIR_ANSWER_WAIT: Final[float] = float(os.getenv("REPAIR_ANSWER_WAIT", "3"))
+
+# Merge tool: maximum number of questions sorted in memory when an input is not ordered by question number
+MERGE_RUN_SIZE: Final[int] = int(os.getenv("MERGE_RUN_SIZE", "10000"))
+
 LOG_FILE: Final[Path] = LOGS_DIR / "scraper.log"
 
 # --- Chrome Options ---
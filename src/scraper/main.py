@@ -1,15 +1,34 @@
-"""Main entry point for the scraper."""
+"""Main entry point for the scraper.
 
+Usage:
+    uv run -m scraper.main                              # scrape the configured range
+    uv run -m scraper.main --repair output/exam.json    # only refetch missing/answerless questions
+    uv run -m scraper.main --worker /shared/exam.db     # scrape pages claimed from a shared work queue
+    uv run -m scraper.main --collect /shared/exam.db    # merge the workers' results into the output file
+    uv run -m scraper.main --profile [cprofile|sample]  # profile the run (see the tracing package)
+"""
+
+import argparse
 import sys
-import time
+from pathlib import Path
 
 import undetected_chromedriver as uc
 from loguru import logger
 
+from dedup import MinHashIndex, question_fingerprint_text
+from models import Question
 from scraper import config
 from scraper.browser import ExamPage
-from scraper.models.question import QuestionDTO
-from scraper.storage import FileSaver, SaverFactory, create_backup
+from scraper.cdp import CdpTransport
+from scraper.pipeline import ParsedPage, ScrapePipeline
+from scraper.repair import plan_repair, repair
+from scraper.selector_engine import SelectorEngine, SelectorError, cache_path_for
+from scraper.storage import FileSaver, PageManifest, SaverFactory, create_backup, iter_journal_pages
+from scraper.tabs import TabScheduler
+from scraper.work_queue import open_work_queue
+from scraper.worker import ScrapeWorker
+from search import SearchIndex
+from tracing import add_profile_argument, profile_run
 
 
 def configure_logging() -> None:
@@ -50,20 +69,225 @@ def initialize_driver() -> uc.Chrome | None:
         return None
 
 
-def main() -> None:
+def create_page(driver: uc.Chrome, selector_cache: str | Path = config.SELECTOR_CACHE_FILE) -> ExamPage:
+    """Wraps the driver in the page object, with the exam's selector cache and the DevTools transport when enabled.
+
+    Args:
+        driver: The started Chrome driver.
+        selector_cache: The selector cache file of the exam being scraped.
+
+    Returns:
+        The page object.
+    """
+    cdp = CdpTransport.connect(driver) if config.CDP else None
+    return ExamPage(driver, cdp=cdp, selectors=SelectorEngine.for_exam(selector_cache))
+
+
+def update_search_index(index: SearchIndex | None, question_map: dict[str, Question]) -> None:
+    """Incrementally refreshes the search index sidecar of the output file.
+
+    Args:
+        index: The index to update (None when indexing is disabled).
+        question_map: The full current content of the output file.
+    """
+    if index is None:
+        return
+    try:
+        changed = index.update(question_map.values())
+        index.save()
+        logger.debug(f"Search index updated ({changed} questions changed).")
+    except Exception as e:
+        logger.warning(f"Could not update search index: {e}")
+
+
+def pause_for_login(page_num: int) -> None:
+    """Asks the user to solve a login wall or CAPTCHA in the browser, then waits for ENTER."""
+    logger.warning(f"No questions visible on Page {page_num}. Possible Login Wall.")
+    print("\a")
+    print("\n" + "=" * 60)
+    print("🛑 PAUSED: LOGIN REQUIRED OR CAPTCHA")
+    print("1. Go to the Chrome window.")
+    print("2. Log in / Solve Captcha.")
+    print("3. Ensure questions are visible.")
+    print("4. Press ENTER here to resume.")
+    print("=" * 60 + "\n")
+    input("Press ENTER to resume scraping...")
+    logger.info("Resuming...")
+
+
+def merge_questions(
+    master_question_map: dict[str, Question], new_questions: list[Question], dedup_index: MinHashIndex | None
+) -> None:
+    """Merges freshly scraped questions into the master map, checking for near-duplicates.
+
+    Args:
+        master_question_map: The map of all questions, updated in place.
+        new_questions: The questions extracted from the current page.
+        dedup_index: Near-duplicate index of the master map (None when detection is off).
+    """
+    for q in new_questions:
+        if dedup_index is not None:
+            matches = dedup_index.add(q.id, question_fingerprint_text(q))
+            if matches:
+                match = matches[0]
+                logger.warning(
+                    f"{q.id} is a near-duplicate of {match.duplicate_of} (similarity {match.similarity:.2f})."
+                )
+                if config.DEDUP_MODE == "skip" and q.id not in master_question_map:
+                    dedup_index.remove(q.id)
+                    continue
+        master_question_map[q.id] = q
+
+
+def run_repair(filepath: Path) -> None:
+    """Repairs an existing output file by revisiting only the pages of its missing or answerless questions.
+
+    Args:
+        filepath: The question bank to repair.
+    """
+    if not filepath.exists():
+        logger.error(f"Output file not found: {filepath}")
+        return
+
+    saver = SaverFactory.for_file(filepath)
+    master_question_map = saver.load_existing(str(filepath))
+    manifest = PageManifest.for_bank(filepath)
+    plan = plan_repair(master_question_map, manifest, config.QUESTION_RANGE_START, config.QUESTION_RANGE_END)
+    logger.info(
+        f"{len(plan.missing)} missing and {len(plan.answerless)} answerless questions "
+        f"across {len(plan.pages)} pages ({len(manifest)} questions in the page manifest)."
+    )
+    for q_id in plan.unlocated:
+        logger.warning(f"{q_id} has no known page (scraped before the manifest existed?). Skipping.")
+    if not plan.pages:
+        return
+
+    create_backup(str(filepath))
+    search_index = SearchIndex.for_bank(filepath) if config.SEARCH_INDEX else None
+
+    def save() -> None:
+        saver.save(master_question_map, str(filepath))
+        manifest.save()
+        update_search_index(search_index, master_question_map)
+
+    driver = initialize_driver()
+    if not driver:
+        return
+    try:
+        fixed = repair(
+            create_page(driver, cache_path_for(filepath)), plan, master_question_map, manifest, on_page_fixed=save
+        )
+        manifest.save()
+        logger.success(f"Repaired {fixed} questions in {filepath}.")
+    except KeyboardInterrupt:
+        logger.warning("Repair stopped by user.")
+    except SelectorError as e:
+        logger.critical(f"{e} The site layout changed; the questions repaired so far are kept.")
+    finally:
+        try:
+            driver.quit()
+        except OSError:
+            pass
+
+
+def run_worker(location: Path) -> None:
+    """Scrapes pages claimed from a shared work queue until every page is done.
+
+    Args:
+        location: The queue (a SQLite file or a lock-file directory on a shared disk).
+    """
+    queue = open_work_queue(location, lease_seconds=config.LEASE_SECONDS)
+    logger.info(f"Worker {config.WORKER_ID} joining the work queue {location}.")
+    if queue.is_finished():
+        logger.info("Every page of the queue is already done.")
+        return
+
+    driver = initialize_driver()
+    if not driver:
+        return
+    try:
+        worker = ScrapeWorker(
+            create_page(driver),
+            queue,
+            config.WORKER_ID,
+            config.START_URL,
+            start_id=config.QUESTION_RANGE_START,
+            end_id=config.QUESTION_RANGE_END,
+            page_delay=config.PAGE_DELAY,
+            on_empty_page=pause_for_login,
+        )
+        worker.run()
+        logger.success(f"All pages are done. Merge the results with: uv run -m scraper.main --collect {location}")
+    except KeyboardInterrupt:
+        logger.warning("Worker stopped by user. Its current page is released to the other workers.")
+    except SelectorError as e:
+        logger.critical(f"{e} The site layout changed; the pages journaled so far are kept.")
+    except Exception as e:
+        logger.exception(f"Worker crashed: {e}")
+    finally:
+        try:
+            driver.quit()
+        except OSError:
+            pass
+
+
+def run_collect(location: Path) -> None:
+    """Merges the journals of the workers of a distributed scrape into the output file.
+
+    Args:
+        location: The work queue the workers used.
+    """
+    if not location.exists():
+        logger.error(f"Work queue not found: {location}")
+        return
+
+    queue = open_work_queue(location)
+    if not queue.is_finished():
+        last = queue.last_page()
+        logger.warning(f"The scrape is not finished (last page: {last or 'unknown'}). Merging the pages done so far.")
+
+    saver = SaverFactory.for_file(config.OUTPUT_FILE)
+    create_backup(config.OUTPUT_FILE)
+    master_question_map = saver.load_existing(config.OUTPUT_FILE)
+    manifest = PageManifest.for_bank(config.OUTPUT_FILE)
+    dedup_index = MinHashIndex(threshold=config.DEDUP_THRESHOLD) if config.DEDUP_MODE != "off" else None
+    if dedup_index is not None:
+        for q in master_question_map.values():
+            dedup_index.add(q.id, question_fingerprint_text(q))
+
+    pages = 0
+    for page in iter_journal_pages(queue.journal_dir, queue.done_tokens()):
+        merge_questions(master_question_map, page.questions, dedup_index)
+        manifest.record(page.url, [q.id for q in page.questions])
+        pages += 1
+
+    saver.save(master_question_map, config.OUTPUT_FILE)
+    manifest.save()
+    if config.SEARCH_INDEX:
+        update_search_index(SearchIndex.for_bank(config.OUTPUT_FILE), master_question_map)
+    logger.success(f"Merged {pages} pages: {len(master_question_map)} questions saved to {config.OUTPUT_FILE}.")
+
+
+def run_scrape() -> None:
     """Orchestrates the scraping process."""
-    configure_logging()
     logger.info("Starting Scraper Application...")
     logger.info(f"Configuration: Start={config.QUESTION_RANGE_START}, End={config.QUESTION_RANGE_END}")
 
     # 1. Initialize Saver and Backup
     try:
-        saver: FileSaver = SaverFactory.get_saver(config.OUTPUT_FORMAT)
+        saver: FileSaver = SaverFactory.for_file(config.OUTPUT_FILE)
         # Create a timestamped backup before touching the file
         create_backup(config.OUTPUT_FILE)
         # Load existing data into memory to allow updates
-        master_question_map: dict[str, QuestionDTO] = saver.load_existing(config.OUTPUT_FILE)
+        master_question_map: dict[str, Question] = saver.load_existing(config.OUTPUT_FILE)
         logger.info(f"Loaded {len(master_question_map)} existing questions.")
+        search_index = SearchIndex.for_bank(config.OUTPUT_FILE) if config.SEARCH_INDEX else None
+        manifest = PageManifest.for_bank(config.OUTPUT_FILE)
+        dedup_index = None
+        if config.DEDUP_MODE != "off":
+            dedup_index = MinHashIndex(threshold=config.DEDUP_THRESHOLD)
+            for q in master_question_map.values():
+                dedup_index.add(q.id, question_fingerprint_text(q))
     except Exception as e:
         logger.critical(f"Initialization Error: {e}")
         return
@@ -74,69 +298,52 @@ def main() -> None:
         return
 
     try:
-        page_object = ExamPage(driver)
+        page_object = create_page(driver)
         page_object.load(config.START_URL)
 
-        page_num = 1
-
-        while True:
-            logger.info(f"--- Processing Page {page_num} ---")
-
-            page_object.reveal_all_answers()
-
-            # Extract data
-            new_questions, limit_reached, max_id_on_page = page_object.extract_questions(
-                start_id=config.QUESTION_RANGE_START, end_id=config.QUESTION_RANGE_END
-            )
-
-            # Manual Intervention Logic (Login Wall detection)
-            if max_id_on_page == 0:
-                logger.warning(f"No questions visible on Page {page_num}. Possible Login Wall.")
-                print("\a")
-                print("\n" + "=" * 60)
-                print("🛑 PAUSED: LOGIN REQUIRED OR CAPTCHA")
-                print("1. Go to the Chrome window.")
-                print("2. Log in / Solve Captcha.")
-                print("3. Ensure questions are visible.")
-                print("4. Press ENTER here to resume.")
-                print("=" * 60 + "\n")
-                input("Press ENTER to resume scraping...")
-
-                logger.info("Resuming...")
-                page_object.reveal_all_answers()
-                new_questions, limit_reached, max_id_on_page = page_object.extract_questions(
-                    config.QUESTION_RANGE_START, config.QUESTION_RANGE_END
-                )
-
-            count = len(new_questions)
-            if count > 0:
-                logger.info(f"Extracted {count} relevant questions.")
-
-                # Merge logic: Update master map
-                for q in new_questions:
-                    master_question_map[q.id] = q
+        def persist(batch: list[ParsedPage]) -> None:
+            """Merges a batch of parsed pages and saves the result once."""
+            new_count = 0
+            for parsed in batch:
+                count = len(parsed.questions)
+                if count > 0:
+                    logger.info(f"Page {parsed.capture.page_num}: extracted {count} relevant questions.")
+                    # Merge logic: Update master map (flagging or skipping near-duplicates)
+                    merge_questions(master_question_map, parsed.questions, dedup_index)
+                    manifest.record(parsed.capture.url, [q.id for q in parsed.questions])
+                    new_count += count
+                elif not parsed.capture.is_empty:
+                    logger.info(f"Page {parsed.capture.page_num} scanned. No questions within target range.")
 
-                # Save the updated master map
+            if new_count:
+                # Save the updated master map, remembering which page each question came from
                 saver.save(master_question_map, config.OUTPUT_FILE)
+                manifest.save()
+                update_search_index(search_index, master_question_map)
 
-            elif max_id_on_page > 0:
-                logger.info(f"Page {page_num} scanned. No questions within target range.")
-
-            if limit_reached:
-                logger.success(f"Reached end limit (Question {config.QUESTION_RANGE_END}). Stopping.")
-                break
-
-            # Pagination
-            has_next = page_object.go_to_next_page()
-            if not has_next:
-                logger.info("No more pages found. Scrape complete.")
-                break
+        if config.TABS > 1:
+            # Spread the politeness delay across the tabs
+            scheduler = TabScheduler(page_object, config.TABS, page_delay=config.PAGE_DELAY / config.TABS)
+            captures = scheduler.iter_captures(
+                config.START_URL, end_id=config.QUESTION_RANGE_END, on_empty_page=pause_for_login
+            )
+        else:
+            captures = page_object.iter_captures(
+                end_id=config.QUESTION_RANGE_END, page_delay=config.PAGE_DELAY, on_empty_page=pause_for_login
+            )
 
-            page_num += 1
-            time.sleep(2)
+        ScrapePipeline(
+            persist,
+            start_id=config.QUESTION_RANGE_START,
+            end_id=config.QUESTION_RANGE_END,
+            parse_workers=config.PARSE_WORKERS,
+            queue_size=config.PIPELINE_QUEUE_SIZE,
+        ).run(captures)
 
     except KeyboardInterrupt:
         logger.warning("Scraper stopped by user.")
+    except SelectorError as e:
+        logger.critical(f"{e} The site layout changed; the questions saved so far are kept.")
     except Exception as e:
         logger.exception(f"An unexpected crash occurred: {e}")
     finally:
@@ -148,5 +355,27 @@ def main() -> None:
                 pass
 
 
+def main() -> None:
+    """Parses the command line and runs the scraper, the repair mode or a distributed scrape step."""
+    configure_logging()
+
+    parser = argparse.ArgumentParser(description="Scrape exam questions.")
+    parser.add_argument("--repair", type=Path, metavar="FILE", help="Only refetch the gaps of an existing output file.")
+    parser.add_argument("--worker", type=Path, metavar="QUEUE", help="Scrape pages claimed from a shared work queue.")
+    parser.add_argument("--collect", type=Path, metavar="QUEUE", help="Merge the results of a work queue's workers.")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    with profile_run("scraper", args.profile):
+        if args.repair:
+            run_repair(args.repair)
+        elif args.worker:
+            run_worker(args.worker)
+        elif args.collect:
+            run_collect(args.collect)
+        else:
+            run_scrape()
+
+
 if __name__ == "__main__":
     main()
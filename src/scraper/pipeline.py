@@ -0,0 +1,155 @@
+"""Staged scrape pipeline.
+
+Three stages connected by bounded queues:
+
+1. Browser (calling thread): consumes page captures as the browser produces
+   them (one tab after another, or several tabs at once).
+2. Parse (worker threads): turns captures into `Question`s.
+3. Persist (one thread): merges parsed pages in page order and saves them.
+
+A full queue blocks the stage feeding it, so a slow save throttles navigation
+instead of piling captures up in memory.
+"""
+
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+from loguru import logger
+
+from models import Question
+from scraper.capture import PageCapture, parse_capture
+from tracing import span
+
+_DONE = None
+
+
+@dataclass
+class ParsedPage:
+    """The parse stage output for one page.
+
+    Attributes:
+        capture: The page capture it was parsed from.
+        questions: The questions within the configured range.
+        limit_reached: True if the page holds a question past the end of the range.
+    """
+
+    capture: PageCapture
+    questions: list[Question]
+    limit_reached: bool
+
+
+class ScrapePipeline:
+    """Runs the browser, parse and persist stages concurrently."""
+
+    def __init__(
+        self,
+        persist: Callable[[list[ParsedPage]], None],
+        start_id: int | None = None,
+        end_id: int | None = None,
+        parse_workers: int = 2,
+        queue_size: int = 4,
+    ) -> None:
+        """Initializes the pipeline.
+
+        Args:
+            persist: Merges and saves a batch of parsed pages, given in page order.
+            start_id: The minimum question number (inclusive).
+            end_id: The maximum question number (inclusive).
+            parse_workers: Number of parse threads.
+            queue_size: Capacity of each queue between two stages.
+        """
+        self.persist = persist
+        self.start_id = start_id
+        self.end_id = end_id
+        self.parse_workers = max(1, parse_workers)
+        self._captures: queue.Queue[PageCapture | None] = queue.Queue(maxsize=queue_size)
+        self._parsed: queue.Queue[ParsedPage | None] = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self.pages_captured = 0
+
+    def run(self, captures: Iterable[PageCapture]) -> None:
+        """Feeds page captures through the parse and persist stages.
+
+        Args:
+            captures: The captures of pages 1, 2, ... (any order), typically a browser generator
+                driven from the calling thread.
+        """
+        threads = [
+            threading.Thread(target=self._parse_stage, name=f"parse-{i}", daemon=True)
+            for i in range(self.parse_workers)
+        ]
+        threads.append(threading.Thread(target=self._persist_stage, name="persist", daemon=True))
+        for thread in threads:
+            thread.start()
+
+        start = time.perf_counter()
+        try:
+            self._browser_stage(captures)
+        finally:
+            # Let a generator source release its resources (e.g. close extra tabs) right away
+            close = getattr(captures, "close", None)
+            if close is not None:
+                close()
+            for _ in range(self.parse_workers):
+                self._captures.put(_DONE)
+            for thread in threads:
+                thread.join()
+
+        elapsed = time.perf_counter() - start
+        logger.info(f"Pipeline processed {self.pages_captured} pages in {elapsed:.1f}s.")
+
+    def _browser_stage(self, captures: Iterable[PageCapture]) -> None:
+        """Hands captures to the parse stage as they arrive (blocking while the parse queue is full)."""
+        for capture in captures:
+            self._captures.put(capture)
+            self.pages_captured += 1
+            if self._stop.is_set():
+                break
+
+    def _parse_stage(self) -> None:
+        """Turns captures into questions until the browser stage is done."""
+        while (capture := self._captures.get()) is not _DONE:
+            try:
+                questions, limit_reached, _ = parse_capture(capture, self.start_id, self.end_id)
+            except Exception:
+                logger.exception(f"Failed to parse page {capture.page_num}")
+                questions, limit_reached = [], False
+            self._parsed.put(ParsedPage(capture=capture, questions=questions, limit_reached=limit_reached))
+        self._parsed.put(_DONE)
+
+    def _persist_stage(self) -> None:
+        """Merges parsed pages in page order, saving once per batch of pages ready together."""
+        pending: dict[int, ParsedPage] = {}
+        next_page = 1
+        remaining_workers = self.parse_workers
+
+        while remaining_workers:
+            item = self._parsed.get()
+            # Drain whatever else is already waiting, so one save covers several pages
+            while True:
+                if item is _DONE:
+                    remaining_workers -= 1
+                else:
+                    pending[item.capture.page_num] = item
+                try:
+                    item = self._parsed.get_nowait()
+                except queue.Empty:
+                    break
+
+            batch = []
+            while next_page in pending:
+                batch.append(pending.pop(next_page))
+                next_page += 1
+            if not batch or self._stop.is_set():
+                continue
+
+            try:
+                with span("persist", "scraper", pages=[parsed.capture.page_num for parsed in batch]):
+                    self.persist(batch)
+            except Exception:
+                # Keep draining so the other stages never block on a full queue
+                logger.exception("Failed to persist scraped pages. Stopping.")
+                self._stop.set()
@@ -0,0 +1,160 @@
+"""Targeted gap repair for an existing output file.
+
+Finds the questions that are missing from a bank (gaps in the question
+numbers) or were saved without correct answers, and revisits only the pages
+the page manifest says they live on.
+"""
+
+import bisect
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from loguru import logger
+from selenium.common.exceptions import WebDriverException
+
+from models import Question, question_number
+from scraper import config
+from scraper.browser import ExamPage
+from scraper.storage.manifest import PageManifest
+
+
+@dataclass
+class RepairPlan:
+    """The questions to fix and the pages to visit.
+
+    Attributes:
+        missing: IDs absent from the bank although their number is within range.
+        answerless: IDs saved without any correct answer.
+        pages: Page URL -> IDs expected on it, in first-visit order.
+        unlocated: IDs whose page cannot be inferred from the manifest.
+    """
+
+    missing: list[str] = field(default_factory=list)
+    answerless: list[str] = field(default_factory=list)
+    pages: dict[str, set[str]] = field(default_factory=dict)
+    unlocated: list[str] = field(default_factory=list)
+
+
+def plan_repair(
+    question_map: dict[str, Question],
+    manifest: PageManifest,
+    start_id: int | None = None,
+    end_id: int | None = None,
+) -> RepairPlan:
+    """Detects the gaps of a bank and the pages to revisit for each.
+
+    A missing question is looked for on the pages of its nearest known
+    neighbours (it sits either on the same page as the previous question or on
+    the same page as the next one).
+
+    Args:
+        question_map: The current content of the bank.
+        manifest: The page manifest of the bank.
+        start_id: First expected question number (defaults to the lowest one found).
+        end_id: Last expected question number (defaults to the highest one found).
+
+    Returns:
+        The repair plan.
+    """
+    plan = RepairPlan()
+    numbered = {q.number: q_id for q_id, q in question_map.items() if q.number}
+    if not numbered:
+        return plan
+
+    template = next(iter(numbered.values()))
+    low = start_id if start_id is not None else min(numbered)
+    high = end_id if end_id is not None else max(numbered)
+    known = sorted(n for n in numbered if numbered[n] in manifest.pages)
+
+    def add(q_id: str, urls: list[str]) -> None:
+        if not urls:
+            plan.unlocated.append(q_id)
+        for url in urls:
+            plan.pages.setdefault(url, set()).add(q_id)
+
+    for number in range(low, high + 1):
+        q_id = numbered.get(number)
+        if q_id is None:
+            head, _, tail = template.rpartition(str(question_number(template)))
+            q_id = f"{head}{number}{tail}"
+            plan.missing.append(q_id)
+            pos = bisect.bisect_left(known, number)
+            neighbours = known[max(pos - 1, 0) : pos + 1]
+            urls = [manifest.pages[numbered[n]] for n in neighbours]
+            add(q_id, list(dict.fromkeys(urls)))
+        elif not question_map[q_id].correct_answers:
+            plan.answerless.append(q_id)
+            add(q_id, [manifest.pages[q_id]] if q_id in manifest.pages else [])
+
+    return plan
+
+
+def repair(
+    page: ExamPage,
+    plan: RepairPlan,
+    question_map: dict[str, Question],
+    manifest: PageManifest,
+    on_page_fixed: Callable[[], None],
+) -> int:
+    """Revisits the planned pages and merges the recovered questions in place.
+
+    Args:
+        page: The page object driving the browser.
+        plan: The repair plan.
+        question_map: The bank content, updated in place.
+        manifest: The page manifest, updated in place.
+        on_page_fixed: Called after every page that fixed something (e.g. to save the file).
+
+    Returns:
+        The number of questions fixed.
+    """
+    pending = set(plan.missing) | set(plan.answerless)
+    fixed = 0
+
+    for url, expected in plan.pages.items():
+        targets = expected & pending
+        if not targets:
+            continue
+
+        logger.info(f"Revisiting {url} for {len(targets)} questions...")
+        try:
+            recovered = _revisit(page, url, targets, manifest)
+        except WebDriverException as e:
+            # Includes TimeoutException: a page that does not load must not end the repair of the others
+            logger.warning(f"Could not revisit {url}: {e.msg or type(e).__name__}")
+            continue
+
+        if recovered:
+            question_map.update(recovered)
+            pending.difference_update(recovered)
+            fixed += len(recovered)
+            on_page_fixed()
+
+    for q_id in sorted(pending, key=question_number):
+        logger.warning(f"{q_id} could not be repaired.")
+    return fixed
+
+
+def _revisit(page: ExamPage, url: str, targets: set[str], manifest: PageManifest) -> dict[str, Question]:
+    """Loads a page and extracts the target questions, waiting for their answers to render.
+
+    Returns:
+        The target questions found with their correct answers.
+
+    Raises:
+        TimeoutException: If the page does not load in time.
+    """
+    page.load(url)
+    recovered: dict[str, Question] = {}
+    for attempt in range(1, config.REPAIR_RETRIES + 1):
+        page.reveal_all_answers()
+        questions, _, _ = page.extract_questions()
+        manifest.record(url, [q.id for q in questions])
+        recovered.update({q.id: q for q in questions if q.id in targets and q.correct_answers})
+        if len(recovered) == len(targets):
+            break
+        # Answers (green borders) may not have rendered yet: give the page more time
+        logger.debug(f"{len(targets) - len(recovered)} questions still incomplete (attempt {attempt}).")
+        time.sleep(config.REPAIR_ANSWER_WAIT)
+    return recovered
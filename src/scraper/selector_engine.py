@@ -0,0 +1,284 @@
+"""Self-healing selectors for the question containers.
+
+The exam site styles its markup with hashed CSS class names that change
+whenever it is redeployed. Each field of a question container can therefore be
+located by several strategies, ranked from cheapest to most robust:
+
+- text: hashed class, structural position (first block of the panel).
+- options: hashed class, structural position (second block), text pattern
+  (the block whose rows all start with an 'A.'-style label).
+- label / value: hashed class, structural position (first / last element of
+  the row), text pattern (the row text split after its label).
+- correct: hashed class, colour of the revealed-answer border.
+
+The capture script fingerprints the page layout (tags and classes of the
+panel blocks). On a layout it has not seen, it runs every strategy once (a
+probe) and the engine keeps, per field, the best-ranked one that works. The
+choice is cached per exam in a file, so later pages run only the winning
+strategies. If they stop matching, the layout is probed again.
+"""
+
+import re
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from codec import json_codec
+
+CACHE_VERSION = 1
+
+# Strategies per field, best first (implemented by CAPTURE_SCRIPT)
+STRATEGIES: dict[str, tuple[str, ...]] = {
+    "text": ("class", "structure"),
+    "options": ("class", "structure", "pattern"),
+    "label": ("class", "structure", "pattern"),
+    "value": ("class", "structure", "pattern"),
+    "correct": ("class", "border"),
+}
+
+# Hashed class names of the current site build, used by the 'class' strategies
+HASHED_CLASSES = {"text": "css-naa3lg", "options": "css-j7qwjs", "label": "css-xakj1w", "value": "css-cba290"}
+
+# Border colors (and class) the site uses to highlight a correct option once answers are revealed
+CORRECT_BORDERS = ("rgb(56, 161, 105)", "rgb(72, 187, 120)")
+CORRECT_CLASS = "css-jjzrip"
+
+# Share of containers (or rows) a strategy must handle to win over a lower-ranked one
+MIN_SCORE = 0.8
+
+# Layouts remembered per exam (the oldest are dropped)
+MAX_LAYOUTS = 20
+
+_LABEL_RE = re.compile(r"^[A-Z]\.?$")
+
+# Timestamp a run appends to the exam name of its output file (e.g. '_20251224_121319')
+_RUN_SUFFIX_RE = re.compile(r"_\d{8}_\d{6}$")
+
+
+def cache_path_for(bank_path: str | Path) -> Path:
+    """Returns the selector cache of the exam a question bank was scraped from.
+
+    The cache is shared by every run of an exam: 'output/gcp_20251224_121319.json.gz' maps to
+    'output/gcp.selectors.json'.
+    """
+    bank_path = Path(bank_path)
+    exam = _RUN_SUFFIX_RE.sub("", bank_path.name.split(".", 1)[0])
+    return bank_path.with_name(f"{exam}.selectors.json")
+
+
+class SelectorError(Exception):
+    """Raised when no strategy can locate a required field on the page."""
+
+
+def _valid_label(label: Any) -> bool:
+    """Checks that a located label looks like 'A' or 'A.'."""
+    return isinstance(label, str) and bool(_LABEL_RE.match(label.strip()))
+
+
+def _valid_text(text: Any) -> bool:
+    """Checks that a located text is a non-blank string."""
+    return isinstance(text, str) and bool(text.strip())
+
+
+class SelectorEngine:
+    """Picks and caches the selector strategy of each container field, per page layout."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        """Initializes the engine.
+
+        Args:
+            path: JSON file caching the resolved layouts (None = keep them in memory only).
+        """
+        self.path = path
+        self.layouts: dict[str, dict[str, str]] = {}
+
+    @classmethod
+    def for_exam(cls, path: str | Path) -> "SelectorEngine":
+        """Loads the cached layouts of an exam (none if the file is missing or unreadable).
+
+        Args:
+            path: The exam's cache file.
+
+        Returns:
+            The engine.
+        """
+        engine = cls(Path(path))
+        if not engine.path.exists():
+            return engine
+        try:
+            data = json_codec.load_file(engine.path)
+        except (json_codec.JSONDecodeError, OSError):
+            logger.warning(f"Ignoring unreadable selector cache {engine.path}.")
+            return engine
+        if data.get("version") == CACHE_VERSION:
+            engine.layouts = data.get("layouts", {})
+        return engine
+
+    def script_args(self) -> dict[str, Any]:
+        """Returns the argument of CAPTURE_SCRIPT: the known layouts and the site constants."""
+        return {
+            "layouts": self.layouts,
+            "classes": HASHED_CLASSES,
+            "correct_class": CORRECT_CLASS,
+            "borders": CORRECT_BORDERS,
+        }
+
+    def is_broken(self, containers: list[dict[str, Any]]) -> bool:
+        """Checks whether the cached strategies failed on a captured page.
+
+        Pages are captured once their answers are revealed, and a cached layout
+        always has a working 'correct' strategy: a page where no option is marked
+        correct means that strategy stopped matching.
+
+        Args:
+            containers: The containers captured with the cached strategies.
+
+        Returns:
+            True if fewer than half of the questions have a text and a labelled option,
+            or if no option of any question is marked correct.
+        """
+        named = [c for c in containers if c.get("id")]
+        working = sum(
+            1
+            for c in named
+            if _valid_text(c.get("text"))
+            and any(row.get("label") and row.get("value") for row in c.get("options") or [])
+        )
+        marked = any(row.get("correct") for c in named for row in c.get("options") or [])
+        return working * 2 < len(named) or (bool(named) and not marked)
+
+    def forget(self, layout: str) -> None:
+        """Drops a layout whose cached strategies stopped working, so the next capture probes it."""
+        if self.layouts.pop(layout, None) is not None:
+            logger.warning("The cached selectors no longer match the page. Probing the layout again.")
+            self.save()
+
+    def learn(self, layout: str, containers: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Resolves the strategies of a probed layout and converts the probe into regular containers.
+
+        The choice is cached unless the correct answers could not be told apart
+        (e.g. the answers were not revealed), in which case the next page probes again.
+
+        Args:
+            layout: The layout fingerprint reported by the capture script.
+            containers: The probed containers (the result of every strategy).
+
+        Returns:
+            The containers, as captured with the resolved strategies.
+
+        Raises:
+            SelectorError: If no strategy locates the question text or options.
+        """
+        if not any(c.get("id") for c in containers):
+            # Nothing to learn from (e.g. a login wall): an empty page
+            return []
+        strategies = self.resolve(containers)
+        if "correct" in strategies:
+            self.layouts.pop(layout, None)
+            self.layouts[layout] = strategies
+            while len(self.layouts) > MAX_LAYOUTS:
+                del self.layouts[next(iter(self.layouts))]
+            logger.info(f"Resolved selectors for a new page layout: {strategies}")
+            self.save()
+        return [self._apply(c, strategies) for c in containers]
+
+    def resolve(self, containers: list[dict[str, Any]]) -> dict[str, str]:
+        """Picks, per field, the best-ranked strategy that works on the probed questions.
+
+        Args:
+            containers: The probed containers.
+
+        Returns:
+            Field -> strategy. 'correct' is missing if no strategy marks any option as correct.
+
+        Raises:
+            SelectorError: If no strategy locates a required field.
+        """
+        named = [c for c in containers if c.get("id")]
+        strategies: dict[str, str] = {}
+
+        def labelled(rows: list[dict[str, Any]] | None) -> list[dict[str, Any]]:
+            """Keeps the rows that have a label according to the chosen (or, before choosing, any) strategy."""
+            label = strategies.get("label")
+            if label:
+                return [row for row in rows or [] if _valid_label(row["label"][label])]
+            return [row for row in rows or [] if any(map(_valid_label, row["label"].values()))]
+
+        strategies["text"] = self._pick(
+            "text", {s: [_valid_text(c["text"][s]) for c in named] for s in STRATEGIES["text"]}
+        )
+        strategies["options"] = self._pick(
+            "options", {s: [len(labelled(c["options"][s])) >= 2 for c in named] for s in STRATEGIES["options"]}
+        )
+
+        options = [c["options"][strategies["options"]] for c in named]
+        rows = [row for container_rows in options for row in container_rows or []]
+        strategies["label"] = self._pick(
+            "label", {s: [_valid_label(row["label"][s]) for row in rows] for s in STRATEGIES["label"]}
+        )
+
+        rows = labelled(rows)
+        strategies["value"] = self._pick(
+            "value", {s: [_valid_text(row["value"][s]) for row in rows] for s in STRATEGIES["value"]}
+        )
+
+        try:
+            strategies["correct"] = self._pick(
+                "correct",
+                {
+                    s: [any(row["correct"][s] for row in labelled(container_rows)) for container_rows in options]
+                    for s in STRATEGIES["correct"]
+                },
+            )
+        except SelectorError:
+            logger.debug("No correct answer shows on the probed page. The layout will be probed again.")
+        return strategies
+
+    def save(self) -> None:
+        """Writes the cached layouts to the cache file."""
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            json_codec.dump_file({"version": CACHE_VERSION, "layouts": self.layouts}, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write selector cache {self.path}: {e}")
+
+    @staticmethod
+    def _pick(field: str, results: dict[str, list[bool]]) -> str:
+        """Returns the first strategy reaching MIN_SCORE, else the best-scoring one.
+
+        Raises:
+            SelectorError: If no strategy works at all.
+        """
+        scores = {name: sum(ok) / len(ok) if ok else 0.0 for name, ok in results.items()}
+        for name in STRATEGIES[field]:
+            if scores[name] >= MIN_SCORE:
+                return name
+        best = max(STRATEGIES[field], key=lambda name: scores[name])
+        if scores[best] == 0:
+            raise SelectorError(f"No selector strategy finds the question {field} on this page.")
+        logger.warning(f"Selectors for the question {field} are unreliable ({best}: {scores[best]:.0%} matched).")
+        return best
+
+    @staticmethod
+    def _apply(container: dict[str, Any], strategies: dict[str, str]) -> dict[str, Any]:
+        """Converts a probed container into the regular capture format, using the chosen strategies."""
+        rows = container["options"][strategies["options"]]
+        correct = strategies.get("correct")
+        return {
+            "id": container.get("id"),
+            "text": container["text"][strategies["text"]],
+            "options": None
+            if rows is None
+            else [
+                {
+                    "label": row["label"][strategies["label"]],
+                    "value": row["value"][strategies["value"]],
+                    # Unresolved: count an option as correct if any strategy says so
+                    "correct": row["correct"][correct] if correct else any(row["correct"].values()),
+                }
+                for row in rows
+            ],
+        }
@@ -1,5 +1,8 @@
 from scraper.storage.csv_saver import CsvSaver
+from scraper.storage.journal import JournalPage, PageJournal, iter_journal_pages
 from scraper.storage.json_saver import JsonSaver
+from scraper.storage.jsonl_saver import JsonlSaver
+from scraper.storage.manifest import PageManifest, manifest_path_for
 from scraper.storage.saver_factory import SaverFactory
 from scraper.storage.saver_interface import FileSaver
 from scraper.storage.utils import create_backup
@@ -8,8 +11,14 @@ from scraper.storage.yaml_saver import YamlSaver
 __all__ = [
     "CsvSaver",
     "FileSaver",
+    "JournalPage",
     "JsonSaver",
+    "JsonlSaver",
+    "PageJournal",
+    "PageManifest",
     "SaverFactory",
     "YamlSaver",
     "create_backup",
+    "iter_journal_pages",
+    "manifest_path_for",
 ]
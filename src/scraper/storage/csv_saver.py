@@ -1,20 +1,21 @@
 """Handles file storage, backups, and data merging."""
 
 import csv
-import json
-from dataclasses import asdict
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
 from loguru import logger
 
-from scraper.models.question import QuestionDTO
+from codec import json_codec
+from codec.compression import open_file
+from models import Question
 from scraper.storage.saver_interface import FileSaver
 
 
 class CsvSaver(FileSaver):
     """Concrete saver implementation for CSV format."""
 
-    def load_existing(self, filename: str) -> dict[str, QuestionDTO]:
+    def load_existing(self, filename: str) -> dict[str, Question]:
         """See base class docstring."""
         path = Path(filename)
         if not path.exists():
@@ -22,32 +23,38 @@ class CsvSaver(FileSaver):
 
         results = {}
         try:
-            with open(path, encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    # JSON strings need parsing back to python objects
-                    row["options"] = json.loads(row["options"])
-                    row["correct_answers"] = json.loads(row["correct_answers"])
-                    results[row["id"]] = QuestionDTO(**row)
+            for q in self.iter_existing(filename):
+                results[q.id] = q
         except Exception as e:
             logger.warning(f"Error loading CSV {filename}: {e}")
         return results
 
-    def save(self, data_map: dict[str, QuestionDTO], filename: str) -> None:
+    def save(self, data_map: dict[str, Question], filename: str) -> None:
         """See base class docstring."""
         if not data_map:
             return
 
-        output = []
-        for q in data_map.values():
-            row = asdict(q)
-            # Serialize complex types for CSV
-            row["options"] = json.dumps(row["options"], ensure_ascii=False)
-            row["correct_answers"] = json.dumps(row["correct_answers"], ensure_ascii=False)
-            output.append(row)
-
-        keys = output[0].keys()
-        with open(filename, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=keys)
-            writer.writeheader()
-            writer.writerows(output)
+        self.save_stream(data_map.values(), filename)
+
+    def iter_existing(self, filename: str) -> Iterator[Question]:
+        """See base class docstring."""
+        with open_file(filename, "r", newline="") as f:
+            for row in csv.DictReader(f):
+                # JSON strings need parsing back to python objects
+                row["options"] = json_codec.loads(row["options"])
+                row["correct_answers"] = json_codec.loads(row["correct_answers"])
+                yield Question.from_dict(row)
+
+    def save_stream(self, questions: Iterable[Question], filename: str) -> None:
+        """See base class docstring."""
+        with open_file(filename, "w", newline="") as f:
+            writer = None
+            for q in questions:
+                row = q.to_dict()
+                # Serialize complex types for CSV
+                row["options"] = json_codec.dumps(row["options"])
+                row["correct_answers"] = json_codec.dumps(row["correct_answers"])
+                if writer is None:
+                    writer = csv.DictWriter(f, fieldnames=row.keys())
+                    writer.writeheader()
+                writer.writerow(row)
@@ -0,0 +1,113 @@
+"""Per-worker result journals of a distributed scrape.
+
+Each worker appends the questions of every page it scrapes to its own JSON
+Lines file, tagged with the token of its lease. Once the scrape is over, the
+journals of all workers are read back and only the entries of the lease that
+completed each page (see `scraper.work_queue`) are kept, so a page scraped
+twice after a crash is merged once.
+"""
+
+import os
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from loguru import logger
+
+from codec import json_codec
+from models import Question
+
+_UNSAFE_CHARS_RE = re.compile(r"[^\w.-]")
+
+
+@dataclass
+class JournalPage:
+    """The result of one page, as journaled by a worker.
+
+    Attributes:
+        page: The page number.
+        token: The lease under which the page was scraped.
+        url: The URL of the page.
+        questions: The questions of the page within the configured range.
+    """
+
+    page: int
+    token: str
+    url: str
+    questions: list[Question]
+
+
+class PageJournal:
+    """Append-only journal of the pages scraped by one worker."""
+
+    def __init__(self, path: Path) -> None:
+        """Opens (or creates) the journal in append mode.
+
+        Args:
+            path: Location of the journal file.
+        """
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")  # noqa: SIM115
+
+    @classmethod
+    def for_worker(cls, directory: Path, worker: str) -> "PageJournal":
+        """Opens the journal of a worker in the journal folder of a queue."""
+        return cls(directory / f"journal_{_UNSAFE_CHARS_RE.sub('_', worker)}.jsonl")
+
+    def append(self, page: JournalPage) -> None:
+        """Durably appends the result of a page (before the page is marked done in the queue)."""
+        record = {
+            "page": page.page,
+            "token": page.token,
+            "url": page.url,
+            "questions": [q.to_dict() for q in page.questions],
+        }
+        self._file.write(json_codec.dumps(record) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Closes the journal file."""
+        self._file.close()
+
+
+def iter_journal_pages(directory: Path, winners: dict[int, str]) -> Iterator[JournalPage]:
+    """Reads back the journals of all workers, keeping the winning entry of each page.
+
+    Args:
+        directory: The journal folder of the queue.
+        winners: Page number -> token of the lease that completed it (see `WorkQueue.done_tokens`).
+
+    Yields:
+        The journaled pages, in page order.
+    """
+    pages: dict[int, JournalPage] = {}
+    discarded = 0
+    for path in sorted(directory.glob("journal_*.jsonl")):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json_codec.loads(line)
+                except json_codec.JSONDecodeError:
+                    # A worker crashed mid-write: the page was not completed under this lease
+                    logger.warning(f"Ignoring truncated record in {path}")
+                    break
+                if winners.get(record["page"]) != record["token"]:
+                    discarded += 1
+                    continue
+                pages[record["page"]] = JournalPage(
+                    page=record["page"],
+                    token=record["token"],
+                    url=record["url"],
+                    questions=[Question.from_dict(item) for item in record["questions"]],
+                )
+
+    if discarded:
+        logger.info(f"Discarded {discarded} journaled pages superseded by another worker's result.")
+    missing = winners.keys() - pages.keys()
+    if missing:
+        logger.warning(f"No journal entry for {len(missing)} completed pages: {sorted(missing)[:10]}")
+    for page in sorted(pages):
+        yield pages[page]
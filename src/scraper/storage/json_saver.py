@@ -1,43 +1,43 @@
 """Handles file storage, backups, and data merging."""
 
-import json
-from dataclasses import asdict
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
 from loguru import logger
 
-from scraper.models.question import QuestionDTO
+from codec import json_codec
+from models import Question
 from scraper.storage.saver_interface import FileSaver
 
 
 class JsonSaver(FileSaver):
     """Concrete saver implementation for JSON format."""
 
-    def load_existing(self, filename: str) -> dict[str, QuestionDTO]:
+    def load_existing(self, filename: str) -> dict[str, Question]:
         """See base class docstring."""
         path = Path(filename)
         if not path.exists():
             return {}
 
         try:
-            with open(path, encoding="utf-8") as f:
-                data = json.load(f)
-                return {item["id"]: QuestionDTO(**item) for item in data}
-        except (json.JSONDecodeError, OSError):
+            data = json_codec.load_file(path)
+            return {item["id"]: Question.from_dict(item) for item in data}
+        except (json_codec.JSONDecodeError, OSError, EOFError):
             logger.warning(f"Could not load existing JSON from {filename}. Starting fresh.")
             return {}
 
-    def save(self, data_map: dict[str, QuestionDTO], filename: str) -> None:
+    def save(self, data_map: dict[str, Question], filename: str) -> None:
         """See base class docstring."""
-        # Convert map values to list of dicts
-        output = [asdict(q) for q in data_map.values()]
+        # Sort by question number to keep the file tidy, then convert to a list of dicts
+        output = [q.to_dict() for q in sorted(data_map.values(), key=lambda q: q.number)]
 
-        # Sort by ID (heuristic: extract number)
-        # We do a basic sort to keep the file tidy
-        try:
-            output.sort(key=lambda x: int(x["id"].split()[-1]) if " " in x["id"] else 0)
-        except (ValueError, IndexError):
-            pass
+        json_codec.dump_file(output, filename)
+
+    def iter_existing(self, filename: str) -> Iterator[Question]:
+        """See base class docstring."""
+        for item in json_codec.iter_array(filename):
+            yield Question.from_dict(item)
 
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(output, f, indent=4, ensure_ascii=False)
+    def save_stream(self, questions: Iterable[Question], filename: str) -> None:
+        """See base class docstring."""
+        json_codec.dump_array((q.to_dict() for q in questions), filename)
@@ -0,0 +1,43 @@
+"""Handles file storage, backups, and data merging."""
+
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from loguru import logger
+
+from codec import json_codec
+from models import Question
+from scraper.storage.saver_interface import FileSaver
+
+
+class JsonlSaver(FileSaver):
+    """Concrete saver implementation for JSON Lines format (one question per line).
+
+    Questions are decoded and encoded one line at a time, so large (and
+    compressed) banks are streamed instead of being held as a single document.
+    """
+
+    def load_existing(self, filename: str) -> dict[str, Question]:
+        """See base class docstring."""
+        path = Path(filename)
+        if not path.exists():
+            return {}
+
+        try:
+            return {q.id: q for q in self.iter_existing(filename)}
+        except (json_codec.JSONDecodeError, OSError, EOFError):
+            logger.warning(f"Could not load existing JSON Lines from {filename}. Starting fresh.")
+            return {}
+
+    def save(self, data_map: dict[str, Question], filename: str) -> None:
+        """See base class docstring."""
+        self.save_stream(data_map.values(), filename)
+
+    def iter_existing(self, filename: str) -> Iterator[Question]:
+        """See base class docstring."""
+        for item in json_codec.iter_lines(filename):
+            yield Question.from_dict(item)
+
+    def save_stream(self, questions: Iterable[Question], filename: str) -> None:
+        """See base class docstring."""
+        json_codec.dump_lines((q.to_dict() for q in questions), filename)
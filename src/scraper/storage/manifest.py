@@ -0,0 +1,77 @@
+"""Handles file storage, backups, and data merging."""
+
+from collections.abc import Iterable
+from pathlib import Path
+
+from loguru import logger
+
+from codec import json_codec
+
+MANIFEST_VERSION = 1
+
+
+def manifest_path_for(bank_path: str | Path) -> Path:
+    """Returns the sidecar manifest path of a question bank (e.g. 'exam.json.manifest.json')."""
+    bank_path = Path(bank_path)
+    return bank_path.with_name(f"{bank_path.name}.manifest.json")
+
+
+class PageManifest:
+    """Maps every scraped question ID to the URL of the page it was found on."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        """Initializes an empty manifest.
+
+        Args:
+            path: Sidecar file the manifest is saved to.
+        """
+        self.path = path
+        self.pages: dict[str, str] = {}
+        self._dirty = False
+
+    @classmethod
+    def for_bank(cls, bank_path: str | Path) -> "PageManifest":
+        """Loads the sidecar manifest of a question bank (empty if missing or unreadable).
+
+        Args:
+            bank_path: Path of the question bank.
+
+        Returns:
+            The loaded manifest.
+        """
+        manifest = cls(manifest_path_for(bank_path))
+        if not manifest.path.exists():
+            return manifest
+
+        try:
+            data = json_codec.load_file(manifest.path)
+        except (json_codec.JSONDecodeError, OSError):
+            logger.warning(f"Could not read page manifest {manifest.path}. Starting fresh.")
+            return manifest
+
+        if data.get("version") == MANIFEST_VERSION:
+            manifest.pages = data["pages"]
+        return manifest
+
+    def __len__(self) -> int:
+        """Returns the number of questions with a known page."""
+        return len(self.pages)
+
+    def record(self, url: str, question_ids: Iterable[str]) -> None:
+        """Remembers the page a batch of questions was extracted from.
+
+        Args:
+            url: The URL of the page.
+            question_ids: IDs of the questions found on it.
+        """
+        for q_id in question_ids:
+            if self.pages.get(q_id) != url:
+                self.pages[q_id] = url
+                self._dirty = True
+
+    def save(self) -> None:
+        """Writes the manifest to its sidecar file if it changed."""
+        if not self._dirty or self.path is None:
+            return
+        json_codec.dump_file({"version": MANIFEST_VERSION, "pages": self.pages}, self.path)
+        self._dirty = False
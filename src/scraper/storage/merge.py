@@ -0,0 +1,181 @@
+"""Streaming merge and conversion of scraper outputs.
+
+Every run writes a new timestamped file. This module combines any mix of them
+(JSON, JSON Lines, CSV, YAML, compressed or not) into one file of any
+supported format, with a k-way merge ordered by question number. When several
+files hold the same question, the one from the newest run wins.
+
+Memory stays bounded whatever the input size: files are read one question at
+a time, an input that is not already sorted is split into sorted runs spilled
+to temporary JSON Lines files (an external sort), and the output is written
+as the merge produces it.
+
+Usage:
+    uv run -m scraper.storage.merge output/exam_*.json -o output/exam_merged.json
+    uv run -m scraper.storage.merge output/exam.json -o output/exam.csv      # plain conversion
+"""
+
+import argparse
+import heapq
+import itertools
+import re
+import sys
+import tempfile
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from operator import itemgetter
+from pathlib import Path
+
+from loguru import logger
+
+from codec import json_codec
+from models import Question
+from scraper import config
+from scraper.storage.saver_factory import SaverFactory
+
+_RUN_TIMESTAMP_RE = re.compile(r"_(\d{8}_\d{6})")
+
+SortKey = tuple[int, str]
+
+
+def run_timestamp(path: Path) -> str:
+    """Returns when a file was produced (UTC): the run timestamp in its name, or else its modification time."""
+    matches = _RUN_TIMESTAMP_RE.findall(path.name)
+    if matches:
+        return matches[-1]
+    return datetime.fromtimestamp(path.stat().st_mtime, tz=UTC).strftime("%Y%m%d_%H%M%S")
+
+
+def sort_key(question: Question) -> SortKey:
+    """Orders questions by number, then ID (for IDs without a number)."""
+    return question.number, question.id
+
+
+def is_sorted(questions: Iterator[Question]) -> bool:
+    """Checks, in one streaming pass, whether questions come in `sort_key` order."""
+    previous = None
+    for question in questions:
+        key = sort_key(question)
+        if previous is not None and key < previous:
+            return False
+        previous = key
+    return True
+
+
+def _read_run(path: Path) -> Iterator[Question]:
+    """Streams back a run spilled by `sorted_runs`."""
+    for item in json_codec.iter_lines(path):
+        yield Question.from_dict(item)
+
+
+def _keyed(run: Iterator[Question], rank: int) -> Iterator[tuple[tuple[int, str, int], Question]]:
+    """Pairs each question of a run with its merge key: sort key, then recency rank of its file."""
+    for question in run:
+        yield (*sort_key(question), rank), question
+
+
+def sorted_runs(path: Path, spill_dir: Path, run_size: int) -> list[Iterator[Question]]:
+    """Splits an input file into streams of questions sorted by `sort_key`.
+
+    A sorted file (the usual case: the JSON saver sorts by number) is a single
+    run read straight from the file. Otherwise the file is read in chunks of
+    `run_size` questions, each sorted and spilled to a temporary file.
+
+    Args:
+        path: The input file.
+        spill_dir: Folder for the temporary runs.
+        run_size: Maximum number of questions held in memory while sorting.
+
+    Returns:
+        The sorted runs.
+    """
+    saver = SaverFactory.for_file(path)
+    if is_sorted(saver.iter_existing(str(path))):
+        return [saver.iter_existing(str(path))]
+
+    logger.info(f"{path.name} is not sorted by question number: sorting it in runs of {run_size}.")
+    runs = []
+    questions = saver.iter_existing(str(path))
+    file_dir = Path(tempfile.mkdtemp(dir=spill_dir))
+    while chunk := list(itertools.islice(questions, run_size)):
+        chunk.sort(key=sort_key)
+        run_path = file_dir / f"run_{len(runs)}.jsonl"
+        json_codec.dump_lines((q.to_dict() for q in chunk), run_path)
+        runs.append(_read_run(run_path))
+    return runs
+
+
+def merge_files(inputs: list[Path], output: Path, run_size: int = config.MERGE_RUN_SIZE) -> int:
+    """Merges question files into one, ordered by question number, the newest run winning on conflicts.
+
+    Args:
+        inputs: The files to merge (any supported format; a single file is simply converted).
+        output: The file to write; its extension picks the format.
+        run_size: Maximum number of questions held in memory when an input must be sorted.
+
+    Returns:
+        The number of questions written.
+
+    Raises:
+        ValueError: If the output is also one of the inputs.
+    """
+    if output.resolve() in {path.resolve() for path in inputs}:
+        raise ValueError(f"The output {output} cannot also be an input.")
+
+    # Rank 0 is the newest run: it sorts first among copies of the same question
+    by_recency = sorted(inputs, key=run_timestamp, reverse=True)
+    written = 0
+    replaced = 0
+
+    with tempfile.TemporaryDirectory(prefix="merge_") as spill_dir:
+        streams = []
+        for rank, path in enumerate(by_recency):
+            streams.extend(_keyed(run, rank) for run in sorted_runs(path, Path(spill_dir), run_size))
+        logger.info(f"Merging {len(inputs)} files ({len(streams)} sorted runs), newest first: {by_recency[0].name}")
+
+        def unique(merged: Iterator[tuple[tuple[int, str, int], Question]]) -> Iterator[Question]:
+            """Keeps the first (newest) copy of each question."""
+            nonlocal written, replaced
+            last_id = None
+            for (_, q_id, _), question in merged:
+                if q_id == last_id:
+                    replaced += 1
+                    continue
+                last_id = q_id
+                written += 1
+                yield question
+
+        merged = heapq.merge(*streams, key=itemgetter(0))
+        SaverFactory.for_file(output).save_stream(unique(merged), str(output))
+
+    logger.info(f"{replaced} older copies of questions were superseded by newer runs.")
+    return written
+
+
+def configure_logging() -> None:
+    """Configures Loguru for console output."""
+    logger.remove()
+    logger.add(sys.stderr, format="<green>{time:HH:mm:ss}</green> | <level>{message}</level>", level="INFO")
+
+
+def main() -> None:
+    """Main execution function."""
+    configure_logging()
+
+    parser = argparse.ArgumentParser(description="Merge and convert scraper outputs with bounded memory.")
+    parser.add_argument("files", nargs="+", type=Path, help="Files to merge (JSON, JSON Lines, CSV or YAML).")
+    parser.add_argument("-o", "--output", type=Path, required=True, help="File to write (format from extension).")
+    parser.add_argument("--run-size", type=int, default=config.MERGE_RUN_SIZE, help="Questions sorted in memory.")
+    args = parser.parse_args()
+
+    missing = [path for path in args.files if not path.exists()]
+    if missing:
+        logger.error(f"Input file not found: {', '.join(map(str, missing))}")
+        return
+
+    count = merge_files(args.files, args.output, run_size=args.run_size)
+    logger.success(f"Wrote {count} questions to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
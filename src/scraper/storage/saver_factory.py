@@ -1,9 +1,12 @@
 """Handles file storage, backups, and data merging."""
 
+from pathlib import Path
 from typing import Literal
 
+from codec.compression import split_suffix
 from scraper.storage.csv_saver import CsvSaver
 from scraper.storage.json_saver import JsonSaver
+from scraper.storage.jsonl_saver import JsonlSaver
 from scraper.storage.saver_interface import FileSaver
 from scraper.storage.yaml_saver import YamlSaver
 
@@ -12,19 +15,37 @@ class SaverFactory:
     """Factory to create file savers."""
 
     @staticmethod
-    def get_saver(format_type: Literal["json", "csv", "yaml"]) -> FileSaver:
+    def get_saver(format_type: Literal["json", "jsonl", "csv", "yaml"]) -> FileSaver:
         """Factory method to return a specific saver instance.
 
         Args:
-            format_type: The desired format ('json', 'csv', or 'yaml').
+            format_type: The desired format ('json', 'jsonl', 'csv', or 'yaml').
 
         Returns:
             An instance of a class inheriting from FileSaver.
         """
         if format_type == "json":
             return JsonSaver()
+        if format_type == "jsonl":
+            return JsonlSaver()
         if format_type == "csv":
             return CsvSaver()
         if format_type == "yaml":
             return YamlSaver()
         raise ValueError(f"Unsupported format: {format_type}")
+
+    @staticmethod
+    def for_file(filename: str | Path) -> FileSaver:
+        """Returns the saver matching a file's extension.
+
+        A compression extension ('.gz', '.bz2', '.xz', '.zst') may follow the
+        format one; the saver then streams through the matching (de)compressor.
+
+        Args:
+            filename: The path of the file (e.g. 'output/exam.json' or 'output/exam.jsonl.zst').
+
+        Returns:
+            An instance of a class inheriting from FileSaver.
+        """
+        format_type, _ = split_suffix(filename)
+        return SaverFactory.get_saver("yaml" if format_type == "yml" else format_type)
@@ -1,15 +1,24 @@
 """Handles file storage, backups, and data merging."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
 
-from scraper.models.question import QuestionDTO
+from models import Question
+from tracing import traced
 
 
 class FileSaver(ABC):
     """Abstract base class for file saving strategies."""
 
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        """Traces the `load_existing`, `save` and `save_stream` implementations of every saver."""
+        super().__init_subclass__(**kwargs)
+        for name in ("load_existing", "save", "save_stream"):
+            if name in vars(cls):
+                setattr(cls, name, traced(vars(cls)[name]))
+
     @abstractmethod
-    def load_existing(self, filename: str) -> dict[str, QuestionDTO]:
+    def load_existing(self, filename: str) -> dict[str, Question]:
         """Loads existing data from the file into a dictionary keyed by ID.
 
         Args:
@@ -20,10 +29,34 @@ class FileSaver(ABC):
         """
 
     @abstractmethod
-    def save(self, data_map: dict[str, QuestionDTO], filename: str) -> None:
+    def save(self, data_map: dict[str, Question], filename: str) -> None:
         """Saves the merged data map to the file.
 
         Args:
             data_map: The dictionary of all questions (existing + new).
             filename: The target file path.
         """
+
+    def iter_existing(self, filename: str) -> Iterator[Question]:
+        """Streams the questions of the file one at a time, in file order.
+
+        Savers override this to decode the file incrementally; the default loads it whole.
+
+        Args:
+            filename: The path to the file.
+
+        Yields:
+            Each question.
+        """
+        yield from self.load_existing(filename).values()
+
+    def save_stream(self, questions: Iterable[Question], filename: str) -> None:
+        """Writes questions as they come, in the given order, without holding them all.
+
+        Savers override this to encode one question at a time; the default collects them for `save`.
+
+        Args:
+            questions: The questions to write.
+            filename: The target file path.
+        """
+        self.save({q.id: q for q in questions}, filename)
@@ -1,31 +1,243 @@
 """Handles file storage, backups, and data merging."""
 
+import hashlib
+import os
+import re
 import shutil
-from datetime import datetime
+from datetime import UTC, datetime
 from pathlib import Path
 
 from loguru import logger
 
+from codec import json_codec
+from scraper import config
 
-def create_backup(filepath: str) -> None:
+BACKUP_DIR_NAME = "backups"
+OBJECTS_DIR_NAME = ".objects"
+# Snapshot name -> name of the stored object holding its content
+REFS_FILE_NAME = "refs.json"
+
+_SNAPSHOT_RE = re.compile(r"^backup_(?P<time>\d{8}_\d{6})(?:-(?P<counter>\d+))?_(?P<name>.+)$")
+
+
+def create_backup(
+    filepath: str,
+    keep_last: int = config.BACKUP_KEEP_LAST,
+    keep_daily: int = config.BACKUP_KEEP_DAILY,
+    keep_weekly: int = config.BACKUP_KEEP_WEEKLY,
+) -> Path | None:
     """Creates a timestamped backup of the existing file.
 
-    If the file exists, it copies it to a new filename with the format:
-    `backup_YYYYMMDD_HHMM_filename.ext`.
+    Backups live in a `backups/` folder next to the file, named
+    `backup_YYYYMMDD_HHMMSS_filename.ext`. Their content is stored once per
+    distinct version in `backups/.objects/` (keyed by hash) and every snapshot
+    is a hard link to it (a copy where links are not supported), so identical
+    backups cost no extra disk. Which object each snapshot holds is recorded
+    in `backups/.objects/refs.json`. Nothing is written if the file did not
+    change since the latest backup. Old snapshots are then pruned according
+    to the retention policy.
 
     Args:
         filepath: The path to the file to back up.
+        keep_last: Number of most recent snapshots always kept.
+        keep_daily: Number of past days for which the newest snapshot is kept.
+        keep_weekly: Number of past weeks for which the newest snapshot is kept.
+
+    Returns:
+        The path of the snapshot holding the current content, or None if there was nothing to back up.
     """
     path = Path(filepath)
     if not path.exists():
-        return
-
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M")
-    backup_name = f"backup_{timestamp}_{path.name}"
-    backup_path = path.parent / backup_name
+        return None
 
+    backup_dir = path.parent / BACKUP_DIR_NAME
+    objects_dir = backup_dir / OBJECTS_DIR_NAME
     try:
-        shutil.copy(path, backup_path)
+        obj = _store_object(path, objects_dir)
+
+        snapshots = list_backups(path)
+        refs = _load_refs(objects_dir, snapshots)
+        if snapshots and refs.get(snapshots[-1].name) == obj.name:
+            logger.info(f"Backup skipped, {path.name} is unchanged since {snapshots[-1].name}")
+            return snapshots[-1]
+
+        backup_path = _unique_snapshot_path(backup_dir, path.name)
+        _link_or_copy(obj, backup_path)
+        refs[backup_path.name] = obj.name
+        _save_refs(objects_dir, refs)
         logger.info(f"Backup created: {backup_path}")
+        prune_backups(path, keep_last=keep_last, keep_daily=keep_daily, keep_weekly=keep_weekly)
     except OSError as e:
         logger.error(f"Failed to create backup: {e}")
+        return None
+    return backup_path
+
+
+def list_backups(filepath: str | Path) -> list[Path]:
+    """Lists the snapshots of a file, oldest first.
+
+    Args:
+        filepath: The path of the backed-up file.
+
+    Returns:
+        The snapshot paths, sorted by creation time.
+    """
+    path = Path(filepath)
+    backup_dir = path.parent / BACKUP_DIR_NAME
+    if not backup_dir.exists():
+        return []
+
+    snapshots = []
+    for candidate in backup_dir.glob(f"backup_*_{path.name}"):
+        match = _SNAPSHOT_RE.match(candidate.name)
+        if match and match.group("name") == path.name:
+            snapshots.append(candidate)
+    return sorted(snapshots, key=_snapshot_order)
+
+
+def prune_backups(filepath: str | Path, keep_last: int, keep_daily: int, keep_weekly: int) -> list[Path]:
+    """Deletes the snapshots of a file that fall outside the retention policy.
+
+    A snapshot is kept if it is one of the `keep_last` newest, or the newest
+    of one of the `keep_daily` most recent days or `keep_weekly` most recent
+    ISO weeks that have snapshots. Stored contents no longer referenced by any
+    snapshot are removed afterwards.
+
+    Args:
+        filepath: The path of the backed-up file.
+        keep_last: Number of most recent snapshots always kept.
+        keep_daily: Number of past days for which the newest snapshot is kept.
+        keep_weekly: Number of past weeks for which the newest snapshot is kept.
+
+    Returns:
+        The deleted snapshot paths.
+    """
+    newest_first = list(reversed(list_backups(filepath)))
+    keep = set(newest_first[: max(keep_last, 0)])
+
+    for period_count, period_of in (
+        (keep_daily, lambda t: t.date()),
+        (keep_weekly, lambda t: t.isocalendar()[:2]),
+    ):
+        seen: set = set()
+        for snapshot in newest_first:
+            period = period_of(_snapshot_time(snapshot))
+            if period in seen:
+                continue
+            if len(seen) >= period_count:
+                break
+            seen.add(period)
+            keep.add(snapshot)
+
+    removed = [s for s in newest_first if s not in keep]
+    for snapshot in removed:
+        snapshot.unlink()
+    if removed:
+        logger.info(f"Pruned {len(removed)} old backups of {Path(filepath).name}")
+        _collect_garbage(Path(filepath).parent / BACKUP_DIR_NAME / OBJECTS_DIR_NAME)
+    return removed
+
+
+def _object_name(path: Path, suffixes: str) -> str:
+    """Returns the name of the stored object for a file's content: its hash, with the given suffixes."""
+    digest = hashlib.blake2b(digest_size=16)
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return f"{digest.hexdigest()}{suffixes}"
+
+
+def _store_object(path: Path, objects_dir: Path) -> Path:
+    """Copies a file into the content-addressed store (once per distinct content) and returns the stored copy."""
+    obj = objects_dir / _object_name(path, "".join(path.suffixes))
+    if not obj.exists():
+        objects_dir.mkdir(parents=True, exist_ok=True)
+        tmp = obj.with_name(f".{obj.name}.tmp")
+        shutil.copy2(path, tmp)
+        tmp.replace(obj)
+    return obj
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    """Hard-links `target` to `source`, falling back to a copy where links are not supported."""
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def _unique_snapshot_path(backup_dir: Path, name: str) -> Path:
+    """Returns a snapshot path for now that no earlier run has taken."""
+    timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+    candidate = backup_dir / f"backup_{timestamp}_{name}"
+    counter = 1
+    while candidate.exists():
+        candidate = backup_dir / f"backup_{timestamp}-{counter}_{name}"
+        counter += 1
+    return candidate
+
+
+def _snapshot_time(snapshot: Path) -> datetime:
+    """Parses the creation time (UTC) encoded in a snapshot name."""
+    match = _SNAPSHOT_RE.match(snapshot.name)
+    if not match:
+        return datetime.min.replace(tzinfo=UTC)
+    return datetime.strptime(match.group("time"), "%Y%m%d_%H%M%S").replace(tzinfo=UTC)
+
+
+def _snapshot_order(snapshot: Path) -> tuple[datetime, int]:
+    """Sorts snapshots by creation time, then by the counter of the ones made within the same second."""
+    match = _SNAPSHOT_RE.match(snapshot.name)
+    return _snapshot_time(snapshot), int(match.group("counter") or 0) if match else 0
+
+
+def _load_refs(objects_dir: Path, snapshots: list[Path]) -> dict[str, str]:
+    """Reads which object each snapshot holds, hashing the snapshots made before the references were recorded.
+
+    Args:
+        objects_dir: The content-addressed store.
+        snapshots: Snapshots of the backed-up file that must have a reference.
+
+    Returns:
+        Snapshot name -> object name, for every snapshot in the folder.
+    """
+    refs_path = objects_dir / REFS_FILE_NAME
+    refs: dict[str, str] = {}
+    if refs_path.exists():
+        try:
+            refs = json_codec.load_file(refs_path)
+        except (json_codec.JSONDecodeError, OSError):
+            logger.warning(f"Could not read {refs_path}. Rebuilding it from the snapshots.")
+
+    missing = [snapshot for snapshot in snapshots if snapshot.name not in refs]
+    for snapshot in missing:
+        match = _SNAPSHOT_RE.match(snapshot.name)
+        refs[snapshot.name] = _object_name(snapshot, "".join(Path(match.group("name")).suffixes))
+    if missing:
+        _save_refs(objects_dir, refs)
+    return refs
+
+
+def _save_refs(objects_dir: Path, refs: dict[str, str]) -> None:
+    """Atomically writes the snapshot references of the store."""
+    objects_dir.mkdir(parents=True, exist_ok=True)
+    tmp = objects_dir / f".{REFS_FILE_NAME}.tmp"
+    json_codec.dump_file(refs, tmp)
+    tmp.replace(objects_dir / REFS_FILE_NAME)
+
+
+def _collect_garbage(objects_dir: Path) -> None:
+    """Removes stored contents that no existing snapshot references anymore."""
+    if not objects_dir.exists():
+        return
+    backup_dir = objects_dir.parent
+    snapshots = [path for path in backup_dir.glob("backup_*") if _SNAPSHOT_RE.match(path.name)]
+    refs = _load_refs(objects_dir, snapshots)
+    # Forget the references of deleted snapshots (of any backed-up file sharing the folder)
+    refs = {name: obj for name, obj in refs.items() if (backup_dir / name).exists()}
+    _save_refs(objects_dir, refs)
+
+    referenced = set(refs.values())
+    for obj in objects_dir.iterdir():
+        if obj.is_file() and not obj.name.startswith(".") and obj.name != REFS_FILE_NAME and obj.name not in referenced:
+            obj.unlink()
@@ -1,18 +1,20 @@
 """Handles file storage, backups, and data merging."""
 
-from dataclasses import asdict
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
 import yaml
 
-from scraper.models.question import QuestionDTO
+from codec import yaml_codec
+from codec.compression import open_file
+from models import Question
 from scraper.storage.saver_interface import FileSaver
 
 
 class YamlSaver(FileSaver):
     """Concrete saver implementation for YAML format."""
 
-    def load_existing(self, filename: str) -> dict[str, QuestionDTO]:
+    def load_existing(self, filename: str) -> dict[str, Question]:
         """See base class docstring."""
         if yaml is None:
             return {}
@@ -22,17 +24,28 @@ class YamlSaver(FileSaver):
             return {}
 
         try:
-            with open(path, encoding="utf-8") as f:
-                data = yaml.safe_load(f) or []
-                return {item["id"]: QuestionDTO(**item) for item in data}
+            with open_file(path, "r") as f:
+                data = yaml_codec.load(f) or []
+                return {item["id"]: Question.from_dict(item) for item in data}
         except Exception:
             return {}
 
-    def save(self, data_map: dict[str, QuestionDTO], filename: str) -> None:
+    def save(self, data_map: dict[str, Question], filename: str) -> None:
         """See base class docstring."""
         if yaml is None:
             raise ImportError("PyYAML is not installed.")
 
-        output = [asdict(q) for q in data_map.values()]
-        with open(filename, "w", encoding="utf-8") as f:
-            yaml.dump(output, f, allow_unicode=True, default_flow_style=False)
+        output = [q.to_dict() for q in data_map.values()]
+        with open_file(filename, "w") as f:
+            yaml_codec.dump(output, f)
+
+    def iter_existing(self, filename: str) -> Iterator[Question]:
+        """See base class docstring."""
+        with open_file(filename, "r") as f:
+            for item in yaml_codec.iter_items(f):
+                yield Question.from_dict(item)
+
+    def save_stream(self, questions: Iterable[Question], filename: str) -> None:
+        """See base class docstring."""
+        with open_file(filename, "w") as f:
+            yaml_codec.dump_items((q.to_dict() for q in questions), f)
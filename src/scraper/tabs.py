@@ -0,0 +1,267 @@
+"""Multi-tab scraping inside a single browser session.
+
+WebDriver executes one command at a time, but the browser loads, renders and
+runs the pages of all its tabs concurrently. The scheduler therefore starts a
+navigation in every tab without waiting for it and then polls the tabs round
+robin, revealing and capturing each page as soon as it is ready. All tabs
+share the session's cookies, login and passed security checkpoint.
+"""
+
+import re
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+
+from loguru import logger
+
+from scraper.browser import ExamPage
+from scraper.capture import PageCapture
+
+_PAGE_URL_RE = re.compile(r"^(?P<base>.*/)(?P<page>\d+)/?$")
+
+# Seconds between two polling rounds when no tab made progress
+_POLL_INTERVAL = 0.1
+
+
+def page_url_base(start_url: str) -> tuple[str, int]:
+    """Splits the URL of the first page into the URL prefix of every page and the first page number.
+
+    Args:
+        start_url: URL of page 1; its last path segment must be the page number.
+
+    Returns:
+        The prefix (the URL of page n is the prefix followed by `first + n - 1`) and the first number.
+
+    Raises:
+        ValueError: If the page number cannot be found in `start_url`.
+    """
+    match = _PAGE_URL_RE.match(start_url)
+    if not match:
+        raise ValueError(f"Cannot derive page URLs from {start_url} (expected '.../<page number>').")
+    return match.group("base"), int(match.group("page"))
+
+
+# Marks the tab's current document, then starts loading the URL: the marker is gone once the new document replaced it
+NAVIGATE_SCRIPT = """
+window.__navToken = arguments[1];
+window.location.href = arguments[0];
+"""
+
+# Like READY_SCRIPT, but also whether the tab left the marked document for the given URL (if any)
+TAB_READY_SCRIPT = """
+const trim = (url) => url.replace(/\\/+$/, "");
+const navigated = window.__navToken === undefined && (!arguments[0] || trim(location.href) === trim(arguments[0]));
+return [navigated, navigated && document.getElementsByClassName("chakra-accordion").length > 0, document.title];
+"""
+
+
+@dataclass
+class _Tab:
+    """The state of one browser tab.
+
+    Attributes:
+        handle: The WebDriver window handle.
+        page_num: The page assigned to the tab (0 = idle).
+        url: The URL the tab was sent to ("" = the page was already open in it).
+        deadline: Time by which the page must have loaded.
+        reveal_until: Time at which revealed answers can be captured (0 = not revealed yet).
+    """
+
+    handle: str
+    page_num: int = 0
+    url: str = ""
+    deadline: float = 0.0
+    reveal_until: float = 0.0
+
+
+@dataclass
+class _Schedule:
+    """Which pages are left to hand out to the tabs.
+
+    Attributes:
+        next_page: The next page never assigned yet.
+        last_page: The last page of the exam, once known.
+        retry: Pages to load again (after a login wall or CAPTCHA).
+        retried: Pages already loaded a second time.
+    """
+
+    next_page: int = 1
+    last_page: int | None = None
+    retry: list[int] = field(default_factory=list)
+    retried: set[int] = field(default_factory=set)
+
+    def take(self) -> int:
+        """Returns the next page to load, or 0 if there is none left."""
+        if self.retry:
+            return self.retry.pop()
+        if self.last_page is not None and self.next_page > self.last_page:
+            return 0
+        self.next_page += 1
+        return self.next_page - 1
+
+    def end_at(self, page_num: int) -> None:
+        """Records that the exam ends at `page_num` (or earlier)."""
+        self.last_page = page_num if self.last_page is None else min(self.last_page, page_num)
+
+    def in_range(self, page_num: int) -> bool:
+        """Whether the page is not past the last page."""
+        return self.last_page is None or page_num <= self.last_page
+
+
+class TabScheduler:
+    """Hands out page URLs to several tabs of one browser and collects their captures."""
+
+    def __init__(self, page: ExamPage, tabs: int, page_delay: float = 0.0) -> None:
+        """Initializes the scheduler.
+
+        Args:
+            page: The page object wrapping the (already started) driver.
+            tabs: Number of tabs to drive concurrently.
+            page_delay: Minimum seconds between two navigations, across all tabs (politeness delay).
+        """
+        self.page = page
+        self.driver = page.driver
+        self.tabs = max(1, tabs)
+        self.page_delay = page_delay
+        self._last_navigation = 0.0
+
+    def iter_captures(
+        self,
+        start_url: str,
+        end_id: int | None = None,
+        on_empty_page: Callable[[int], None] | None = None,
+    ) -> Iterator[PageCapture]:
+        """Captures pages 1, 2, ... across the tabs until the last page or the end of the range.
+
+        Page 1 is expected to be loaded in the current tab already (see `ExamPage.load`).
+
+        Args:
+            start_url: URL of page 1; its last path segment must be the page number.
+            end_id: The maximum question number (inclusive); stops after the page that goes past it.
+            on_empty_page: Called with the page number when a page shows no questions (e.g. login wall).
+
+        Yields:
+            The capture of each page, in page order.
+
+        Raises:
+            ValueError: If the page number cannot be found in `start_url`.
+        """
+        base, first_page = page_url_base(start_url)
+        main_handle = self.page.handle
+        tabs = self._open_tabs(main_handle)
+        schedule = _Schedule()
+        ready: dict[int, PageCapture] = {}
+        next_yield = 1
+
+        def assign(tab: _Tab) -> None:
+            tab.page_num, tab.url, tab.reveal_until = schedule.take(), "", 0.0
+            tab.deadline = time.time() + ExamPage.LOAD_TIMEOUT
+            if tab.page_num > 1 or tab.page_num in schedule.retried:
+                # Page 1 is already open in the main tab
+                self._navigate(tab, f"{base}{first_page + tab.page_num - 1}")
+
+        try:
+            for tab in tabs:
+                assign(tab)
+
+            while any(tab.page_num for tab in tabs):
+                progressed = False
+                for tab in tabs:
+                    capture = self._poll(tab) if tab.page_num else None
+                    if capture is None:
+                        continue
+                    progressed = True
+                    ready[capture.page_num] = capture
+                    if (end_id is not None and capture.max_number() > end_id) or not capture.has_next:
+                        schedule.end_at(capture.page_num)
+                    assign(tab)
+
+                # Hand over the pages that are next in order; drop the ones beyond the last page
+                while next_yield in ready and schedule.in_range(next_yield):
+                    capture = ready.pop(next_yield)
+                    if capture.is_empty and next_yield not in schedule.retried:
+                        # The previous page had a 'Next' button, so this is a login wall or CAPTCHA: retry once
+                        self._on_empty_page(main_handle, next_yield, on_empty_page)
+                        schedule.retried.add(next_yield)
+                        schedule.retry.append(next_yield)
+                        break
+                    if capture.is_empty:
+                        schedule.end_at(next_yield)
+                    yield capture
+                    next_yield += 1
+
+                for tab in tabs:
+                    if not tab.page_num and schedule.retry:
+                        assign(tab)
+                if not progressed:
+                    time.sleep(_POLL_INTERVAL)
+
+            logger.info(f"No more pages to scrape (last page: {schedule.last_page}).")
+        finally:
+            self._close_tabs(tabs)
+
+    def _open_tabs(self, main_handle: str) -> list[_Tab]:
+        """Opens the extra tabs next to the main one and brings the main tab back to the front."""
+        tabs = [_Tab(handle=main_handle)]
+        for _ in range(self.tabs - 1):
+            self.driver.switch_to.new_window("tab")
+            tabs.append(_Tab(handle=self.driver.current_window_handle))
+        self.page.switch_to(main_handle, focus=True)
+        logger.info(f"Scraping with {len(tabs)} tabs.")
+        return tabs
+
+    def _close_tabs(self, tabs: list[_Tab]) -> None:
+        """Closes every tab but the main (first) one and switches back to it."""
+        for tab in tabs[1:]:
+            try:
+                self.page.switch_to(tab.handle)
+                self.page.webdriver.close()
+            except Exception as e:
+                logger.debug(f"Could not close tab: {e}")
+        self.page.switch_to(tabs[0].handle, focus=True)
+
+    def _on_empty_page(self, main_handle: str, page_num: int, on_empty_page: Callable[[int], None] | None) -> None:
+        """Brings the main tab to the front and lets the user deal with an empty page."""
+        if on_empty_page is not None:
+            self.page.switch_to(main_handle, focus=True)
+            on_empty_page(page_num)
+
+    def _navigate(self, tab: _Tab, url: str) -> None:
+        """Starts loading a URL in a tab without waiting for it."""
+        wait = self._last_navigation + self.page_delay - time.time()
+        if wait > 0:
+            time.sleep(wait)
+        self.page.switch_to(tab.handle)
+        logger.info(f"--- Processing Page {tab.page_num} --- ({url})")
+        tab.url = url
+        self.page.run_script(NAVIGATE_SCRIPT, url, tab.page_num)
+        self._last_navigation = time.time()
+
+    def _poll(self, tab: _Tab) -> PageCapture | None:
+        """Advances one tab: reveals its answers once loaded, then captures it once they show.
+
+        Returns:
+            The capture if the tab's page is done, None if it needs more time.
+        """
+        self.page.switch_to(tab.handle)
+        now = time.time()
+
+        if not tab.reveal_until:
+            navigated, ready, title = self.page.run_script(TAB_READY_SCRIPT, tab.url)
+            if not ready:
+                if "Security Checkpoint" in title:
+                    tab.deadline = max(tab.deadline, now + ExamPage.LOAD_TIMEOUT)
+                    return None
+                if now < tab.deadline:
+                    return None
+                logger.warning(f"Page {tab.page_num} did not load within {ExamPage.LOAD_TIMEOUT}s.")
+                if not navigated:
+                    # The tab still shows the previous page: capturing it would file its questions under this one
+                    return PageCapture(page_num=tab.page_num, url=tab.url)
+            tab.reveal_until = now + (ExamPage.REVEAL_WAIT if self.page.click_reveal_buttons() else 0.0)
+            return None
+
+        if now < tab.reveal_until:
+            return None
+
+        return self.page.capture(tab.page_num)
@@ -0,0 +1,454 @@
+"""Lease-based work queue for scraping one exam from several machines.
+
+There is no coordinator: every worker (one `scraper.main --worker` process
+with its own browser) claims pages from a shared queue, one at a time, under a
+time-limited lease. A worker whose Chrome crashes stops renewing its leases,
+so once they expire another worker reclaims the pages.
+
+Pages are numbered from 1 and handed out in order. The number of pages is not
+known upfront: the queue grows until a worker reports the last page (no
+'Next' button, or past the end of the range).
+
+A page is done once, whatever the timing: completing a page records the token
+of the lease that did it, only the first completion counts, and results are
+kept only for the winning token (see `scraper.storage.journal`). Leases only
+keep workers from duplicating work; they are not needed for correctness.
+
+Backends:
+
+- `SqliteWorkQueue`: a SQLite file on a shared disk with working file locks.
+- `LockDirWorkQueue`: a directory of lock files created with O_EXCL, which is
+  atomic on NFS too (where SQLite locking is unreliable).
+- `MemoryWorkQueue`: an in-process stand-in, for tests and threads.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from loguru import logger
+
+from codec import json_codec
+
+
+@dataclass(frozen=True)
+class Lease:
+    """A page claimed by a worker.
+
+    Attributes:
+        page: The page number (1-based).
+        token: Unique ID of this claim (a page reclaimed after a crash gets a new one).
+        expires: Time (epoch seconds) after which other workers may reclaim the page.
+    """
+
+    page: int
+    token: str
+    expires: float
+
+
+class WorkQueue(ABC):
+    """A queue of pages shared by the workers of a distributed scrape."""
+
+    def __init__(self, journal_dir: Path, lease_seconds: float = 120.0) -> None:
+        """Initializes the queue.
+
+        Args:
+            journal_dir: Folder of the per-worker result journals.
+            lease_seconds: Validity of a lease, renewed while the page is being scraped.
+        """
+        self.journal_dir = journal_dir
+        self.lease_seconds = lease_seconds
+
+    def _new_lease(self, page: int) -> Lease:
+        """Creates a lease on a page, valid from now."""
+        return Lease(page=page, token=uuid.uuid4().hex, expires=time.time() + self.lease_seconds)
+
+    @abstractmethod
+    def claim(self, worker: str) -> Lease | None:
+        """Claims the lowest page that is neither done nor under a valid lease.
+
+        Args:
+            worker: ID of the claiming worker (for logs).
+
+        Returns:
+            The lease, or None if no page is available right now (the others are leased or
+            the queue is finished, see `is_finished`).
+        """
+
+    @abstractmethod
+    def renew(self, lease: Lease) -> Lease | None:
+        """Extends a lease.
+
+        Returns:
+            The extended lease, or None if it was lost (expired and reclaimed, or the page is done).
+        """
+
+    @abstractmethod
+    def release(self, lease: Lease) -> None:
+        """Gives up a lease so the page can be claimed again right away (no-op if it was lost)."""
+
+    @abstractmethod
+    def complete(self, lease: Lease) -> bool:
+        """Marks the page of a lease as done.
+
+        Returns:
+            True if this lease did the page; False if another one completed it first.
+        """
+
+    @abstractmethod
+    def set_last_page(self, page: int) -> None:
+        """Records that no page comes after `page` (the lowest reported value wins)."""
+
+    @abstractmethod
+    def last_page(self) -> int | None:
+        """Returns the last page, if a worker reported it."""
+
+    @abstractmethod
+    def done_tokens(self) -> dict[int, str]:
+        """Returns the token of the lease that completed each done page."""
+
+    def is_finished(self) -> bool:
+        """Checks whether every page up to the last one is done."""
+        last = self.last_page()
+        if last is None:
+            return False
+        done = self.done_tokens()
+        return all(page in done for page in range(1, last + 1))
+
+
+class MemoryWorkQueue(WorkQueue):
+    """In-process queue, shared by threads (a stand-in for the shared backends)."""
+
+    def __init__(self, journal_dir: Path, lease_seconds: float = 120.0) -> None:
+        """Initializes an empty queue.
+
+        Args:
+            journal_dir: Folder of the per-worker result journals.
+            lease_seconds: Validity of a lease.
+        """
+        super().__init__(journal_dir, lease_seconds)
+        self._lock = threading.Lock()
+        self._leases: dict[int, Lease] = {}
+        self._done: dict[int, str] = {}
+        self._last_page: int | None = None
+
+    def claim(self, worker: str) -> Lease | None:
+        """Claims the lowest available page."""
+        with self._lock:
+            now = time.time()
+            page = next((p for p in sorted(self._leases) if self._leases[p].expires < now), len(self._leases) + 1)
+            if self._last_page is not None and page > self._last_page:
+                return None
+            if page in self._leases:
+                logger.info(f"Worker {worker} claims page {page} again (its lease expired or was released).")
+            lease = self._leases[page] = self._new_lease(page)
+            return lease
+
+    def renew(self, lease: Lease) -> Lease | None:
+        """Extends a lease still held."""
+        with self._lock:
+            if lease.page in self._done or self._leases.get(lease.page) != lease:
+                return None
+            renewed = self._leases[lease.page] = replace(lease, expires=time.time() + self.lease_seconds)
+            return renewed
+
+    def release(self, lease: Lease) -> None:
+        """Expires a lease still held."""
+        with self._lock:
+            if lease.page not in self._done and self._leases.get(lease.page) == lease:
+                self._leases[lease.page] = replace(lease, expires=0.0)
+
+    def complete(self, lease: Lease) -> bool:
+        """Marks a page as done, unless it already is."""
+        with self._lock:
+            if lease.page in self._done:
+                return False
+            self._done[lease.page] = lease.token
+            # A done page is never handed out again
+            self._leases[lease.page] = replace(lease, expires=float("inf"))
+            return True
+
+    def set_last_page(self, page: int) -> None:
+        """Lowers the last page."""
+        with self._lock:
+            self._last_page = page if self._last_page is None else min(self._last_page, page)
+
+    def last_page(self) -> int | None:
+        """Returns the last page."""
+        with self._lock:
+            return self._last_page
+
+    def done_tokens(self) -> dict[int, str]:
+        """Returns the winning token of every done page."""
+        with self._lock:
+            return dict(self._done)
+
+
+class SqliteWorkQueue(WorkQueue):
+    """Queue stored in a SQLite file shared by the workers.
+
+    Every claim is one write transaction, so the file must live on a disk whose
+    file locks work across the machines (not NFS: use `LockDirWorkQueue` there).
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS pages (
+            page INTEGER PRIMARY KEY,
+            worker TEXT NOT NULL,
+            token TEXT NOT NULL,
+            expires REAL NOT NULL,
+            done INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+    """
+
+    def __init__(self, path: Path, lease_seconds: float = 120.0) -> None:
+        """Opens (or creates) the queue file.
+
+        Args:
+            path: The SQLite file; the journals go to a '<name>.journals' folder next to it.
+            lease_seconds: Validity of a lease.
+        """
+        super().__init__(path.with_name(f"{path.name}.journals"), lease_seconds)
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        self._db = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self._db.executescript(self.SCHEMA)
+
+    def _transaction(self) -> sqlite3.Connection:
+        """Starts a write transaction (taking the file lock right away, so claims never deadlock)."""
+        self._db.execute("BEGIN IMMEDIATE")
+        return self._db
+
+    def claim(self, worker: str) -> Lease | None:
+        """Claims the lowest page with an expired lease, or else the next new page."""
+        db = self._transaction()
+        try:
+            row = db.execute(
+                "SELECT page FROM pages WHERE done = 0 AND expires < ? ORDER BY page LIMIT 1", (time.time(),)
+            ).fetchone()
+            page = row[0] if row else db.execute("SELECT COALESCE(MAX(page), 0) + 1 FROM pages").fetchone()[0]
+            last = self._last_page(db)
+            if last is not None and page > last:
+                db.execute("COMMIT")
+                return None
+            if row:
+                logger.info(f"Claiming page {page} again (its lease expired or was released).")
+            lease = self._new_lease(page)
+            db.execute(
+                "INSERT OR REPLACE INTO pages (page, worker, token, expires) VALUES (?, ?, ?, ?)",
+                (page, worker, lease.token, lease.expires),
+            )
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        else:
+            db.execute("COMMIT")
+            return lease
+
+    def renew(self, lease: Lease) -> Lease | None:
+        """Extends a lease still held."""
+        renewed = replace(lease, expires=time.time() + self.lease_seconds)
+        cursor = self._db.execute(
+            "UPDATE pages SET expires = ? WHERE page = ? AND token = ? AND done = 0",
+            (renewed.expires, lease.page, lease.token),
+        )
+        return renewed if cursor.rowcount else None
+
+    def release(self, lease: Lease) -> None:
+        """Expires a lease still held."""
+        self._db.execute(
+            "UPDATE pages SET expires = 0 WHERE page = ? AND token = ? AND done = 0", (lease.page, lease.token)
+        )
+
+    def complete(self, lease: Lease) -> bool:
+        """Marks a page as done, unless it already is (the winning token is stored with it)."""
+        cursor = self._db.execute(
+            "UPDATE pages SET done = 1, token = ? WHERE page = ? AND done = 0", (lease.token, lease.page)
+        )
+        return cursor.rowcount == 1
+
+    def set_last_page(self, page: int) -> None:
+        """Lowers the last page."""
+        self._db.execute(
+            "INSERT INTO meta (key, value) VALUES ('last_page', ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = MIN(value, excluded.value)",
+            (page,),
+        )
+
+    @staticmethod
+    def _last_page(db: sqlite3.Connection) -> int | None:
+        """Reads the last page."""
+        row = db.execute("SELECT value FROM meta WHERE key = 'last_page'").fetchone()
+        return row[0] if row else None
+
+    def last_page(self) -> int | None:
+        """Returns the last page."""
+        return self._last_page(self._db)
+
+    def done_tokens(self) -> dict[int, str]:
+        """Returns the winning token of every done page."""
+        return dict(self._db.execute("SELECT page, token FROM pages WHERE done = 1").fetchall())
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        self._db.close()
+
+
+class LockDirWorkQueue(WorkQueue):
+    """Queue stored as lock files in a directory shared by the workers.
+
+    - `page_<n>.lease`: the current lease of a page (its owner renews it by rewriting the file).
+    - `page_<n>.done`: created exclusively by the first worker completing the page, with its token.
+    - `last_<n>`: the last page, as reported by a worker.
+    """
+
+    def __init__(self, directory: Path, lease_seconds: float = 120.0) -> None:
+        """Opens (or creates) the queue directory.
+
+        Args:
+            directory: The shared directory; the journals go to its 'journals' subfolder.
+            lease_seconds: Validity of a lease.
+        """
+        super().__init__(directory / "journals", lease_seconds)
+        self.directory = directory
+        directory.mkdir(parents=True, exist_ok=True)
+        # Pages below the cursor are all done (pages are never undone)
+        self._cursor = 1
+
+    def _path(self, page: int, kind: str) -> Path:
+        """Returns the lease or done file of a page."""
+        return self.directory / f"page_{page:06d}.{kind}"
+
+    def _read(self, path: Path) -> dict | None:
+        """Reads a lock file (None if it is missing or being written)."""
+        try:
+            return json_codec.loads(path.read_bytes())
+        except (OSError, json_codec.JSONDecodeError):
+            return None
+
+    def _create(self, path: Path, content: dict) -> bool:
+        """Creates a lock file, unless it exists (atomic, also on NFS)."""
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "wb") as f:
+            f.write(json_codec.dump_bytes(content))
+        return True
+
+    def _expires(self, path: Path, content: dict | None) -> float:
+        """Returns when a lease file expires (a file left empty by a crashed worker expires with its age)."""
+        if content is not None:
+            return content["expires"]
+        try:
+            return path.stat().st_mtime + self.lease_seconds
+        except FileNotFoundError:
+            return 0.0
+
+    def _owns(self, lease: Lease) -> bool:
+        """Checks whether a lease is still the current one of its page."""
+        current = self._read(self._path(lease.page, "lease"))
+        return current is not None and current.get("token") == lease.token
+
+    def claim(self, worker: str) -> Lease | None:
+        """Claims the lowest page that is neither done nor under a valid lease."""
+        last = self.last_page()
+        page = self._cursor
+        while last is None or page <= last:
+            if self._path(page, "done").exists():
+                if page == self._cursor:
+                    self._cursor += 1
+                page += 1
+                continue
+
+            lease = self._new_lease(page)
+            content = {"worker": worker, "token": lease.token, "expires": lease.expires}
+            lease_path = self._path(page, "lease")
+            if self._create(lease_path, content):
+                return lease
+
+            if self._expires(lease_path, self._read(lease_path)) < time.time():
+                # Move the expired lease aside: only one of the workers racing for it succeeds
+                stale = lease_path.with_name(f"{lease_path.name}.{lease.token}")
+                try:
+                    lease_path.rename(stale)
+                except FileNotFoundError:
+                    page += 1
+                    continue
+                taken = self._read(stale)
+                expired = self._expires(stale, taken) < time.time()
+                stale.unlink(missing_ok=True)
+                if expired and self._create(lease_path, content):
+                    logger.info(f"Reclaimed page {page} from {(taken or {}).get('worker')} (lease expired).")
+                    return lease
+                # The lease was renewed meanwhile: its owner will notice the loss on its next renewal
+            page += 1
+        return None
+
+    def renew(self, lease: Lease) -> Lease | None:
+        """Extends a lease still held (rewrites its file atomically).
+
+        A reclaim racing with the renewal may still take the page over: the done file settles who did it.
+        """
+        if self._path(lease.page, "done").exists() or not self._owns(lease):
+            return None
+        lease_path = self._path(lease.page, "lease")
+        current = self._read(lease_path) or {}
+        renewed = replace(lease, expires=time.time() + self.lease_seconds)
+        temp = lease_path.with_name(f"{lease_path.name}.{lease.token}.tmp")
+        temp.write_bytes(json_codec.dump_bytes({**current, "expires": renewed.expires}))
+        temp.replace(lease_path)
+        return renewed
+
+    def release(self, lease: Lease) -> None:
+        """Removes a lease still held."""
+        if self._owns(lease):
+            self._path(lease.page, "lease").unlink(missing_ok=True)
+
+    def complete(self, lease: Lease) -> bool:
+        """Creates the done file of the page, unless another worker did first."""
+        if not self._create(self._path(lease.page, "done"), {"token": lease.token}):
+            return False
+        self.release(lease)
+        return True
+
+    def set_last_page(self, page: int) -> None:
+        """Records a last page (the lowest one reported wins)."""
+        self._create(self.directory / f"last_{page:06d}", {})
+
+    def last_page(self) -> int | None:
+        """Returns the lowest reported last page."""
+        pages = [int(path.name.removeprefix("last_")) for path in self.directory.glob("last_*")]
+        return min(pages, default=None)
+
+    def done_tokens(self) -> dict[int, str]:
+        """Returns the winning token of every done page."""
+        tokens = {}
+        for path in self.directory.glob("page_*.done"):
+            content = self._read(path)
+            if content is not None:
+                tokens[int(path.stem.removeprefix("page_"))] = content["token"]
+        return tokens
+
+
+def open_work_queue(location: str | Path, lease_seconds: float = 120.0) -> WorkQueue:
+    """Opens a shared queue: a SQLite file ('.db' / '.sqlite'), or else a lock-file directory.
+
+    Args:
+        location: Path of the queue on the shared disk.
+        lease_seconds: Validity of a lease.
+
+    Returns:
+        The queue.
+    """
+    path = Path(location)
+    if path.suffix in (".db", ".sqlite", ".sqlite3"):
+        return SqliteWorkQueue(path, lease_seconds)
+    return LockDirWorkQueue(path, lease_seconds)
@@ -0,0 +1,158 @@
+"""Worker of a distributed scrape.
+
+Each worker drives its own browser: it claims a page from the shared work
+queue, loads it by URL, captures and parses it, journals the questions and
+marks the page done, until the queue is finished. The journals of all workers
+are merged into the output file afterwards (`scraper.main --collect`).
+"""
+
+import time
+from collections.abc import Callable
+
+from loguru import logger
+from selenium.common.exceptions import TimeoutException
+
+from scraper.browser import ExamPage
+from scraper.capture import PageCapture, parse_capture
+from scraper.storage.journal import JournalPage, PageJournal
+from scraper.tabs import page_url_base
+from scraper.work_queue import Lease, WorkQueue
+
+# Seconds between two claims while the remaining pages are leased by other workers
+IDLE_POLL = 5.0
+
+
+class ScrapeWorker:
+    """Scrapes the pages it claims from a shared work queue."""
+
+    def __init__(
+        self,
+        page: ExamPage,
+        queue: WorkQueue,
+        worker_id: str,
+        start_url: str,
+        start_id: int | None = None,
+        end_id: int | None = None,
+        page_delay: float = 2.0,
+        on_empty_page: Callable[[int], None] | None = None,
+    ) -> None:
+        """Initializes the worker.
+
+        Args:
+            page: The page object wrapping this worker's browser.
+            queue: The shared work queue.
+            worker_id: Unique ID of the worker (names its journal).
+            start_url: URL of page 1; its last path segment must be the page number.
+            start_id: The minimum question number (inclusive).
+            end_id: The maximum question number (inclusive).
+            page_delay: Minimum seconds between two navigations of this worker (politeness delay).
+            on_empty_page: Called with the page number when a page shows no questions (e.g. login wall).
+
+        Raises:
+            ValueError: If the page number cannot be found in `start_url`.
+        """
+        self.page = page
+        self.queue = queue
+        self.worker_id = worker_id
+        self.base_url, self.first_page = page_url_base(start_url)
+        self.start_id = start_id
+        self.end_id = end_id
+        self.page_delay = page_delay
+        self.on_empty_page = on_empty_page
+        self.journal = PageJournal.for_worker(queue.journal_dir, worker_id)
+        self._last_navigation = 0.0
+
+    def run(self) -> int:
+        """Claims and scrapes pages until every page of the queue is done.
+
+        A page that fails to load in time, or shows no questions, is released for
+        another attempt: only a loaded page without a 'Next' button (or past the end
+        of the range) ends the scrape. If the browser itself fails, the page is
+        released and the error propagated: the worker cannot go on.
+
+        Returns:
+            The number of pages this worker completed.
+        """
+        completed = 0
+        try:
+            while True:
+                lease = self.queue.claim(self.worker_id)
+                if lease is None:
+                    if self.queue.is_finished():
+                        break
+                    time.sleep(IDLE_POLL)
+                    continue
+
+                try:
+                    completed += self._scrape(lease)
+                except TimeoutException as e:
+                    logger.warning(f"Page {lease.page} failed: {e} Releasing it for another attempt.")
+                    self.queue.release(lease)
+                except BaseException:
+                    self.queue.release(lease)
+                    raise
+        finally:
+            self.journal.close()
+
+        logger.info(f"Worker {self.worker_id} completed {completed} pages. The queue is finished.")
+        return completed
+
+    def _scrape(self, lease: Lease) -> int:
+        """Scrapes a claimed page and completes it.
+
+        Returns:
+            1 if this worker's result is the page's result, 0 otherwise.
+
+        Raises:
+            TimeoutException: If the page did not load in time.
+        """
+        url = f"{self.base_url}{self.first_page + lease.page - 1}"
+        wait = self._last_navigation + self.page_delay - time.time()
+        if wait > 0:
+            time.sleep(wait)
+        logger.info(f"--- Processing Page {lease.page} --- ({url})")
+        self._last_navigation = time.time()
+        self.page.load(url)
+
+        # Loading can take long (security checkpoint): make sure the page is still ours
+        renewed = self.queue.renew(lease)
+        if renewed is None:
+            logger.warning(f"Lost the lease on page {lease.page} while loading it. Moving on.")
+            return 0
+
+        capture = self._capture(renewed)
+        if capture.is_empty:
+            # Only a page that shows questions can tell where the exam ends
+            self.queue.release(renewed)
+            return 0
+
+        questions, limit_reached, _ = parse_capture(capture, self.start_id, self.end_id)
+        if limit_reached or not capture.has_next:
+            self.queue.set_last_page(lease.page)
+
+        self.journal.append(JournalPage(page=lease.page, token=lease.token, url=capture.url, questions=questions))
+        if not self.queue.complete(renewed):
+            logger.info(f"Page {lease.page} was completed by another worker first. Discarding this result.")
+            return 0
+        logger.info(f"Page {lease.page}: extracted {len(questions)} relevant questions.")
+        return 1
+
+    def _capture(self, lease: Lease) -> PageCapture:
+        """Reveals and captures the current page, pausing once for a login wall."""
+        self.page.reveal_all_answers()
+        capture = self.page.capture(lease.page)
+        if not capture.is_empty:
+            return capture
+
+        last = self.queue.last_page()
+        if last is not None and lease.page > last:
+            # Another worker found the end meanwhile: this page is past it
+            logger.info(f"Page {lease.page} is past the last page ({last}). Releasing it.")
+            return capture
+        if self.on_empty_page is not None:
+            self.on_empty_page(lease.page)
+            self.page.reveal_all_answers()
+            capture = self.page.capture(lease.page)
+        if capture.is_empty:
+            logger.warning(f"Page {lease.page} shows no questions. Releasing it for another attempt.")
+        return capture
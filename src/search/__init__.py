@@ -0,0 +1,3 @@
+from search.index import STOP_WORDS, SearchHit, SearchIndex, index_path_for, tokenize
+
+__all__ = ["STOP_WORDS", "SearchHit", "SearchIndex", "index_path_for", "tokenize"]
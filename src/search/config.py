@@ -0,0 +1,16 @@
+"""Configuration module for the Search package."""
+
+import os
+from pathlib import Path
+from typing import Final
+
+from dotenv import load_dotenv
+
+# Load .env file if present
+load_dotenv()
+
+# Default question bank searched when none is given (same file the Quiz App reads)
+DEFAULT_BANK: Final[Path] = Path(os.getenv("EXAM_QUESTIONS_FILE", "output/exam_results.json"))
+
+# Maximum number of results printed per query
+RESULT_LIMIT: Final[int] = int(os.getenv("SEARCH_RESULT_LIMIT", "20"))
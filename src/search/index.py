@@ -0,0 +1,274 @@
+"""Full-Text Search Index Module.
+
+An inverted index over question text and option values, ranked with BM25 and
+persisted as a sidecar file next to the question bank it covers.
+"""
+
+import bisect
+import hashlib
+import math
+import re
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from loguru import logger
+
+from codec import json_codec
+from models import Question
+
+INDEX_VERSION = 1
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOP_WORDS = frozenset(
+    {
+        "a",
+        "an",
+        "and",
+        "are",
+        "as",
+        "at",
+        "be",
+        "by",
+        "for",
+        "from",
+        "has",
+        "have",
+        "in",
+        "is",
+        "it",
+        "its",
+        "of",
+        "on",
+        "or",
+        "that",
+        "the",
+        "this",
+        "to",
+        "was",
+        "were",
+        "which",
+        "with",
+    }
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Splits text into lowercase alphanumeric tokens, dropping stop words.
+
+    Args:
+        text: The text to tokenize.
+
+    Returns:
+        The list of tokens, in order.
+    """
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOP_WORDS]
+
+
+def index_path_for(bank_path: str | Path) -> Path:
+    """Returns the sidecar index path of a question bank (e.g. 'exam.json.search.json')."""
+    bank_path = Path(bank_path)
+    return bank_path.with_name(f"{bank_path.name}.search.json")
+
+
+@dataclass
+class SearchHit:
+    """A question matching a query.
+
+    Attributes:
+        id: The question ID.
+        score: The BM25 relevance score (higher is better).
+    """
+
+    id: str
+    score: float
+
+
+class SearchIndex:
+    """BM25-ranked inverted index with prefix matching."""
+
+    # BM25 parameters
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, path: Path | None = None) -> None:
+        """Initializes an empty index.
+
+        Args:
+            path: Sidecar file the index is saved to.
+        """
+        self.path = path
+        self.postings: dict[str, dict[str, int]] = {}
+        self.doc_lengths: dict[str, int] = {}
+        self.doc_hashes: dict[str, str] = {}
+        self._total_length = 0
+        self._vocabulary: list[str] | None = None
+        self._norms: dict[str, float] | None = None
+        self._dirty = False
+
+    @classmethod
+    def for_bank(cls, bank_path: str | Path) -> "SearchIndex":
+        """Loads the sidecar index of a question bank (empty if missing or outdated).
+
+        Args:
+            bank_path: Path of the question bank.
+
+        Returns:
+            The loaded index.
+        """
+        index = cls(index_path_for(bank_path))
+        if not index.path.exists():
+            return index
+
+        try:
+            data = json_codec.load_file(index.path)
+        except (json_codec.JSONDecodeError, OSError):
+            logger.warning(f"Could not read search index {index.path}. Rebuilding.")
+            return index
+
+        if data.get("version") != INDEX_VERSION:
+            return index
+
+        index.postings = data["postings"]
+        index.doc_lengths = data["doc_lengths"]
+        index.doc_hashes = data["doc_hashes"]
+        index._total_length = sum(index.doc_lengths.values())
+        return index
+
+    def __len__(self) -> int:
+        """Returns the number of indexed questions."""
+        return len(self.doc_lengths)
+
+    def update(self, questions: Iterable[Question]) -> int:
+        """Brings the index in line with the given questions.
+
+        Only new or changed questions are (re)indexed; questions no longer
+        present are removed.
+
+        Args:
+            questions: The full current content of the bank.
+
+        Returns:
+            The number of questions added, changed or removed.
+        """
+        seen = set()
+        pending: list[tuple[str, str, str]] = []
+        for q in questions:
+            seen.add(q.id)
+            content = " ".join([q.text, *q.options.values()])
+            digest = hashlib.blake2b(content.encode(), digest_size=8).hexdigest()
+            if self.doc_hashes.get(q.id) != digest:
+                pending.append((q.id, content, digest))
+
+        stale = {doc_id for doc_id, _, _ in pending if doc_id in self.doc_lengths}
+        stale.update(d for d in self.doc_lengths if d not in seen)
+        self._remove(stale)
+        for doc_id, content, digest in pending:
+            self._add(doc_id, content, digest)
+
+        changed = len(pending) + len(stale - {doc_id for doc_id, _, _ in pending})
+        if changed:
+            self._vocabulary = None
+            self._norms = None
+            self._dirty = True
+        return changed
+
+    def save(self) -> None:
+        """Writes the index to its sidecar file if it changed."""
+        if not self._dirty or self.path is None:
+            return
+        json_codec.dump_file(
+            {
+                "version": INDEX_VERSION,
+                "postings": self.postings,
+                "doc_lengths": self.doc_lengths,
+                "doc_hashes": self.doc_hashes,
+            },
+            self.path,
+            pretty=False,
+        )
+        self._dirty = False
+
+    def search(self, query: str, limit: int | None = 20) -> list[SearchHit]:
+        """Finds the questions matching every query term, ranked by BM25.
+
+        Each query term also matches indexed terms it is a prefix of
+        ("spann" matches "spanner"); the best-scoring expansion counts.
+
+        Args:
+            query: Free-text query.
+            limit: Maximum number of hits to return (None = all).
+
+        Returns:
+            The matching questions, best first.
+        """
+        terms = tokenize(query)
+        if not terms or not self.doc_lengths:
+            return []
+
+        num_docs = len(self.doc_lengths)
+        if self._norms is None:
+            # Per-document length normalization, computed once per index revision
+            avg_length = self._total_length / num_docs or 1.0
+            self._norms = {
+                d: self.K1 * (1 - self.B + self.B * length / avg_length) for d, length in self.doc_lengths.items()
+            }
+        norms = self._norms
+        # Score the rarest term first so later terms only probe the surviving candidates
+        expansions = sorted(
+            ([self.postings[t] for t in self._expand(term)] for term in terms),
+            key=lambda lists: sum(len(p) for p in lists),
+        )
+        scores: dict[str, float] | None = None
+
+        for posting_lists in expansions:
+            term_scores: dict[str, float] = {}
+            for postings in posting_lists:
+                idf = math.log(1 + (num_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                docs = postings.items() if scores is None else ((d, postings[d]) for d in scores if d in postings)
+                for doc_id, tf in docs:
+                    score = idf * tf * (self.K1 + 1) / (tf + norms[doc_id])
+                    if score > term_scores.get(doc_id, 0.0):
+                        term_scores[doc_id] = score
+
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {d: s + term_scores[d] for d, s in scores.items() if d in term_scores}
+            if not scores:
+                return []
+
+        hits = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return [SearchHit(id=doc_id, score=score) for doc_id, score in hits[:limit]]
+
+    def _expand(self, term: str) -> list[str]:
+        """Returns the indexed terms starting with `term`."""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        start = bisect.bisect_left(self._vocabulary, term)
+        end = bisect.bisect_left(self._vocabulary, term + "\uffff", lo=start)
+        return self._vocabulary[start:end]
+
+    def _add(self, doc_id: str, content: str, digest: str) -> None:
+        """Indexes a single document."""
+        tokens = tokenize(content)
+        for term, tf in Counter(tokens).items():
+            self.postings.setdefault(term, {})[doc_id] = tf
+        self.doc_lengths[doc_id] = len(tokens)
+        self.doc_hashes[doc_id] = digest
+        self._total_length += len(tokens)
+
+    def _remove(self, doc_ids: set[str]) -> None:
+        """Removes documents in a single pass over the postings."""
+        if not doc_ids:
+            return
+        for doc_id in doc_ids:
+            self._total_length -= self.doc_lengths.pop(doc_id)
+            del self.doc_hashes[doc_id]
+        for term in list(self.postings):
+            docs = self.postings[term]
+            for doc_id in doc_ids.intersection(docs):
+                del docs[doc_id]
+            if not docs:
+                del self.postings[term]
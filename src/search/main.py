@@ -0,0 +1,89 @@
+"""Main entry point for the Search Application.
+
+Usage:
+    uv run -m search.main "cloud spanner"
+    uv run -m search.main snowpipe --bank output/snowpro.json --bank output/gcp.json
+    uv run -m search.main "cloud spanner" --quiz
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from loguru import logger
+from rich.console import Console
+
+from scraper.storage import SaverFactory
+from search import config
+from search.index import SearchIndex
+
+
+def configure_logging() -> None:
+    """Configures Loguru for console output."""
+    logger.remove()
+    logger.add(sys.stderr, format="<green>{time:HH:mm:ss}</green> | <level>{message}</level>", level="INFO")
+
+
+def open_index(bank: Path) -> SearchIndex:
+    """Loads the sidecar index of a bank, refreshing it if the bank changed since.
+
+    Args:
+        bank: Path of the question bank.
+
+    Returns:
+        The up-to-date index.
+    """
+    index = SearchIndex.for_bank(bank)
+    if index.path.exists() and index.path.stat().st_mtime_ns >= bank.stat().st_mtime_ns and len(index):
+        return index
+
+    questions = SaverFactory.for_file(bank).load_existing(str(bank))
+    changed = index.update(questions.values())
+    index.save()
+    logger.info(f"Indexed {bank.name}: {changed} questions updated, {len(index)} total.")
+    return index
+
+
+def main() -> None:
+    """Main execution function."""
+    configure_logging()
+
+    parser = argparse.ArgumentParser(description="Full-text search over scraped question banks.")
+    parser.add_argument("query", help="Search terms (every term must match; prefixes are allowed).")
+    parser.add_argument("--bank", type=Path, action="append", help="Question bank to search (repeatable).")
+    parser.add_argument("--limit", type=int, default=config.RESULT_LIMIT, help="Maximum results per bank.")
+    parser.add_argument("--quiz", action="store_true", help="Start a quiz restricted to the matching questions.")
+    args = parser.parse_args()
+
+    banks: list[Path] = args.bank or [config.DEFAULT_BANK]
+    if args.quiz and len(banks) != 1:
+        logger.error("--quiz needs exactly one --bank.")
+        return
+
+    console = Console()
+    for bank in banks:
+        if not bank.exists():
+            logger.error(f"Question bank not found: {bank}")
+            continue
+
+        index = open_index(bank)
+        start = time.perf_counter()
+        hits = index.search(args.query, limit=None if args.quiz else args.limit)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.info(f"{bank.name}: {len(hits)} matches for '{args.query}' ({elapsed_ms:.3f} ms)")
+
+        if args.quiz:
+            if not hits:
+                return
+            from quiz_app.main import main as run_quiz
+
+            run_quiz(filepath=bank, question_ids=[hit.id for hit in hits])
+            return
+
+        for hit in hits:
+            console.print(f"{hit.score:7.2f}  {hit.id}", markup=False, highlight=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+from topics.index import TopicIndex, topic_index_path_for
+
+__all__ = ["TopicIndex", "topic_index_path_for"]
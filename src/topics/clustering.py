@@ -0,0 +1,196 @@
+"""Topic Clustering Module.
+
+Builds a sparse TF-IDF matrix over questions and clusters it with spherical
+k-means. Every step is a vectorized NumPy operation over the non-zero entries;
+there are no per-document or per-pair Python loops.
+"""
+
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from search.index import tokenize
+
+
+@dataclass
+class SparseMatrix:
+    """A matrix in compressed sparse row (CSR) layout.
+
+    Attributes:
+        indptr: Row `i` spans `indices[indptr[i]:indptr[i + 1]]`.
+        indices: Column index of each non-zero entry.
+        data: Value of each non-zero entry.
+        shape: (rows, columns).
+    """
+
+    indptr: np.ndarray
+    indices: np.ndarray
+    data: np.ndarray
+    shape: tuple[int, int]
+
+    # Approximate size (in floats) of the intermediate products computed at once by dot_dense
+    BLOCK_ENTRIES = 1 << 20
+
+    @property
+    def row_ids(self) -> np.ndarray:
+        """Row index of each non-zero entry."""
+        return np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    def dot_dense(self, dense: np.ndarray) -> np.ndarray:
+        """Computes `self @ dense.T` for a dense (k x columns) matrix.
+
+        Args:
+            dense: Dense matrix sharing the column space of this one.
+
+        Returns:
+            A dense (rows x k) matrix.
+        """
+        result = np.zeros((self.shape[0], dense.shape[0]))
+        dense_t = dense.T
+        non_empty = np.flatnonzero(np.diff(self.indptr))
+
+        # Work in row blocks so the (non-zeros x k) intermediate stays a few MB
+        per_row = max(1, len(self.data) // max(1, len(non_empty)))
+        block = max(1, self.BLOCK_ENTRIES // (per_row * max(1, dense.shape[0])))
+        start = 0
+        while start < len(non_empty):
+            rows = non_empty[start : start + block]
+            lo, hi = self.indptr[rows[0]], self.indptr[rows[-1] + 1]
+            contributions = self.data[lo:hi, None] * dense_t[self.indices[lo:hi]]
+            # Rows are contiguous in CSR, so a segmented sum over non-empty rows does the reduction
+            result[rows] = np.add.reduceat(contributions, self.indptr[rows] - lo, axis=0)
+            start += block
+        return result
+
+    def row_dense(self, row: int) -> np.ndarray:
+        """Returns a single row as a dense vector."""
+        vector = np.zeros(self.shape[1])
+        start, end = self.indptr[row], self.indptr[row + 1]
+        vector[self.indices[start:end]] = self.data[start:end]
+        return vector
+
+
+@dataclass
+class TopicModel:
+    """Outcome of clustering a question bank.
+
+    Attributes:
+        labels: Cluster index assigned to each document, in input order.
+        top_terms: The most representative terms of each cluster.
+        sizes: Number of documents in each cluster.
+    """
+
+    labels: np.ndarray
+    top_terms: list[list[str]]
+    sizes: list[int]
+
+
+def build_tfidf(documents: Sequence[str], min_df: int = 2, max_df_ratio: float = 0.5) -> tuple[SparseMatrix, list[str]]:
+    """Builds an L2-normalized TF-IDF matrix.
+
+    Terms appearing in fewer than `min_df` documents or in more than
+    `max_df_ratio` of them carry little topical signal and are dropped.
+
+    Args:
+        documents: The texts to vectorize.
+        min_df: Minimum document frequency of a kept term.
+        max_df_ratio: Maximum document frequency (as a share of documents) of a kept term.
+
+    Returns:
+        The (documents x terms) matrix and the vocabulary of its columns.
+    """
+    vocabulary: dict[str, int] = {}
+    term_ids: list[int] = []
+    row_lengths: list[int] = []
+    for doc in documents:
+        tokens = [t for t in tokenize(doc) if not t.isdigit()]
+        term_ids.extend(vocabulary.setdefault(t, len(vocabulary)) for t in tokens)
+        row_lengths.append(len(tokens))
+
+    num_docs, num_terms = len(documents), len(vocabulary)
+    rows = np.repeat(np.arange(num_docs), row_lengths)
+    cols = np.asarray(term_ids, dtype=np.int64)
+
+    # Term counts per (row, column) pair; keys come out sorted by row, then column
+    keys, counts = np.unique(rows * num_terms + cols, return_counts=True)
+    rows, cols = keys // max(num_terms, 1), keys % max(num_terms, 1)
+
+    df = np.bincount(cols, minlength=num_terms)
+    keep_terms = (df >= min_df) & (df <= max(min_df, max_df_ratio * num_docs))
+    keep = keep_terms[cols]
+    rows, cols, counts = rows[keep], cols[keep], counts[keep]
+
+    # Re-number the surviving columns densely
+    remap = np.cumsum(keep_terms) - 1
+    cols = remap[cols]
+    terms = np.array(list(vocabulary))[keep_terms].tolist()
+
+    idf = np.log((1 + num_docs) / (1 + df[keep_terms])) + 1
+    data = (1 + np.log(counts)) * idf[cols]
+
+    norms = np.sqrt(np.bincount(rows, weights=data**2, minlength=num_docs))
+    data = data / np.where(norms == 0, 1, norms)[rows]
+
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=num_docs))])
+    return SparseMatrix(indptr=indptr, indices=cols, data=data, shape=(num_docs, len(terms))), terms
+
+
+def default_topic_count(num_docs: int) -> int:
+    """Heuristic number of topics for a bank of `num_docs` questions."""
+    return max(2, min(40, round(math.sqrt(num_docs / 2))))
+
+
+def cluster(
+    matrix: SparseMatrix, terms: list[str], k: int, iterations: int = 30, top_n: int = 3, seed: int = 0
+) -> TopicModel:
+    """Clusters the rows of a normalized TF-IDF matrix with spherical k-means.
+
+    Args:
+        matrix: The L2-normalized TF-IDF matrix.
+        terms: The vocabulary of the matrix columns.
+        k: Number of clusters.
+        iterations: Maximum number of k-means iterations.
+        top_n: Number of representative terms kept per cluster.
+        seed: Random seed, for reproducible topics.
+
+    Returns:
+        The cluster assignments and their representative terms.
+    """
+    num_docs, num_terms = matrix.shape
+    k = max(1, min(k, num_docs))
+    rng = np.random.default_rng(seed)
+    row_ids = matrix.row_ids
+
+    def centroids_of(labels: np.ndarray) -> np.ndarray:
+        flat = labels[row_ids] * num_terms + matrix.indices
+        centroids = np.bincount(flat, weights=matrix.data, minlength=k * num_terms).reshape(k, num_terms)
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        return centroids / np.where(norms == 0, 1, norms)
+
+    # k-means++ seeding: each new seed is drawn proportionally to its distance to the closest seed
+    seeds = [int(rng.integers(num_docs))]
+    best_similarity = np.full(num_docs, -np.inf)
+    for _ in range(1, k):
+        seed_vector = matrix.row_dense(seeds[-1])[None, :]
+        best_similarity = np.maximum(best_similarity, matrix.dot_dense(seed_vector)[:, 0])
+        weights = np.clip(1 - best_similarity, 0, None)
+        weights[seeds] = 0
+        total = weights.sum()
+        seeds.append(int(rng.choice(num_docs, p=weights / total)) if total > 0 else int(rng.integers(num_docs)))
+
+    labels = np.full(num_docs, -1)
+    centroids = np.stack([matrix.row_dense(doc) for doc in seeds])
+
+    for _ in range(iterations):
+        new_labels = np.argmax(matrix.dot_dense(centroids), axis=1)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        centroids = centroids_of(labels)
+
+    top = np.argsort(-centroids, axis=1)[:, :top_n]
+    top_terms = [[terms[i] for i in row if centroids[c, i] > 0] for c, row in enumerate(top)]
+    sizes = np.bincount(labels, minlength=k).tolist()
+    return TopicModel(labels=labels, top_terms=top_terms, sizes=sizes)
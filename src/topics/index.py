@@ -0,0 +1,133 @@
+"""Topic Index Module.
+
+Persists topic labels as a sidecar file next to the question bank, keyed by
+question ID, and resolves topic filters against it.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from loguru import logger
+
+from codec import json_codec
+from models import Question
+
+INDEX_VERSION = 1
+
+
+def topic_index_path_for(bank_path: str | Path) -> Path:
+    """Returns the sidecar topic index path of a question bank (e.g. 'exam.json.topics.json')."""
+    bank_path = Path(bank_path)
+    return bank_path.with_name(f"{bank_path.name}.topics.json")
+
+
+@dataclass
+class TopicIndex:
+    """Topic labels of a question bank.
+
+    Attributes:
+        topics: Maps each topic label to its representative terms.
+        assignments: Maps each question ID to its topic label.
+    """
+
+    topics: dict[str, list[str]] = field(default_factory=dict)
+    assignments: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, questions: Iterable[Question], k: int | None = None) -> "TopicIndex":
+        """Clusters the questions and labels each topic with its top terms.
+
+        Args:
+            questions: The questions to cluster.
+            k: Number of topics (a size-based heuristic when None).
+
+        Returns:
+            The new topic index.
+        """
+        questions = list(questions)
+        if not questions:
+            return cls()
+
+        # Imported lazily so that loading an existing index does not pull in NumPy
+        from topics.clustering import build_tfidf, cluster, default_topic_count
+
+        documents = [" ".join([q.text, *q.options.values()]) for q in questions]
+        matrix, terms = build_tfidf(documents)
+        model = cluster(matrix, terms, k or default_topic_count(len(questions)))
+
+        labels = []
+        for cluster_id, top_terms in enumerate(model.top_terms):
+            label = "/".join(top_terms) or f"topic-{cluster_id + 1}"
+            # Keep labels unique even if two clusters share their top terms
+            labels.append(label if label not in labels else f"{label}-{cluster_id + 1}")
+
+        index = cls()
+        for cluster_id, top_terms in enumerate(model.top_terms):
+            if model.sizes[cluster_id]:
+                index.topics[labels[cluster_id]] = top_terms
+        index.assignments = {q.id: labels[label] for q, label in zip(questions, model.labels.tolist(), strict=True)}
+        return index
+
+    @classmethod
+    def load(cls, bank_path: str | Path) -> "TopicIndex":
+        """Loads the sidecar topic index of a bank (empty if missing or outdated).
+
+        Args:
+            bank_path: Path of the question bank.
+
+        Returns:
+            The loaded topic index.
+        """
+        path = topic_index_path_for(bank_path)
+        if not path.exists():
+            return cls()
+        try:
+            data = json_codec.load_file(path)
+        except (json_codec.JSONDecodeError, OSError):
+            logger.warning(f"Could not read topic index {path}.")
+            return cls()
+        if data.get("version") != INDEX_VERSION:
+            return cls()
+        return cls(topics=data["topics"], assignments=data["assignments"])
+
+    def save(self, bank_path: str | Path) -> Path:
+        """Writes the topic index next to the bank.
+
+        Args:
+            bank_path: Path of the question bank.
+
+        Returns:
+            The path of the sidecar file.
+        """
+        path = topic_index_path_for(bank_path)
+        json_codec.dump_file(
+            {"version": INDEX_VERSION, "topics": self.topics, "assignments": self.assignments}, path, pretty=True
+        )
+        return path
+
+    def match_topics(self, queries: Iterable[str]) -> set[str]:
+        """Resolves topic filters to topic labels.
+
+        A query matches a topic if it equals its label or is a prefix of one
+        of its terms ("network" matches "networking/vpc/firewall").
+
+        Args:
+            queries: The requested topics.
+
+        Returns:
+            The matching topic labels.
+        """
+        matched = set()
+        for query in (q.strip().lower() for q in queries):
+            if not query:
+                continue
+            for label, terms in self.topics.items():
+                if query == label or any(term.startswith(query) for term in terms):
+                    matched.add(label)
+        return matched
+
+    def question_ids(self, queries: Iterable[str]) -> set[str]:
+        """Returns the IDs of the questions belonging to the requested topics."""
+        labels = self.match_topics(queries)
+        return {qid for qid, label in self.assignments.items() if label in labels}
@@ -0,0 +1,64 @@
+"""Main entry point for the Topic Clustering batch stage.
+
+Usage:
+    uv run -m topics.main
+    uv run -m topics.main --bank output/gcp.json --topics 12
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+from loguru import logger
+from rich.console import Console
+
+from scraper.storage import SaverFactory
+from topics.index import TopicIndex
+
+
+def configure_logging() -> None:
+    """Configures Loguru for console output."""
+    logger.remove()
+    logger.add(sys.stderr, format="<green>{time:HH:mm:ss}</green> | <level>{message}</level>", level="INFO")
+
+
+def main() -> None:
+    """Main execution function."""
+    configure_logging()
+
+    parser = argparse.ArgumentParser(description="Cluster a question bank into topics.")
+    parser.add_argument(
+        "--bank",
+        type=Path,
+        default=Path(os.getenv("EXAM_QUESTIONS_FILE", "output/exam_results.json")),
+        help="Question bank to cluster.",
+    )
+    parser.add_argument("--topics", type=int, default=None, help="Number of topics (default: based on bank size).")
+    args = parser.parse_args()
+
+    if not args.bank.exists():
+        logger.critical(f"Question bank not found: {args.bank}")
+        return
+
+    questions = SaverFactory.for_file(args.bank).load_existing(str(args.bank))
+    logger.info(f"Loaded {len(questions)} questions from {args.bank.name}")
+
+    start = time.perf_counter()
+    index = TopicIndex.build(questions.values(), k=args.topics)
+    logger.info(f"Clustered into {len(index.topics)} topics in {time.perf_counter() - start:.2f}s")
+
+    counts: dict[str, int] = {}
+    for label in index.assignments.values():
+        counts[label] = counts.get(label, 0) + 1
+    console = Console()
+    for label in sorted(index.topics, key=lambda lbl: -counts.get(lbl, 0)):
+        console.print(f"{counts.get(label, 0):5d}  {label}", markup=False, highlight=False)
+
+    path = index.save(args.bank)
+    logger.success(f"Topic index saved to: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+from tracing.profiler import PROFILE_MODES, SamplingProfiler, add_profile_argument, profile_run
+from tracing.spans import Tracer, span, start_tracing, stop_tracing, traced, traced_methods
+
+__all__ = [
+    "PROFILE_MODES",
+    "SamplingProfiler",
+    "Tracer",
+    "add_profile_argument",
+    "profile_run",
+    "span",
+    "start_tracing",
+    "stop_tracing",
+    "traced",
+    "traced_methods",
+]
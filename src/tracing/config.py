@@ -0,0 +1,18 @@
+"""Configuration module for the Tracing package."""
+
+import os
+from pathlib import Path
+from typing import Final
+
+from dotenv import load_dotenv
+
+# Load .env file if present
+load_dotenv()
+
+BASE_DIR: Final[Path] = Path(__file__).resolve().parent.parent.parent
+
+# Where `--profile` writes its profiles and traces
+PROFILE_DIR: Final[Path] = Path(os.getenv("PROFILE_DIR", str(BASE_DIR / "logs" / "profiles")))
+
+# Milliseconds between two stack samples of the sampling profiler
+SAMPLE_INTERVAL_MS: Final[float] = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
@@ -0,0 +1,136 @@
+"""`--profile` support for the entry points.
+
+A profiled run writes, under PROFILE_DIR:
+
+- `<app>_<timestamp>.trace.json`: the tracing spans (Chrome trace-event JSON).
+- `<app>_<timestamp>.prof` with `--profile cprofile`: deterministic cProfile
+  statistics of the main thread (`python -m pstats`, snakeviz, ...).
+- `<app>_<timestamp>.folded` with `--profile sample`: stack samples of every
+  thread in the folded format read by flamegraph.pl and speedscope. Sampling
+  adds no per-call overhead, so timings stay realistic.
+"""
+
+import argparse
+import cProfile
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from loguru import logger
+
+from tracing import config
+from tracing.spans import start_tracing, stop_tracing
+
+PROFILE_MODES = ("cprofile", "sample")
+
+
+class SamplingProfiler:
+    """Periodically records the call stack of every thread from a background thread."""
+
+    def __init__(self, interval_ms: float = 5.0) -> None:
+        """Initializes the profiler.
+
+        Args:
+            interval_ms: Milliseconds between two samples.
+        """
+        self.interval = interval_ms / 1000
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def enable(self) -> None:
+        """Starts sampling."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def disable(self) -> None:
+        """Stops sampling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        """Samples until stopped."""
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, top in sys._current_frames().items():  # noqa: SLF001
+                if thread_id == own_id:
+                    continue
+                stack = []
+                frame = top
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_qualname} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def save(self, path: Path) -> None:
+        """Writes the samples in the folded stack format ('frame;frame;frame count' per line).
+
+        Args:
+            path: The target file.
+        """
+        with path.open("w", encoding="utf-8") as f:
+            f.writelines(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def add_profile_argument(parser: argparse.ArgumentParser) -> None:
+    """Adds the `--profile [cprofile|sample]` option to an entry point's parser.
+
+    Args:
+        parser: The argument parser.
+    """
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cprofile",
+        choices=PROFILE_MODES,
+        help="Profile the run and record tracing spans (default profiler: cprofile).",
+    )
+
+
+@contextmanager
+def profile_run(app: str, mode: str | None) -> Iterator[None]:
+    """Profiles and traces the enclosed block when a mode is given.
+
+    Args:
+        app: Name of the entry point, used in the output file names.
+        mode: 'cprofile', 'sample', or None to run without profiling.
+    """
+    if mode is None:
+        yield
+        return
+
+    config.PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    stem = config.PROFILE_DIR / f"{app}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    profiler = cProfile.Profile() if mode == "cprofile" else SamplingProfiler(config.SAMPLE_INTERVAL_MS)
+
+    tracer = start_tracing()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        stop_tracing()
+        elapsed = time.perf_counter() - start
+
+        trace_path = stem.with_suffix(".trace.json")
+        tracer.save(trace_path)
+        if isinstance(profiler, cProfile.Profile):
+            profile_path = stem.with_suffix(".prof")
+            profiler.dump_stats(profile_path)
+        else:
+            profile_path = stem.with_suffix(".folded")
+            profiler.save(profile_path)
+        logger.info(
+            f"Profiled {elapsed:.1f}s: {profile_path} (profile), {trace_path} ({len(tracer.events)} trace events)"
+        )
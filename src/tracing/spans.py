@@ -0,0 +1,205 @@
+"""Lightweight tracing spans, exported as Chrome trace events.
+
+Spans are only recorded while a tracer is active (see `start_tracing`). When
+none is, `span` returns a shared no-op object and `traced` functions call
+straight through after a single global check, so instrumentation can stay in
+place permanently.
+
+The saved file follows the Chrome trace-event format and opens in
+`chrome://tracing` or https://ui.perfetto.dev.
+"""
+
+import functools
+import inspect
+import os
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Self, TypeVar
+
+from codec import json_codec
+
+T = TypeVar("T")
+
+_tracer: "Tracer | None" = None
+
+
+class Tracer:
+    """Collects completed spans as trace events."""
+
+    def __init__(self) -> None:
+        """Initializes an empty trace whose clock starts now."""
+        self.events: list[dict[str, Any]] = []
+        self._origin_ns = time.perf_counter_ns()
+        self._pid = os.getpid()
+        self._threads: set[int] = set()
+
+    def add(self, name: str, category: str, start_ns: int, end_ns: int, args: dict[str, Any] | None = None) -> None:
+        """Records a completed span of the calling thread.
+
+        Args:
+            name: The span name.
+            category: The span category (shown as a filter in trace viewers).
+            start_ns: Start time, from `time.perf_counter_ns()`.
+            end_ns: End time, from `time.perf_counter_ns()`.
+            args: Optional details shown with the span.
+        """
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads.add(tid)
+            self.events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": self._pid,
+                    "tid": tid,
+                    "args": {"name": threading.current_thread().name},
+                }
+            )
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start_ns - self._origin_ns) / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": self._pid,
+            "tid": tid,
+        }
+        if args:
+            event["args"] = args
+        # list.append is atomic, so threads can record concurrently
+        self.events.append(event)
+
+    def save(self, path: Path) -> None:
+        """Writes the trace as Chrome trace-event JSON.
+
+        Args:
+            path: The target file.
+        """
+        json_codec.dump_file({"traceEvents": self.events, "displayTimeUnit": "ms"}, path, pretty=False)
+
+
+class _Span:
+    """Times a block and records it into the tracer on exit."""
+
+    __slots__ = ("_start_ns", "args", "category", "name", "tracer")
+
+    def __init__(self, tracer: Tracer, name: str, category: str, args: dict[str, Any]) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self._start_ns = 0
+
+    def __enter__(self) -> Self:
+        """Starts the clock."""
+        self._start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """Records the span, even if the block raised."""
+        self.tracer.add(self.name, self.category, self._start_ns, time.perf_counter_ns(), self.args)
+
+
+class _NoSpan:
+    """Stands in for a span when tracing is off."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> Self:
+        """Does nothing."""
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """Does nothing."""
+
+
+_NO_SPAN = _NoSpan()
+
+
+def start_tracing() -> Tracer:
+    """Starts recording spans (process-wide).
+
+    Returns:
+        The active tracer.
+    """
+    global _tracer  # noqa: PLW0603
+    _tracer = Tracer()
+    return _tracer
+
+
+def stop_tracing() -> Tracer | None:
+    """Stops recording spans.
+
+    Returns:
+        The tracer that was active, if any.
+    """
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def span(name: str, category: str = "app", **args: Any) -> _Span | _NoSpan:
+    """Times a block of code.
+
+    Example:
+        >>> with span("merge", pages=3):
+        ...     merge()
+
+    Args:
+        name: The span name.
+        category: The span category.
+        **args: Details shown with the span (JSON-serializable).
+
+    Returns:
+        A context manager (a no-op when tracing is off).
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NO_SPAN
+    return _Span(tracer, name, category, args)
+
+
+def traced(func: Callable[..., T]) -> Callable[..., T]:
+    """Records every call of a function as a span named after its qualified name.
+
+    Args:
+        func: The function or method to instrument.
+
+    Returns:
+        The instrumented function.
+    """
+    name = func.__qualname__
+    category = func.__module__.split(".")[0]
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        tracer = _tracer
+        if tracer is None:
+            return func(*args, **kwargs)
+        start_ns = time.perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            tracer.add(name, category, start_ns, time.perf_counter_ns())
+
+    return wrapper
+
+
+def traced_methods(cls: type[T]) -> type[T]:
+    """Class decorator applying `traced` to every public method defined by the class.
+
+    Generator methods are left alone (their body runs after the call returns).
+
+    Args:
+        cls: The class to instrument.
+
+    Returns:
+        The same class.
+    """
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith("_") or not inspect.isfunction(value) or inspect.isgeneratorfunction(value):
+            continue
+        setattr(cls, attr, traced(value))
+    return cls
@@ -0,0 +1,50 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from codec import json_codec
+
+DOCUMENTS = [
+    "[]",
+    "[12.5]",
+    "[1, -2, 3.25e-3, 1E+2, 0]",
+    '[{"id": "Q1", "options": {"A": "x, y"}, "n": 1.5}, "text with ] and ,", true, false, null]',
+    "  [ 12.5 ,\n 100 , [1, [2.75]] ]  ",
+    '["\\u00e9\\"escaped\\"", {"nested": [1.5, {"deep": -0.5}]}]',
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 4, 5, 7, 64])
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_iter_array_across_chunk_sizes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, document: str, chunk_size: int
+) -> None:
+    """Items are decoded whole, wherever the chunk boundaries fall (numbers included)."""
+    monkeypatch.setattr(json_codec, "STREAM_CHUNK_SIZE", chunk_size)
+    path = tmp_path / "doc.json"
+    path.write_text(document, encoding="utf-8")
+    assert list(json_codec.iter_array(path)) == json.loads(document)
+
+
+@pytest.mark.parametrize("document", ["{}", "[1 2]", "[12.]", "[1, 2", '["open'])
+def test_iter_array_rejects_malformed_documents(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, document: str) -> None:
+    """Anything but a well-formed top-level array raises a decode error."""
+    monkeypatch.setattr(json_codec, "STREAM_CHUNK_SIZE", 2)
+    path = tmp_path / "doc.json"
+    path.write_text(document, encoding="utf-8")
+    with pytest.raises(json_codec.JSONDecodeError):
+        list(json_codec.iter_array(path))
+
+
+@pytest.mark.parametrize("name", ["bank.json", "bank.json.gz", "bank.jsonl", "bank.jsonl.xz"])
+def test_iter_records_reads_arrays_and_lines(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, name: str) -> None:
+    """Records stream back from JSON arrays and JSON Lines files, compressed or not."""
+    monkeypatch.setattr(json_codec, "STREAM_CHUNK_SIZE", 3)
+    records = [{"id": f"Q{i}", "score": i / 4} for i in range(10)]
+    path = tmp_path / name
+    if ".jsonl" in name:
+        json_codec.dump_lines(records, path)
+    else:
+        json_codec.dump_array(records, path)
+    assert list(json_codec.iter_records(path)) == records
@@ -0,0 +1,29 @@
+from pathlib import Path
+
+from converter.site import chunk_digest, sync_images
+from models import Question
+
+
+def test_sync_images_keeps_every_image_of_a_question(tmp_path: Path) -> None:
+    """Numbered images of one question are all copied and listed in order; unrelated files are skipped."""
+    source = tmp_path / "source"
+    source.mkdir()
+    for name in ("32.10.png", "32.2.png", "32.1.png", "6.jpg", "notes.png", "7.txt"):
+        (source / name).write_bytes(name.encode())
+
+    images = sync_images(source, tmp_path / "site" / "images")
+
+    assert images == {6: ["images/6.jpg"], 32: ["images/32.1.png", "images/32.2.png", "images/32.10.png"]}
+    assert sorted(path.name for path in (tmp_path / "site" / "images").iterdir()) == [
+        "32.1.png",
+        "32.10.png",
+        "32.2.png",
+        "6.jpg",
+    ]
+
+
+def test_chunk_digest_covers_every_image() -> None:
+    """Adding a second image to a question changes the name of its chunk."""
+    chunk = [Question(id="Question 32", text="Text", options={"A": "a"}, correct_answers=["A"])]
+    one = chunk_digest(chunk, {32: ["images/32.1.png"]})
+    assert chunk_digest(chunk, {32: ["images/32.1.png", "images/32.2.png"]}) != one
@@ -0,0 +1,28 @@
+from dedup.minhash import find_duplicate_groups
+from models import Question
+
+WORDS = [f"word{i}" for i in range(60)]
+
+
+def question(key: str, start: int, end: int) -> tuple[str, Question]:
+    """Builds a keyed question whose text is a slice of a fixed word list."""
+    return key, Question(id=key, text=" ".join(WORDS[start:end]), options={}, correct_answers=[])
+
+
+def test_identical_questions_are_grouped() -> None:
+    """Exact duplicates form one group, in input order."""
+    groups = find_duplicate_groups([question("a", 0, 30), question("b", 30, 60), question("c", 0, 30)])
+    assert groups == [[("a", 1.0), ("c", 1.0)]]
+
+
+def test_similarities_are_measured_against_the_first_question() -> None:
+    """A question bridging two groups does not make the other group's first question look identical."""
+    groups = find_duplicate_groups(
+        [question("a", 0, 30), question("b", 15, 45), question("bridge", 0, 45)], threshold=0.5
+    )
+
+    assert len(groups) == 1
+    (first, first_similarity), *others = groups[0]
+    assert (first, first_similarity) == ("a", 1.0)
+    assert [key for key, _ in others] == ["b", "bridge"]
+    assert all(similarity < 1.0 for _, similarity in others)
@@ -0,0 +1,27 @@
+from models import Question
+
+
+def test_derived_fields_are_precomputed_and_shared() -> None:
+    """Questions with the same answers share one answer key, whatever the order of their labels."""
+    first = Question(id="Question 1", text="Text", options={"A": "a", "B": "b", "C": "c"}, correct_answers=["C", "A"])
+    second = Question.from_dict({"id": "Question 2", "text": "Text", "correct_answers": ["C", "A"]})
+    assert first.correct_answers == ("C", "A")
+    assert first.answer_key == ("A", "C")
+    assert first.answer_set == frozenset({"A", "C"})
+    assert first.is_multiple_choice
+    assert second.answer_key is first.answer_key
+    assert second.answer_set is first.answer_set
+
+
+def test_single_label_and_missing_answers() -> None:
+    """A lone label from an older file becomes a one-label key; no answers give an empty one."""
+    single = Question.from_dict({"id": "Question 3", "text": "Text", "correct_answers": "B"})
+    assert single.correct_answers == ("B",)
+    assert not single.is_multiple_choice
+    assert Question(id="Question 4", text="Text").answer_set == frozenset()
+
+
+def test_to_dict_omits_the_derived_fields() -> None:
+    """The serialized form only holds the input fields, with the answers as a list."""
+    item = {"id": "Question 5", "text": "Text", "options": {"A": "a"}, "correct_answers": ["A"]}
+    assert Question.from_dict(item).to_dict() == item
@@ -0,0 +1,101 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from quiz_app.adaptive import ABILITY_PRIOR_SD, AdaptiveTest, ItemParameters, calibrate, calibrate_from_history
+from quiz_app.history import AnswerEvent, HistoryStore
+
+TRUE_DIFFICULTY = np.array([-2.0, -1.0, 0.0, 1.0, 2.0])
+
+
+def simulate(candidates: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Draws every candidate's answer to every question from a 2PL model with TRUE_DIFFICULTY."""
+    rng = np.random.default_rng(seed)
+    ability = rng.normal(size=candidates)
+    persons, items = (grid.ravel() for grid in np.meshgrid(np.arange(candidates), np.arange(len(TRUE_DIFFICULTY))))
+    p = 1 / (1 + np.exp(-1.5 * (ability[persons] - TRUE_DIFFICULTY[items])))
+    return persons, items, (rng.random(len(p)) < p).astype(np.int8)
+
+
+def test_calibrate_orders_questions_by_difficulty() -> None:
+    """Fitted difficulties follow the true ones; a question never answered keeps the priors."""
+    persons, items, correct = simulate(candidates=400)
+    params = calibrate(persons * 7 + 3, items, correct, num_items=len(TRUE_DIFFICULTY) + 1)
+
+    assert np.all(np.diff(params.difficulty[:-1]) > 0)
+    assert params.difficulty[0] < -0.5
+    assert params.difficulty[4] > 0.5
+    assert params.attempts.tolist() == [400] * len(TRUE_DIFFICULTY) + [0]
+    assert params.difficulty[-1] == 0.0
+    assert params.discrimination[-1] == 1.0
+
+
+def test_calibrate_without_answers_returns_the_priors() -> None:
+    """No recorded answers: every question gets the prior parameters."""
+    empty = np.array([], dtype=np.int64)
+    params = calibrate(empty, empty, empty, num_items=3)
+    assert params.difficulty.tolist() == [0.0, 0.0, 0.0]
+    assert params.discrimination.tolist() == [1.0, 1.0, 1.0]
+    assert params.attempts.tolist() == [0, 0, 0]
+
+
+def test_calibrate_from_history_reads_the_bank_answers(tmp_path: Path) -> None:
+    """Questions everyone misses come out harder than questions everyone gets right; other banks are ignored."""
+    store = HistoryStore(tmp_path)
+    for session in range(1, 21):
+        for q_id, correct in (("Q1", True), ("Q2", False)):
+            store.append(AnswerEvent(session, "exam.json", q_id, "net", correct=correct, selected=1, time_taken=5.0))
+        store.append(AnswerEvent(session, "other.json", "Q3", "net", correct=False, selected=1, time_taken=5.0))
+
+    params = calibrate_from_history(store, "exam.json", ["Q2", "Q1", "Q3"])
+
+    assert params.difficulty[0] > 0 > params.difficulty[1]
+    assert params.attempts.tolist() == [20, 20, 0]
+    assert calibrate_from_history(None, "exam.json", ["Q1"]).attempts.tolist() == [0]
+
+
+def test_select_asks_each_question_once() -> None:
+    """Selection never repeats a question and fails once the bank is exhausted."""
+    test = AdaptiveTest(ItemParameters.uncalibrated(4), top_k=2, rng=np.random.default_rng(0))
+    asked = [test.select() for _ in range(4)]
+    assert sorted(asked) == [0, 1, 2, 3]
+    assert test.remaining == 0
+    with pytest.raises(IndexError):
+        test.select()
+
+
+def test_select_picks_the_most_informative_question() -> None:
+    """With top_k=1, the question closest to the ability estimate is asked first."""
+    params = ItemParameters.uncalibrated(len(TRUE_DIFFICULTY))
+    params.difficulty = TRUE_DIFFICULTY.copy()
+    test = AdaptiveTest(params, top_k=1)
+    assert test.select() == 2
+
+
+def test_ability_follows_the_answers() -> None:
+    """Correct answers raise the estimate, wrong ones lower it, and each answer makes it more certain."""
+    params = ItemParameters.uncalibrated(len(TRUE_DIFFICULTY))
+    params.difficulty = TRUE_DIFFICULTY.copy()
+
+    strong = AdaptiveTest(params, top_k=1)
+    errors = [strong.standard_error]
+    for _ in range(3):
+        strong.record(strong.select(), correct=True)
+        errors.append(strong.standard_error)
+    weak = AdaptiveTest(params, top_k=1)
+    for _ in range(3):
+        weak.record(weak.select(), correct=False)
+
+    assert strong.ability > 0 > weak.ability
+    assert errors[0] == ABILITY_PRIOR_SD
+    assert errors == sorted(errors, reverse=True)
+
+
+def test_correct_answer_leads_to_a_harder_question() -> None:
+    """After the middle question is answered correctly, the next one asked is the one just above it."""
+    params = ItemParameters.uncalibrated(len(TRUE_DIFFICULTY))
+    params.difficulty = TRUE_DIFFICULTY.copy()
+    test = AdaptiveTest(params, top_k=1)
+    test.record(test.select(), correct=True)
+    assert test.select() == 3
@@ -0,0 +1,102 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from quiz_app.analytics import group_stats, question_difficulty, topic_accuracy, weakest
+from quiz_app.history import STRINGS_FILE, AnswerEvent, HistoryStore
+
+
+def event(question_id: str, correct: bool, time_taken: float = 10.0, topic: str = "net") -> AnswerEvent:
+    """Builds an answer event of session 1 on bank 'exam.json'."""
+    return AnswerEvent(
+        session=1,
+        bank="exam.json",
+        question_id=question_id,
+        topic=topic,
+        correct=correct,
+        selected=1,
+        time_taken=time_taken,
+    )
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    """Appended events load back as aligned columns with dictionary-encoded strings."""
+    store = HistoryStore(tmp_path)
+    store.append(event("Q1", correct=True, time_taken=4.0))
+    store.append(event("Q2", correct=False, time_taken=8.0, topic="iam"))
+
+    columns, strings = HistoryStore(tmp_path).load()
+
+    assert columns["correct"].tolist() == [1, 0]
+    assert columns["time_taken"].tolist() == [4.0, 8.0]
+    assert [strings[i] for i in columns["question"]] == ["Q1", "Q2"]
+    assert [strings[i] for i in columns["topic"]] == ["net", "iam"]
+
+
+def test_repair_truncates_a_partly_written_row(tmp_path: Path) -> None:
+    """A crash between two column writes is undone on open, so later rows stay aligned."""
+    store = HistoryStore(tmp_path)
+    store.append(event("Q1", correct=True))
+    # The crash happened after the first columns of the second row were written
+    with (tmp_path / "session.bin").open("ab") as f:
+        f.write(np.array([2], dtype="<i8").tobytes())
+    with (tmp_path / "timestamp.bin").open("ab") as f:
+        f.write(b"\x00\x01\x02")
+
+    store = HistoryStore(tmp_path)
+    store.append(event("Q2", correct=False))
+    columns, strings = store.load()
+
+    assert columns["session"].tolist() == [1, 1]
+    assert [strings[i] for i in columns["question"]] == ["Q1", "Q2"]
+    assert all(len(column) == 2 for column in columns.values())
+
+
+def test_truncated_string_entry_is_dropped(tmp_path: Path) -> None:
+    """A dictionary entry cut short by a crash is removed and the string registered again."""
+    HistoryStore(tmp_path).append(event("Q1", correct=True))
+    with (tmp_path / STRINGS_FILE).open("a", encoding="utf-8") as f:
+        f.write('"Q2')
+
+    store = HistoryStore(tmp_path)
+    store.append(event("Q2", correct=True))
+    columns, strings = HistoryStore(tmp_path).load()
+
+    assert [strings[i] for i in columns["question"]] == ["Q1", "Q2"]
+
+
+def test_group_stats() -> None:
+    """Attempts, accuracy and mean time are aggregated per key."""
+    stats = group_stats(np.array([3, 1, 3, 3]), np.array([1, 0, 0, 1]), np.array([1.0, 5.0, 2.0, 3.0]))
+
+    assert stats.keys.tolist() == [1, 3]
+    assert stats.attempts.tolist() == [1, 3]
+    assert stats.accuracy == pytest.approx([0.0, 2 / 3])
+    assert stats.mean_time == pytest.approx([5.0, 2.0])
+
+
+def test_question_difficulty_and_weakest(tmp_path: Path) -> None:
+    """The weakest questions are the least accurate with enough attempts, slowest first on ties."""
+    store = HistoryStore(tmp_path)
+    for question_id, outcomes, time_taken in (
+        ("easy", [True, True, True], 5.0),
+        ("hard", [False, False, True], 5.0),
+        ("slow", [False, False, True], 30.0),
+        ("rare", [False], 5.0),
+    ):
+        for correct in outcomes:
+            store.append(event(question_id, correct=correct, time_taken=time_taken, topic=question_id))
+    columns, strings = store.load()
+
+    questions = question_difficulty(columns)
+    ranked = [strings[int(questions.keys[i]) & 0xFFFFFFFF] for i in weakest(questions, min_attempts=2, top=2)]
+    assert ranked == ["slow", "hard"]
+
+    topics = topic_accuracy(columns)
+    assert {strings[key]: attempts for key, attempts in zip(topics.keys, topics.attempts, strict=True)} == {
+        "easy": 3,
+        "hard": 3,
+        "slow": 3,
+        "rare": 1,
+    }
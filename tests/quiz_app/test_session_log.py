@@ -0,0 +1,79 @@
+from pathlib import Path
+
+from codec import json_codec
+from quiz_app.engine import QuizEngine
+from quiz_app.session_log import SessionLog
+
+
+def write_bank(path: Path, count: int) -> Path:
+    """Writes a bank of `count` questions whose correct answer is always 'A'."""
+    items = [
+        {"id": f"Question {i}", "text": f"Text {i}", "options": {"A": "a", "B": "b"}, "correct_answers": ["A"]}
+        for i in range(1, count + 1)
+    ]
+    path.write_text(json_codec.dumps(items), encoding="utf-8")
+    return path
+
+
+def start_session(bank: Path, logs: Path) -> QuizEngine:
+    """Starts a logged session over a bank."""
+    engine = QuizEngine(bank, max_questions=5, time_limit_minutes=10)
+    engine.load_and_shuffle()
+    engine.open_session_log(logs)
+    engine.start_timer()
+    return engine
+
+
+def test_resume_restores_questions_answers_and_bank(tmp_path: Path) -> None:
+    """A suspended session comes back with its questions, answers and bank, and keeps logging to the same file."""
+    bank = write_bank(tmp_path / "bank.json", 8)
+    engine = start_session(bank, tmp_path / "sessions")
+    engine.record_answer(engine.next_question(), ["A"])
+    engine.record_answer(engine.next_question(), ["B"])
+    engine.suspend_session()
+    path = SessionLog.find_incomplete(tmp_path / "sessions")
+
+    resumed = QuizEngine(tmp_path / "other.json", max_questions=20, time_limit_minutes=1)
+    resumed.resume_session(path)
+
+    assert resumed.filepath == bank.resolve()
+    assert [q.id for q in resumed.questions] == [q.id for q in engine.questions]
+    assert [a.is_correct for a in resumed.user_answers] == [True, False]
+    assert resumed.time_limit_seconds == engine.time_limit_seconds
+    assert resumed.next_question().id == engine.questions[2].id
+
+    resumed.record_answer(resumed.next_question(), ["A"])
+    resumed.suspend_session()
+    assert len(SessionLog.read(path)) == 1 + 2 + 1 + 1 + 1
+
+
+def test_resume_ignores_a_truncated_record(tmp_path: Path) -> None:
+    """An answer cut short by a crash mid-write is dropped; the intact ones are kept."""
+    bank = write_bank(tmp_path / "bank.json", 5)
+    engine = start_session(bank, tmp_path / "sessions")
+    engine.record_answer(engine.next_question(), ["A"])
+    engine.session_log.close()
+    with engine.session_log.path.open("a", encoding="utf-8") as f:
+        f.write('{"type": "answer", "question_id": "Quest')
+
+    resumed = QuizEngine(bank, max_questions=5, time_limit_minutes=10)
+    resumed.resume_session(engine.session_log.path)
+
+    assert len(resumed.user_answers) == 1
+    assert resumed.user_answers[0].question.id == engine.questions[0].id
+
+    # Answers given after the resume must not be glued to the truncated record
+    resumed.record_answer(resumed.next_question(), ["A"])
+    resumed.suspend_session()
+    again = QuizEngine(bank, max_questions=5, time_limit_minutes=10)
+    again.resume_session(engine.session_log.path)
+    assert len(again.user_answers) == 2
+
+
+def test_finished_session_leaves_nothing_to_resume(tmp_path: Path) -> None:
+    """Completing a session removes its log."""
+    engine = start_session(write_bank(tmp_path / "bank.json", 2), tmp_path / "sessions")
+    while (question := engine.next_question()) is not None:
+        engine.record_answer(question, ["A"])
+    engine.finish_session()
+    assert SessionLog.find_incomplete(tmp_path / "sessions") is None
@@ -0,0 +1,93 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from scraper.storage.utils import BACKUP_DIR_NAME, OBJECTS_DIR_NAME, create_backup, list_backups, prune_backups
+
+
+def snapshot(bank: Path, stamp: str, content: str) -> Path:
+    """Creates a snapshot of `bank` named after the given 'YYYYMMDD_HHMMSS' time."""
+    path = bank.parent / BACKUP_DIR_NAME / f"backup_{stamp}_{bank.name}"
+    path.parent.mkdir(exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def stored_objects(bank: Path) -> list[Path]:
+    """Lists the stored contents of the backup folder of `bank`."""
+    objects_dir = bank.parent / BACKUP_DIR_NAME / OBJECTS_DIR_NAME
+    return [p for p in objects_dir.iterdir() if p.suffix == ".json" and p.name != "refs.json"]
+
+
+@pytest.fixture
+def bank(tmp_path: Path) -> Path:
+    """A question bank file."""
+    path = tmp_path / "exam.json"
+    path.write_text("[1]", encoding="utf-8")
+    return path
+
+
+def test_unchanged_file_is_backed_up_once(bank: Path) -> None:
+    """A second backup of the same content reuses the latest snapshot."""
+    first = create_backup(str(bank))
+    assert create_backup(str(bank)) == first
+    assert list_backups(bank) == [first]
+
+    bank.write_text("[1, 2]", encoding="utf-8")
+    second = create_backup(str(bank))
+    assert second != first
+    assert second.read_text(encoding="utf-8") == "[1, 2]"
+    assert first.read_text(encoding="utf-8") == "[1]"
+
+
+@pytest.mark.parametrize("links", [True, False])
+def test_identical_contents_are_stored_once(bank: Path, monkeypatch: pytest.MonkeyPatch, links: bool) -> None:
+    """Snapshots of a content seen before share its stored object, with hard links or with copies."""
+    if not links:
+
+        def no_link(*_: object) -> None:
+            raise OSError("hard links are not supported")
+
+        monkeypatch.setattr(os, "link", no_link)
+
+    for content in ("[1]", "[2]", "[1]"):
+        bank.write_text(content, encoding="utf-8")
+        create_backup(str(bank), keep_last=10)
+
+    assert [s.read_text(encoding="utf-8") for s in list_backups(bank)] == ["[1]", "[2]", "[1]"]
+    assert len(stored_objects(bank)) == 2
+
+
+def test_retention_keeps_last_daily_and_weekly(bank: Path) -> None:
+    """Snapshots outside the last / daily / weekly windows are deleted, newest of each period kept."""
+    stamps = [
+        "20260105_090000",  # week 2
+        "20260112_090000",  # week 3
+        "20260114_080000",
+        "20260114_090000",  # newest of Jan 14
+        "20260115_090000",
+        "20260115_100000",
+        "20260115_110000",
+    ]
+    snapshots = {stamp: snapshot(bank, stamp, stamp) for stamp in stamps}
+
+    removed = prune_backups(bank, keep_last=2, keep_daily=2, keep_weekly=2)
+
+    kept = {stamp for stamp, path in snapshots.items() if path.exists()}
+    # The last 2, the newest of Jan 15 and Jan 14, and the newest of ISO weeks 3 (Jan 15) and 2 (Jan 5)
+    assert kept == {"20260115_110000", "20260115_100000", "20260114_090000", "20260105_090000"}
+    assert {p.name for p in removed} == {snapshots[s].name for s in set(stamps) - kept}
+
+
+def test_pruning_removes_unreferenced_contents(bank: Path) -> None:
+    """Contents whose snapshots were all pruned are deleted from the store."""
+    for content in ("[1]", "[2]", "[3]"):
+        bank.write_text(content, encoding="utf-8")
+        create_backup(str(bank), keep_last=10, keep_daily=0, keep_weekly=0)
+    assert len(stored_objects(bank)) == 3
+
+    prune_backups(bank, keep_last=1, keep_daily=0, keep_weekly=0)
+
+    assert [s.read_text(encoding="utf-8") for s in list_backups(bank)] == ["[3]"]
+    assert len(stored_objects(bank)) == 1
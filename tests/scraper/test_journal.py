@@ -0,0 +1,52 @@
+from pathlib import Path
+
+from models import Question
+from scraper.storage.journal import JournalPage, PageJournal, iter_journal_pages
+
+
+def question(number: int) -> Question:
+    """Builds a question numbered `number`."""
+    return Question(id=f"Question {number}", text="Text", options={"A": "a", "B": "b"}, correct_answers=["A"])
+
+
+def journal(directory: Path, worker: str, *pages: JournalPage) -> None:
+    """Writes the journal of a worker."""
+    writer = PageJournal.for_worker(directory, worker)
+    for page in pages:
+        writer.append(page)
+    writer.close()
+
+
+def test_keeps_the_winning_entry_of_each_page(tmp_path: Path) -> None:
+    """A page journaled by two workers is read back once, from the lease that completed it."""
+    journal(
+        tmp_path,
+        "w1",
+        JournalPage(page=1, token="a1", url="u1", questions=[question(1)]),
+        JournalPage(page=2, token="a2", url="u2", questions=[question(2)]),
+    )
+    journal(tmp_path, "w2", JournalPage(page=2, token="b2", url="u2", questions=[question(2), question(3)]))
+
+    pages = list(iter_journal_pages(tmp_path, {1: "a1", 2: "b2"}))
+
+    assert [(page.page, page.token) for page in pages] == [(1, "a1"), (2, "b2")]
+    assert [q.id for q in pages[1].questions] == ["Question 2", "Question 3"]
+    assert pages[1].questions[0].number == 2
+
+
+def test_ignores_entries_of_pages_not_done(tmp_path: Path) -> None:
+    """Entries of pages that no lease completed are dropped."""
+    journal(tmp_path, "w1", JournalPage(page=1, token="a1", url="u1", questions=[question(1)]))
+    assert list(iter_journal_pages(tmp_path, {})) == []
+
+
+def test_stops_at_a_truncated_record(tmp_path: Path) -> None:
+    """A record cut short by a crash ends that journal without failing the others."""
+    journal(tmp_path, "w1", JournalPage(page=1, token="a1", url="u1", questions=[question(1)]))
+    with (tmp_path / "journal_w1.jsonl").open("a", encoding="utf-8") as f:
+        f.write('{"page": 2, "token": "a2", "url"')
+    journal(tmp_path, "w2", JournalPage(page=2, token="b2", url="u2", questions=[question(2)]))
+
+    pages = list(iter_journal_pages(tmp_path, {1: "a1", 2: "b2"}))
+
+    assert [(page.page, page.token) for page in pages] == [(1, "a1"), (2, "b2")]
@@ -0,0 +1,78 @@
+import os
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from codec import json_codec
+from models import Question
+from scraper.storage import SaverFactory
+from scraper.storage.merge import merge_files, run_timestamp
+
+
+def question(number: int, text: str) -> Question:
+    """Builds a question numbered `number`."""
+    return Question(id=f"Question {number}", text=text, options={"A": "a", "B": "b"}, correct_answers=["A"])
+
+
+def write(path: Path, *questions: Question) -> Path:
+    """Saves questions in the format of the file extension."""
+    SaverFactory.for_file(path).save_stream(iter(questions), str(path))
+    return path
+
+
+def read(path: Path) -> list[tuple[str, str]]:
+    """Returns the (ID, text) pairs of a file, in file order."""
+    return [(q.id, q.text) for q in SaverFactory.for_file(path).iter_existing(str(path))]
+
+
+@pytest.fixture
+def tokyo_time(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """Runs a test in a local timezone other than UTC."""
+    monkeypatch.setenv("TZ", "Asia/Tokyo")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_newest_run_wins(tmp_path: Path) -> None:
+    """Files of any format merge in question order, the newest run keeping its copy of shared questions."""
+    old = write(tmp_path / "exam_20260101_090000.json", question(1, "old"), question(2, "old"), question(5, "old"))
+    new = write(tmp_path / "exam_20260102_090000.jsonl", question(2, "new"), question(3, "new"))
+    output = tmp_path / "merged.csv"
+
+    assert merge_files([new, old], output) == 4
+    assert read(output) == [
+        ("Question 1", "old"),
+        ("Question 2", "new"),
+        ("Question 3", "new"),
+        ("Question 5", "old"),
+    ]
+
+
+def test_unsorted_input_is_sorted_in_runs(tmp_path: Path) -> None:
+    """An input out of question order is sorted through spilled runs smaller than the file."""
+    unsorted = tmp_path / "exam_20260101_090000.jsonl"
+    json_codec.dump_lines((question(n, f"text {n}").to_dict() for n in (7, 3, 9, 1, 4, 8, 2)), unsorted)
+    output = tmp_path / "merged.json"
+
+    assert merge_files([unsorted], output, run_size=2) == 7
+    assert [q_id for q_id, _ in read(output)] == [f"Question {n}" for n in (1, 2, 3, 4, 7, 8, 9)]
+
+
+@pytest.mark.usefixtures("tokyo_time")
+def test_modification_time_is_read_in_utc(tmp_path: Path) -> None:
+    """A file without a run timestamp in its name is dated by its modification time, in UTC."""
+    path = write(tmp_path / "exam.json", question(1, "text"))
+    os.utime(path, (0, 0))
+    assert run_timestamp(path) == "19700101_000000"
+
+
+def test_output_cannot_be_an_input(tmp_path: Path) -> None:
+    """Merging into one of the inputs is refused before anything is written."""
+    path = write(tmp_path / "exam.json", question(1, "text"))
+    with pytest.raises(ValueError, match="cannot also be an input"):
+        merge_files([path], path)
+    assert read(path) == [("Question 1", "text")]
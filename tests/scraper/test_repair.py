@@ -0,0 +1,56 @@
+from pathlib import Path
+
+from selenium.common.exceptions import TimeoutException
+
+from models import Question
+from scraper.repair import RepairPlan, repair
+from scraper.selector_engine import cache_path_for
+from scraper.storage.manifest import PageManifest
+
+
+def question(number: int) -> Question:
+    """Builds a question numbered `number`, with its answer."""
+    return Question(id=f"Question {number}", text="Text", options={"A": "a", "B": "b"}, correct_answers=["A"])
+
+
+class FakePage:
+    """Stands in for `ExamPage`: each URL shows the questions listed for it, or times out."""
+
+    def __init__(self, pages: dict[str, list[int]], timeouts: set[str]) -> None:
+        self.pages = pages
+        self.timeouts = timeouts
+        self.url = ""
+
+    def load(self, url: str) -> None:
+        """Opens a page, timing out on the URLs listed in `timeouts`."""
+        if url in self.timeouts:
+            raise TimeoutException(f"{url} did not load.")
+        self.url = url
+
+    def reveal_all_answers(self) -> None:
+        """Does nothing: the fake answers are always shown."""
+
+    def extract_questions(self) -> tuple[list[Question], bool, bool]:
+        """Returns the questions of the current page."""
+        return [question(n) for n in self.pages[self.url]], False, False
+
+
+def test_page_timeout_does_not_end_the_repair() -> None:
+    """A page that does not load is skipped, and the pages after it are still repaired."""
+    plan = RepairPlan(missing=["Question 2", "Question 4"], pages={"u1": {"Question 2"}, "u2": {"Question 4"}})
+    page = FakePage({"u1": [1, 2], "u2": [3, 4]}, timeouts={"u1"})
+    question_map = {f"Question {n}": question(n) for n in (1, 3)}
+    saves: list[int] = []
+
+    fixed = repair(page, plan, question_map, PageManifest(), on_page_fixed=lambda: saves.append(len(question_map)))
+
+    assert fixed == 1
+    assert sorted(question_map) == ["Question 1", "Question 3", "Question 4"]
+    assert saves == [3]
+
+
+def test_selector_cache_follows_the_bank() -> None:
+    """Every run of an exam shares the cache named after the exam, next to the bank."""
+    bank = Path("output/gcp_architect_20251224_121319.json.gz")
+    assert cache_path_for(bank) == Path("output/gcp_architect.selectors.json")
+    assert cache_path_for("exam.jsonl") == Path("exam.selectors.json")
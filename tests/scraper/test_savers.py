@@ -0,0 +1,46 @@
+from pathlib import Path
+
+import pytest
+
+from models import Question
+from scraper.storage import SaverFactory
+
+NAMES = ["bank.json", "bank.json.gz", "bank.jsonl", "bank.jsonl.bz2", "bank.csv", "bank.csv.xz", "bank.yaml"]
+
+
+def questions() -> list[Question]:
+    """Builds questions exercising multiple answers, unicode and separators in the text."""
+    return [
+        Question(id="Question 1", text="Pick one, please.", options={"A": "a", "B": "b"}, correct_answers=["B"]),
+        Question(
+            id="Question 2",
+            text='Multi-line\n"quoted" text: é',
+            options={"A": "x; y", "B": "[z]", "C": "w"},
+            correct_answers=["A", "C"],
+        ),
+        Question(id="Question 10", text="No answer yet", options={"A": "a"}, correct_answers=[]),
+    ]
+
+
+@pytest.mark.parametrize("name", NAMES)
+def test_save_stream_round_trip(tmp_path: Path, name: str) -> None:
+    """Questions written with save_stream read back identically with iter_existing and load_existing."""
+    path = str(tmp_path / name)
+    saver = SaverFactory.for_file(path)
+    saver.save_stream(iter(questions()), path)
+
+    streamed = list(saver.iter_existing(path))
+    assert [q.to_dict() for q in streamed] == [q.to_dict() for q in questions()]
+    assert [q.number for q in streamed] == [1, 2, 10]
+    assert {q_id: q.to_dict() for q_id, q in saver.load_existing(path).items()} == {
+        q.id: q.to_dict() for q in questions()
+    }
+
+
+@pytest.mark.parametrize("name", NAMES)
+def test_save_matches_save_stream(tmp_path: Path, name: str) -> None:
+    """Saving a question map reads back the same as streaming its questions."""
+    path = str(tmp_path / name)
+    saver = SaverFactory.for_file(path)
+    saver.save({q.id: q for q in questions()}, path)
+    assert [q.to_dict() for q in saver.iter_existing(path)] == [q.to_dict() for q in questions()]
@@ -0,0 +1,183 @@
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from scraper.work_queue import LockDirWorkQueue, MemoryWorkQueue, SqliteWorkQueue, WorkQueue
+
+# Opens a handle on one shared queue, as each worker process would
+QueueFactory = Callable[..., WorkQueue]
+
+THREADS = 8
+
+
+@pytest.fixture(params=["memory", "sqlite", "lockdir"])
+def open_queue(request: pytest.FixtureRequest, tmp_path: Path) -> QueueFactory:
+    """Returns a factory of handles on one queue, for each backend."""
+    shared: dict[str, MemoryWorkQueue] = {}
+
+    def factory(lease_seconds: float = 120.0) -> WorkQueue:
+        if request.param == "sqlite":
+            return SqliteWorkQueue(tmp_path / "queue.db", lease_seconds)
+        if request.param == "lockdir":
+            return LockDirWorkQueue(tmp_path / "queue", lease_seconds)
+        queue = shared.setdefault("queue", MemoryWorkQueue(tmp_path / "journals", lease_seconds))
+        queue.lease_seconds = lease_seconds
+        return queue
+
+    return factory
+
+
+def run_threads(target: Callable[[int], None], count: int = THREADS) -> None:
+    """Runs `target(i)` on `count` threads started together, and waits for them."""
+    barrier = threading.Barrier(count)
+
+    def run(i: int) -> None:
+        barrier.wait()
+        target(i)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def expire(lease_seconds: float) -> None:
+    """Waits until leases of the given validity have expired."""
+    time.sleep(lease_seconds + 0.05)
+
+
+def test_claim_hands_out_pages_in_order(open_queue: QueueFactory) -> None:
+    """Each claim takes the next page, under a new token."""
+    queue = open_queue()
+    leases = [queue.claim("w1") for _ in range(3)]
+    assert [lease.page for lease in leases] == [1, 2, 3]
+    assert len({lease.token for lease in leases}) == 3
+
+
+def test_concurrent_claims_get_distinct_pages(open_queue: QueueFactory) -> None:
+    """Workers claiming at the same time never share a page."""
+    claimed: list[int] = []
+
+    def claim(i: int) -> None:
+        lease = open_queue().claim(f"w{i}")
+        claimed.append(lease.page)
+
+    run_threads(claim)
+    assert sorted(claimed) == list(range(1, THREADS + 1))
+
+
+def test_renew_extends_a_held_lease(open_queue: QueueFactory) -> None:
+    """A renewed lease keeps its token and expires later."""
+    queue = open_queue(lease_seconds=0.5)
+    lease = queue.claim("w1")
+    time.sleep(0.01)
+    renewed = queue.renew(lease)
+    assert renewed is not None
+    assert renewed.token == lease.token
+    assert renewed.expires > lease.expires
+
+
+def test_expired_lease_is_reclaimed(open_queue: QueueFactory) -> None:
+    """Once a lease expires, the page goes to the next claim and the old lease is lost."""
+    queue = open_queue(lease_seconds=0.2)
+    lost = queue.claim("crashed")
+    expire(0.2)
+
+    reclaimed = open_queue(lease_seconds=0.2).claim("w2")
+    assert reclaimed.page == lost.page
+    assert reclaimed.token != lost.token
+    assert queue.renew(lost) is None
+
+
+def test_valid_lease_is_not_reclaimed(open_queue: QueueFactory) -> None:
+    """A page under a valid lease is skipped by other workers."""
+    queue = open_queue(lease_seconds=0.2)
+    held = queue.claim("w1")
+    expire(0.1)
+    assert queue.renew(held) is not None
+    expire(0.1)
+    assert open_queue(lease_seconds=0.2).claim("w2").page == held.page + 1
+
+
+def test_released_page_is_claimed_again_right_away(open_queue: QueueFactory) -> None:
+    """Releasing a lease makes its page available without waiting for the expiry."""
+    queue = open_queue()
+    lease = queue.claim("w1")
+    queue.release(lease)
+    assert queue.claim("w2").page == lease.page
+    assert queue.renew(lease) is None
+
+
+def test_concurrent_reclaims_have_one_winner(open_queue: QueueFactory) -> None:
+    """Workers racing for an expired lease: exactly one of them gets the page."""
+    open_queue(lease_seconds=0.2).claim("crashed")
+    expire(0.2)
+    pages: list[int] = []
+
+    def claim(i: int) -> None:
+        pages.append(open_queue(lease_seconds=60).claim(f"w{i}").page)
+
+    run_threads(claim)
+    assert pages.count(1) == 1
+    assert sorted(pages) == list(range(1, THREADS + 1))
+
+
+def test_first_completion_wins(open_queue: QueueFactory) -> None:
+    """A page reclaimed after an expiry is done by whichever lease completes first."""
+    queue = open_queue(lease_seconds=0.2)
+    slow = queue.claim("slow")
+    expire(0.2)
+    fast = queue.claim("fast")
+    assert fast.page == slow.page
+
+    assert queue.complete(fast)
+    assert not queue.complete(slow)
+    assert queue.done_tokens() == {fast.page: fast.token}
+    assert queue.renew(fast) is None
+
+
+def test_concurrent_completions_have_one_winner(open_queue: QueueFactory) -> None:
+    """Leases completing the same page at the same time: exactly one counts."""
+    queue = open_queue(lease_seconds=0.05)
+    leases = []
+    for _ in range(THREADS):
+        leases.append(queue.claim("w"))
+        expire(0.05)
+    assert {lease.page for lease in leases} == {1}
+    won: list[str] = []
+
+    def complete(i: int) -> None:
+        if open_queue(lease_seconds=0.05).complete(leases[i]):
+            won.append(leases[i].token)
+
+    run_threads(complete)
+    assert len(won) == 1
+    assert queue.done_tokens() == {1: won[0]}
+
+
+def test_done_page_is_never_handed_out_again(open_queue: QueueFactory) -> None:
+    """Completed pages are skipped by later claims, even once their lease would have expired."""
+    queue = open_queue(lease_seconds=0.05)
+    queue.complete(queue.claim("w1"))
+    expire(0.05)
+    assert queue.claim("w2").page == 2
+
+
+def test_last_page_bounds_the_queue(open_queue: QueueFactory) -> None:
+    """The lowest reported last page wins, and the queue finishes once pages up to it are done."""
+    queue = open_queue()
+    leases = [queue.claim("w1") for _ in range(3)]
+    queue.set_last_page(3)
+    queue.set_last_page(2)
+    queue.set_last_page(5)
+    assert queue.last_page() == 2
+    assert queue.claim("w1") is None
+
+    assert not queue.is_finished()
+    for lease in leases[:2]:
+        queue.complete(lease)
+    assert queue.is_finished()
@@ -0,0 +1,98 @@
+from pathlib import Path
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from scraper import worker
+from scraper.capture import PageCapture
+from scraper.storage.journal import iter_journal_pages
+from scraper.work_queue import MemoryWorkQueue
+from scraper.worker import ScrapeWorker
+
+START_URL = "https://example.com/exam/1"
+
+
+class FakePage:
+    """Stands in for `ExamPage`: an exam of `pages` pages with two questions each."""
+
+    def __init__(self, pages: int, timeouts: set[int] = frozenset(), blanks: set[int] = frozenset()) -> None:
+        self.pages = pages
+        # Pages that fail (time out, or show no questions) the first time they are loaded
+        self.timeouts = set(timeouts)
+        self.blanks = set(blanks)
+        self.page_num = 0
+        self.loaded = False
+
+    def load(self, url: str) -> None:
+        """Opens a page, timing out once on the pages listed in `timeouts`."""
+        self.page_num = int(url.rsplit("/", 1)[1])
+        self.loaded = self.page_num not in self.timeouts
+        if not self.loaded:
+            self.timeouts.discard(self.page_num)
+            raise TimeoutException(f"Page {self.page_num} did not load.")
+
+    def reveal_all_answers(self) -> None:
+        """Does nothing: the fake answers are always shown."""
+
+    def capture(self, page_num: int) -> PageCapture:
+        """Captures the current page, blank if it did not load and once for the pages listed in `blanks`."""
+        url = f"https://example.com/exam/{self.page_num}"
+        if not self.loaded or self.page_num > self.pages or self.page_num in self.blanks:
+            self.blanks.discard(self.page_num)
+            return PageCapture(page_num=page_num, url=url)
+        containers = [
+            {
+                "id": f"Question {(self.page_num - 1) * 2 + i}",
+                "text": "Which one?",
+                "options": [
+                    {"label": "A.", "value": "a", "correct": True},
+                    {"label": "B.", "value": "b", "correct": False},
+                ],
+            }
+            for i in (1, 2)
+        ]
+        return PageCapture(page_num=page_num, url=url, containers=containers, has_next=self.page_num < self.pages)
+
+
+@pytest.fixture(autouse=True)
+def no_idle_wait(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keeps idle workers from sleeping."""
+    monkeypatch.setattr(worker, "IDLE_POLL", 0.0)
+
+
+def scrape(tmp_path: Path, page: FakePage, end_id: int | None = None) -> MemoryWorkQueue:
+    """Runs one worker over a fresh queue until it is finished."""
+    queue = MemoryWorkQueue(tmp_path)
+    ScrapeWorker(page, queue, "w1", START_URL, end_id=end_id, page_delay=0.0).run()
+    return queue
+
+
+def test_scrapes_every_page(tmp_path: Path) -> None:
+    """The last page is the one without a 'Next' button."""
+    queue = scrape(tmp_path, FakePage(pages=5))
+    assert queue.last_page() == 5
+    pages = list(iter_journal_pages(tmp_path, queue.done_tokens()))
+    assert [page.page for page in pages] == [1, 2, 3, 4, 5]
+    assert sum(len(page.questions) for page in pages) == 10
+
+
+def test_load_timeout_does_not_end_the_scrape(tmp_path: Path) -> None:
+    """A page that times out is tried again instead of being taken for the last page."""
+    queue = scrape(tmp_path, FakePage(pages=10, timeouts={3}))
+    assert queue.last_page() == 10
+    assert sorted(queue.done_tokens()) == list(range(1, 11))
+
+
+def test_blank_page_does_not_end_the_scrape(tmp_path: Path) -> None:
+    """A page that shows no questions is tried again instead of being taken for the last page."""
+    queue = scrape(tmp_path, FakePage(pages=6, blanks={4}))
+    assert queue.last_page() == 6
+    assert [page.page for page in iter_journal_pages(tmp_path, queue.done_tokens())] == [1, 2, 3, 4, 5, 6]
+
+
+def test_end_of_range_is_the_last_page(tmp_path: Path) -> None:
+    """The page going past the end of the range is the last one."""
+    queue = scrape(tmp_path, FakePage(pages=10), end_id=7)
+    assert queue.last_page() == 4
+    pages = list(iter_journal_pages(tmp_path, queue.done_tokens()))
+    assert [q.id for page in pages for q in page.questions][-1] == "Question 7"